@@ -0,0 +1,188 @@
+import os
+import struct
+import logging
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Frames copied per write when saving a buffer
+WRITE_BLOCK_FRAMES = 1 << 18
+
+class AudioBuffer:
+    """PCM audio frames backed by a NumPy array
+
+    Buffers opened from WAV files are memory-mapped over the data chunk, so
+    opening, slicing and reading stream parameters copy nothing and only the
+    pages that are actually read or written are loaded from disk.
+    """
+
+    def __init__(
+        self,
+        frames: np.ndarray,
+        sample_rate: int,
+        channels: int,
+        sample_width: int,
+        format_tag: int = WAVE_FORMAT_PCM,
+        fmt_chunk: Optional[bytes] = None,
+        path: Optional[str] = None
+    ):
+        # frames is a (frame_count, block_align) uint8 view of interleaved samples
+        self.frames = frames
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.format_tag = format_tag
+        self.fmt_chunk = fmt_chunk or self._pcm_fmt_chunk(format_tag, channels, sample_rate, sample_width)
+        self.path = path
+
+    @staticmethod
+    def _pcm_fmt_chunk(format_tag: int, channels: int, sample_rate: int, sample_width: int) -> bytes:
+        block_align = channels * sample_width
+        return struct.pack(
+            "<HHIIHH", format_tag, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8
+        )
+
+    @classmethod
+    def open_wav(cls, path: str) -> "AudioBuffer":
+        """Memory-map the data chunk of a PCM or float WAV file
+
+        Raises ValueError for files that are not plain RIFF WAVE PCM/float.
+        """
+        file_size = os.path.getsize(path)
+        fmt = None
+        data_offset = None
+        data_size = 0
+
+        with open(path, "rb") as f:
+            header = f.read(12)
+            if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+                raise ValueError(f"Not a RIFF WAVE file: {path}")
+
+            position = 12
+            while position + 8 <= file_size:
+                f.seek(position)
+                chunk_id, chunk_size = struct.unpack("<4sI", f.read(8))
+                if chunk_id == b"fmt ":
+                    fmt = f.read(chunk_size)
+                elif chunk_id == b"data":
+                    data_offset = position + 8
+                    # Streamed writers may leave a placeholder size; trust the file length instead
+                    data_size = min(chunk_size, file_size - data_offset)
+                    break
+                position += 8 + chunk_size + (chunk_size & 1)
+
+        if fmt is None or data_offset is None or len(fmt) < 16:
+            raise ValueError(f"WAV file has no fmt or data chunk: {path}")
+
+        format_tag, channels, sample_rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+        if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+            format_tag = struct.unpack("<H", fmt[24:26])[0]
+        if format_tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT):
+            raise ValueError(f"Unsupported WAV encoding {format_tag:#06x}: {path}")
+        if channels == 0 or block_align == 0 or block_align != channels * (bits // 8):
+            raise ValueError(f"Inconsistent WAV format header: {path}")
+
+        frame_count = data_size // block_align
+        if frame_count == 0:
+            frames = np.empty((0, block_align), dtype=np.uint8)
+        else:
+            frames = np.memmap(path, dtype=np.uint8, mode="r", offset=data_offset, shape=(frame_count, block_align))
+
+        return cls(frames, sample_rate, channels, bits // 8, format_tag, fmt, path)
+
+    @property
+    def frame_count(self) -> int:
+        return self.frames.shape[0]
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frame_count / self.sample_rate
+
+    @property
+    def max_possible_amplitude(self) -> float:
+        if self.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+            return 1.0
+        return float(2 ** (self.sample_width * 8) / 2)
+
+    def samples(self) -> np.ndarray:
+        """Return samples as a (frame_count, channels) array; a view except for 24-bit audio"""
+        if self.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+            dtype = {4: "<f4", 8: "<f8"}[self.sample_width]
+        elif self.sample_width == 3:
+            # No 24-bit dtype: widen to int32 by placing each sample in the upper three bytes
+            raw = self.frames.reshape(self.frame_count, self.channels, 3)
+            widened = np.zeros((self.frame_count, self.channels, 4), dtype=np.uint8)
+            widened[:, :, 1:] = raw
+            return widened.view("<i4").reshape(self.frame_count, self.channels) >> 8
+        else:
+            dtype = {1: np.uint8, 2: "<i2", 4: "<i4"}[self.sample_width]
+        return self.frames.view(dtype).reshape(self.frame_count, self.channels)
+
+    def slice_seconds(self, start_seconds: float, end_seconds: Optional[float] = None) -> "AudioBuffer":
+        """Return a view of [start_seconds, end_seconds) without copying"""
+        start = int(round(start_seconds * self.sample_rate))
+        end = self.frame_count if end_seconds is None else int(round(end_seconds * self.sample_rate))
+        return AudioBuffer(
+            self.frames[start:end],
+            self.sample_rate,
+            self.channels,
+            self.sample_width,
+            self.format_tag,
+            self.fmt_chunk,
+            self.path
+        )
+
+    def same_format(self, other: "AudioBuffer") -> bool:
+        """Check whether frames of other can be appended to this buffer byte for byte"""
+        return (
+            self.sample_rate == other.sample_rate
+            and self.channels == other.channels
+            and self.sample_width == other.sample_width
+            and self.format_tag == other.format_tag
+        )
+
+    @staticmethod
+    def write_wav(buffers: List["AudioBuffer"], output_path: str) -> int:
+        """Write buffers of the same format back to back as one WAV file and return its frame count
+
+        Frames are copied a block at a time, so memory use stays constant.
+        """
+        first = buffers[0]
+        for buffer in buffers[1:]:
+            if not first.same_format(buffer):
+                raise ValueError("Cannot concatenate WAV buffers with different formats")
+
+        data_size = sum(buffer.frames.nbytes for buffer in buffers)
+        fmt_chunk = first.fmt_chunk
+        padded_fmt = fmt_chunk + (b"\0" if len(fmt_chunk) & 1 else b"")
+        riff_size = 4 + 8 + len(padded_fmt) + 8 + data_size + (data_size & 1)
+
+        with open(output_path, "wb") as out:
+            # Sizes beyond 4 GB do not fit RIFF headers; readers fall back to the file length
+            out.write(struct.pack("<4sI4s", b"RIFF", min(riff_size, 0xFFFFFFFF), b"WAVE"))
+            out.write(struct.pack("<4sI", b"fmt ", len(fmt_chunk)) + padded_fmt)
+            out.write(struct.pack("<4sI", b"data", min(data_size, 0xFFFFFFFF)))
+            for buffer in buffers:
+                for start in range(0, buffer.frame_count, WRITE_BLOCK_FRAMES):
+                    out.write(buffer.frames[start:start + WRITE_BLOCK_FRAMES].tobytes())
+            if data_size & 1:
+                out.write(b"\0")
+
+        return sum(buffer.frame_count for buffer in buffers)
+
+    def info(self) -> Dict[str, Any]:
+        """Return stream parameters in get_audio_info's field names"""
+        return {
+            "duration_seconds": self.duration_seconds,
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "sample_width": self.sample_width,
+            "frame_count": self.frame_count,
+            "max_possible_amplitude": self.max_possible_amplitude
+        }
@@ -0,0 +1,105 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+from memory_budget import MemoryBudget
+
+logger = logging.getLogger(__name__)
+
+class DecodedAudioCache:
+    """LRU cache of decoded audio segments bounded by a total byte budget
+
+    With a memory budget, the cached bytes are charged to it as resident
+    memory, and least recently used entries are dropped when a decode
+    needs the room.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024, memory_budget: Optional[MemoryBudget] = None):
+        self.max_bytes = max_bytes
+        self.memory_budget = memory_budget
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[str, int, int], Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(file_path: str) -> Tuple[str, int, int]:
+        """Build a cache key that changes whenever the file is modified"""
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+    def get(self, key: Tuple[str, int, int]) -> Optional[Any]:
+        """Return the cached segment for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple[str, int, int], audio: Any, size_bytes: int) -> None:
+        """Store a decoded segment, evicting least recently used entries as needed"""
+        if size_bytes > self.max_bytes:
+            logger.debug(f"Not caching {key[0]}: {size_bytes} bytes exceeds cache budget")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+
+            # Drop stale versions of the same file
+            for stale_key in [k for k in self._entries if k[0] == key[0]]:
+                self.current_bytes -= self._entries.pop(stale_key)[1]
+
+            while self._entries and self.current_bytes + size_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+            self._entries[key] = (audio, size_bytes)
+            self.current_bytes += size_bytes
+        self._report()
+
+    def shrink(self, nbytes: int) -> None:
+        """Evict least recently used entries until at least nbytes are freed"""
+        with self._lock:
+            freed = 0
+            while self._entries and freed < nbytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                freed += evicted_size
+                self.evictions += 1
+        self._report()
+
+    def clear(self) -> None:
+        """Remove all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+        self._report()
+
+    def _report(self) -> None:
+        """Charge the current size to the memory budget; called without the cache lock held"""
+        if self.memory_budget is not None:
+            self.memory_budget.set_resident("decode_cache", self.current_bytes, self.shrink)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache usage and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,188 @@
+import os
+import json
+import shutil
+import sqlite3
+import logging
+import threading
+import subprocess
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Lossy codecs are decoded to 16-bit PCM, so report that width for them
+LOSSY_SAMPLE_WIDTH = 2
+
+# Probes kept in the persistent cache; the oldest are pruned beyond this
+MAX_CACHED_PROBES = 50000
+
+class AudioProbe:
+    """Read audio stream parameters from container headers without decoding"""
+
+    def __init__(self, cache_path: Optional[str] = None, max_entries: int = MAX_CACHED_PROBES):
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _get_conn(self) -> Optional[sqlite3.Connection]:
+        """Open the persistent probe cache on first use"""
+        if self.cache_path is None:
+            return None
+
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS probes (key TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _cache_key(file_path: str) -> str:
+        """Build a key from inode and mtime so renames hit and edits miss"""
+        stat = os.stat(file_path)
+        return f"{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def probe(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Return stream parameters for file_path, or None if headers are insufficient"""
+        key = self._cache_key(file_path)
+
+        with self._lock:
+            conn = self._get_conn()
+            if conn is not None:
+                row = conn.execute("SELECT data FROM probes WHERE key = ?", (key,)).fetchone()
+                if row:
+                    return json.loads(row[0])
+
+        result = self._probe_mutagen(file_path) or self._probe_ffprobe(file_path)
+        if result is None:
+            return None
+
+        with self._lock:
+            conn = self._get_conn()
+            if conn is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO probes (key, data) VALUES (?, ?)",
+                    (key, json.dumps(result))
+                )
+                # Keys of edited or deleted files are never read again, so keep
+                # only the newest max_entries rows; rowids grow with each insert
+                conn.execute(
+                    "DELETE FROM probes WHERE rowid <= (SELECT MAX(rowid) FROM probes) - ?",
+                    (self.max_entries,)
+                )
+                conn.commit()
+
+        return result
+
+    @staticmethod
+    def _probe_mutagen(file_path: str) -> Optional[Dict[str, Any]]:
+        """Read stream parameters with mutagen"""
+        try:
+            from mutagen import File
+        except ImportError:
+            return None
+
+        try:
+            audio_file = File(file_path)
+        except Exception as e:
+            logger.debug(f"mutagen could not read {file_path}: {e}")
+            return None
+
+        if audio_file is None:
+            return None
+
+        info = audio_file.info
+        duration = getattr(info, 'length', 0) or 0
+        sample_rate = getattr(info, 'sample_rate', 0) or 0
+        channels = getattr(info, 'channels', 0) or 0
+
+        if not (duration and sample_rate and channels):
+            return None
+
+        bits_per_sample = getattr(info, 'bits_per_sample', 0) or 0
+
+        tags = {}
+        if audio_file.tags:
+            for tag_key, value in audio_file.tags.items():
+                tags[tag_key] = str(value[0]) if isinstance(value, list) else str(value)
+
+        return {
+            "duration_seconds": float(duration),
+            "sample_rate": int(sample_rate),
+            "channels": int(channels),
+            "sample_width": bits_per_sample // 8 if bits_per_sample else LOSSY_SAMPLE_WIDTH,
+            "bitrate": getattr(info, 'bitrate', 0) or 0,
+            "tags": tags,
+            "probe_source": "mutagen"
+        }
+
+    @staticmethod
+    def _probe_ffprobe(file_path: str) -> Optional[Dict[str, Any]]:
+        """Read stream parameters with a single ffprobe call"""
+        if shutil.which("ffprobe") is None:
+            return None
+
+        try:
+            completed = subprocess.run(
+                [
+                    "ffprobe", "-v", "error",
+                    "-select_streams", "a:0",
+                    "-show_entries",
+                    "stream=sample_rate,channels,bits_per_sample,bits_per_raw_sample,duration"
+                    ":format=duration,bit_rate:format_tags",
+                    "-of", "json",
+                    file_path
+                ],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"ffprobe failed for {file_path}: {e}")
+            return None
+
+        if completed.returncode != 0:
+            return None
+
+        data = json.loads(completed.stdout or "{}")
+        streams = data.get("streams", [])
+        if not streams:
+            return None
+
+        stream = streams[0]
+        fmt = data.get("format", {})
+        duration = float(stream.get("duration") or fmt.get("duration") or 0)
+        sample_rate = int(stream.get("sample_rate") or 0)
+        channels = int(stream.get("channels") or 0)
+
+        if not (duration and sample_rate and channels):
+            return None
+
+        bits_per_sample = int(stream.get("bits_per_sample") or stream.get("bits_per_raw_sample") or 0)
+
+        return {
+            "duration_seconds": duration,
+            "sample_rate": sample_rate,
+            "channels": channels,
+            "sample_width": bits_per_sample // 8 if bits_per_sample else LOSSY_SAMPLE_WIDTH,
+            "bitrate": int(fmt.get("bit_rate") or 0),
+            "tags": {k: str(v) for k, v in fmt.get("tags", {}).items()},
+            "probe_source": "ffprobe"
+        }
+
+    def clear(self) -> None:
+        """Drop every cached probe"""
+        with self._lock:
+            conn = self._get_conn()
+            if conn is not None:
+                conn.execute("DELETE FROM probes")
+                conn.commit()
+
+    def close(self) -> None:
+        """Close the persistent cache connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,48 +1,238 @@
 import os
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Awaitable, Tuple
+import re
+import time
+import hashlib
 import tempfile
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from pydub import AudioSegment
 from utils import AudioUtils
+from audio_cache import DecodedAudioCache
+from audio_probe import AudioProbe
+from ffmpeg_utils import FFmpegUtils
+from model_registry import ModelRegistry, get_process_registry
+from inference_worker import (
+    DIARIZATION_PIPELINE, run_whisper_transcription, run_whisper_file, run_whisper_chunk,
+    run_speaker_diarization, speech_only, remap_segments
+)
+from execution import ExecutionLayer
+from waveform import Waveform
+from vad import plan_chunks, SpeechTimeline
+from result_store import ResultStore
+from batch_manifest import TranscriptManifest
+from hume_client import HumeClient, HumeAPIError
+from temp_storage import TempStorage
+from conversion_cache import ConversionCache
+from audio_buffer import AudioBuffer
+from transcode_pipeline import TranscodePipeline
+from memory_budget import MemoryBudget, MemoryBudgetBusy
+from capabilities import get_process_capabilities
 
 logger = logging.getLogger(__name__)
 
+# Chunk length for streaming transcription; shorter chunks give earlier first text
+STREAMING_CHUNK_SECONDS = 30.0
+
+# Receives (new segments, seconds transcribed so far, total seconds)
+SegmentCallback = Callable[[List[Dict[str, Any]], float, float], Awaitable[None]]
+
+# Models and options requested from the Hume batch API
+HUME_JOB_CONFIG = {
+    "models": {
+        "prosody": {}
+    },
+    "transcription": {
+        "identify_speakers": True
+    },
+    "notify": False
+}
+
+# Encodings for audio sent to Hume; prosody analysis needs no more than 16 kHz mono
+UPLOAD_PROFILES = {
+    "opus": {"suffix": ".ogg", "codec_args": ["-c:a", "libopus", "-b:a", "32k", "-application", "voip"]},
+    "flac": {"suffix": ".flac", "codec_args": ["-c:a", "flac", "-sample_fmt", "s16"]}
+}
+UPLOAD_SAMPLE_RATE = 16000
+
+# Samples piped to the upload encoder per write
+UPLOAD_PIPE_SAMPLES = 1 << 16
+
+# Receives (per-file entry, files finished so far, files in the batch)
+BatchFileCallback = Callable[[Dict[str, Any], int, int], Awaitable[None]]
+
+# MP3 bitrate per quality level; other formats use the encoder defaults
+MP3_BITRATES = {"high": "320k", "medium": "192k", "low": "128k"}
+
+# Assumed ratio of decoded PCM to file size when headers cannot be probed
+UNPROBED_EXPANSION_RATIO = 12
+
+# Directory under cache_dir for manifests of batches run without an explicit path
+DEFAULT_MANIFEST_DIR = "manifests"
+
 class AudioProcessor:
     """Core audio processing functionality"""
     
-    def __init__(self, temp_dir: Optional[str] = None):
+    def __init__(
+        self,
+        temp_dir: Optional[str] = None,
+        decode_cache_mb: int = 512,
+        cache_dir: Optional[str] = None,
+        merge_workers: Optional[int] = None,
+        convert_workers: Optional[int] = None,
+        model_registry: Optional[ModelRegistry] = None,
+        execution: Optional[ExecutionLayer] = None,
+        waveform_mmap_seconds: float = 600.0,
+        result_store: Optional[ResultStore] = None,
+        hume_client: Optional[HumeClient] = None,
+        temp_storage: Optional[TempStorage] = None,
+        vad_filter: bool = True,
+        upload_profile: str = "opus",
+        memory_budget: Optional[MemoryBudget] = None
+    ):
         self.temp_dir = temp_dir or tempfile.gettempdir()
-        self.temp_files: List[str] = []
+        self.temp_storage = temp_storage or TempStorage(root=os.path.join(self.temp_dir, "audio-mcp"))
+        self.conversion_cache = ConversionCache()
+        self.vad_filter = vad_filter
+        if upload_profile != "original" and upload_profile not in UPLOAD_PROFILES:
+            raise ValueError(f"Unknown upload profile: {upload_profile}")
+        self.upload_profile = upload_profile
+        self.memory_budget = memory_budget or MemoryBudget()
+        self.decode_cache = DecodedAudioCache(max_bytes=decode_cache_mb * 1024 * 1024, memory_budget=self.memory_budget)
+        self.merge_workers = merge_workers or min(4, os.cpu_count() or 1)
+        self.convert_workers = convert_workers or os.cpu_count() or 1
+        self._convert_pool: Optional[ThreadPoolExecutor] = None
+        self.model_registry = model_registry or get_process_registry()
+        self.execution = execution
+        self.waveform_mmap_seconds = waveform_mmap_seconds
+        self.result_store = result_store
+        self.hume_client = hume_client or HumeClient()
+        self._worker_model_stats: Dict[int, Dict[str, Any]] = {}
+        
+        # Persistent caches survive restarts, so they live outside temp_dir
+        self.cache_dir = cache_dir or os.path.join(
+            os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "audio-mcp"
+        )
+        self.probe = AudioProbe(cache_path=os.path.join(self.cache_dir, "probe_cache.sqlite3"))
         
         # Ensure temp directory exists
         os.makedirs(self.temp_dir, exist_ok=True)
         
         logger.info(f"AudioProcessor initialized with temp_dir: {self.temp_dir}")
     
-    def _register_temp_file(self, file_path: str) -> str:
-        """Register a temporary file for cleanup"""
-        self.temp_files.append(file_path)
-        return file_path
-    
     def cleanup(self):
         """Clean up all temporary files"""
-        for file_path in self.temp_files:
-            AudioUtils.cleanup_temp_file(file_path)
-        self.temp_files.clear()
+        if self._convert_pool is not None:
+            self._convert_pool.shutdown(wait=False, cancel_futures=True)
+            self._convert_pool = None
+        self.temp_storage.close()
+        self.decode_cache.clear()
+        self.probe.close()
+        if self.result_store is not None:
+            self.result_store.close()
+    
+    def _load_audio(self, file_path: str) -> AudioSegment:
+        """Decode a whole file with pydub, reusing a cached decode when the file is unchanged
+        
+        Every pydub fallback decodes through here, so info, trim, convert and
+        merge calls on the same file share one decode.
+        """
+        self.temp_storage.touch(os.path.abspath(file_path))
+        key = DecodedAudioCache.make_key(file_path)
+        audio = self.decode_cache.get(key)
+        if audio is not None:
+            logger.debug(f"Decode cache hit for: {file_path}")
+            return audio
+        
+        audio = AudioSegment.from_file(file_path)
+        self.decode_cache.put(key, audio, len(audio.raw_data))
+        return audio
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get decoded-audio cache statistics"""
+        return self.decode_cache.stats()
+    
+    def get_model_stats(self) -> Dict[str, Any]:
+        """Get warm model statistics for this process and any inference workers"""
+        stats = self.model_registry.stats()
+        models = [dict(model, worker="main") for model in stats["models"]]
+        for pid, worker_stats in self._worker_model_stats.items():
+            models.extend(dict(model, worker=str(pid)) for model in worker_stats["models"])
+        
+        return {
+            "models": models,
+            "resident_bytes": sum(model["resident_bytes"] for model in models),
+            "max_bytes": stats["max_bytes"]
+        }
+    
+    async def _run_inference(self, func, *args) -> Dict[str, Any]:
+        """Run a module-level inference function on the execution layer, or inline without one"""
+        if self.execution is not None:
+            result = await self.execution.run_cpu(func, *args)
+        else:
+            result = func(*args)
+        
+        pid = result.pop("worker_pid", os.getpid())
+        worker_models = result.pop("worker_models", None)
+        worker_imports = result.pop("worker_imports", None)
+        if pid != os.getpid():
+            if worker_models is not None:
+                self._worker_model_stats[pid] = worker_models
+            if worker_imports:
+                get_process_capabilities().record_imports(worker_imports)
+        
+        return result
     
-    def get_audio_info(self, file_path: str) -> Dict[str, Any]:
-        """Get comprehensive audio file information"""
+    def get_audio_info(self, file_path: str, decode: bool = False) -> Dict[str, Any]:
+        """Get comprehensive audio file information
+        
+        Reads stream parameters from container headers; the file is only
+        decoded when decode=True or when the headers are insufficient.
+        """
         if not AudioUtils.validate_audio_file(file_path):
             return {"error": "Invalid or unsupported audio file"}
         
+        # WAV stream parameters and exact frame counts come from the mapped data chunk
+        buffer = self._open_wav_buffer(file_path)
+        probed = self._probe_safely(file_path) if buffer is None else None
+        
+        if not decode:
+            if buffer is not None:
+                return self._build_info_from_buffer(file_path, buffer)
+            if probed is not None:
+                return self._build_info_from_probe(file_path, probed)
+        
+        try:
+            estimated = self._estimate_decoded_bytes(file_path, buffer, probed)
+            
+            if decode and not self.memory_budget.fits(estimated) and (buffer is not None or probed is not None):
+                self.memory_budget.record_routed()
+                if buffer is not None:
+                    info = self._build_info_from_buffer(file_path, buffer)
+                else:
+                    info = self._build_info_from_probe(file_path, probed)
+                info["decode_skipped"] = "decoded size exceeds the memory budget"
+                return info
+            
+            with self.memory_budget.reserve(estimated, f"info {Path(file_path).name}"):
+                return self._build_info_by_decoding(file_path)
+        except MemoryBudgetBusy:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting audio info: {e}")
+            return {"error": str(e)}
+    
+    def _build_info_by_decoding(self, file_path: str) -> Dict[str, Any]:
+        """Fully decode a file to read its stream parameters"""
         try:
             # Get metadata using mutagen
             metadata = AudioUtils.get_audio_metadata(file_path)
             
             # Get additional info using pydub
-            audio = AudioSegment.from_file(file_path)
+            audio = self._load_audio(file_path)
             
             info = {
                 "file_path": file_path,
@@ -53,9 +243,10 @@ class AudioProcessor:
                 "format": Path(file_path).suffix.lower()[1:],
                 "file_size_bytes": os.path.getsize(file_path),
                 "file_size_mb": round(os.path.getsize(file_path) / (1024 * 1024), 2),
-                "frame_count": len(audio),
+                "frame_count": int(audio.frame_count()),
                 "sample_width": audio.sample_width,
-                "max_possible_amplitude": audio.max_possible_amplitude
+                "max_possible_amplitude": audio.max_possible_amplitude,
+                "info_source": "decoded"
             }
             
             # Merge with metadata
@@ -67,6 +258,95 @@ class AudioProcessor:
             logger.error(f"Error getting audio info: {e}")
             return {"error": str(e)}
     
+    def _probe_safely(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Probe container headers, returning None instead of raising"""
+        try:
+            return self.probe.probe(file_path)
+        except Exception as e:
+            logger.warning(f"Header probe failed for {file_path}: {e}")
+            return None
+    
+    def _estimate_decoded_bytes(
+        self,
+        file_path: str,
+        buffer: Optional[AudioBuffer] = None,
+        probed: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Estimate the memory a full decode of file_path takes, from headers only
+        
+        Pass the mapped WAV buffer or probe result when the caller already has one.
+        """
+        if buffer is None and probed is None:
+            buffer = self._open_wav_buffer(file_path)
+            if buffer is None:
+                probed = self._probe_safely(file_path)
+        
+        if buffer is not None:
+            return buffer.frames.nbytes
+        
+        if probed is not None:
+            return int(
+                probed["duration_seconds"] * probed["sample_rate"] * probed["channels"] * probed["sample_width"]
+            )
+        
+        return os.path.getsize(file_path) * UNPROBED_EXPANSION_RATIO
+    
+    @staticmethod
+    def _open_wav_buffer(file_path: str) -> Optional[AudioBuffer]:
+        """Memory-map a WAV file, returning None for other formats or unsupported encodings"""
+        if Path(file_path).suffix.lower() != '.wav':
+            return None
+        try:
+            return AudioBuffer.open_wav(file_path)
+        except (ValueError, OSError) as e:
+            logger.debug(f"Cannot map {file_path} as PCM WAV: {e}")
+            return None
+    
+    def _build_info_from_buffer(self, file_path: str, buffer: AudioBuffer) -> Dict[str, Any]:
+        """Build the get_audio_info response from a memory-mapped WAV buffer"""
+        probed = buffer.info()
+        probed["bitrate"] = buffer.sample_rate * buffer.channels * buffer.sample_width * 8
+        
+        info = self._build_info_from_probe(file_path, probed)
+        info["frame_count"] = buffer.frame_count
+        info["max_possible_amplitude"] = buffer.max_possible_amplitude
+        info["info_source"] = "wav_mmap"
+        
+        # The data chunk carries no tags; RIFF INFO and ID3 chunks are read by mutagen
+        tags = AudioUtils.get_audio_metadata(file_path).get("tags")
+        if tags:
+            info["tags"] = tags
+        return info
+    
+    def _build_info_from_probe(self, file_path: str, probed: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the get_audio_info response from header-probed stream parameters"""
+        duration = probed["duration_seconds"]
+        file_size = os.path.getsize(file_path)
+        sample_width = probed["sample_width"]
+        
+        info = {
+            "file_path": file_path,
+            "duration_seconds": duration,
+            "duration_formatted": AudioUtils.format_duration(duration),
+            "sample_rate": probed["sample_rate"],
+            "channels": probed["channels"],
+            "format": Path(file_path).suffix.lower()[1:],
+            "file_size_bytes": file_size,
+            "file_size_mb": round(file_size / (1024 * 1024), 2),
+            "frame_count": int(round(duration * probed["sample_rate"])),
+            "sample_width": sample_width,
+            "max_possible_amplitude": float(2 ** (sample_width * 8) / 2),
+            "duration": duration,
+            "bitrate": probed.get("bitrate", 0),
+            "file_size": file_size,
+            "info_source": "header"
+        }
+        
+        if probed.get("tags"):
+            info["tags"] = probed["tags"]
+        
+        return info
+    
     def convert_format(self, input_path: str, output_format: str, quality: str = "medium") -> Dict[str, Any]:
         """Convert audio file to different format"""
         if not AudioUtils.validate_audio_file(input_path):
@@ -78,60 +358,282 @@ class AudioProcessor:
         if output_format.lower() not in AudioUtils.SUPPORTED_FORMATS:
             return {"error": f"Unsupported output format: {output_format}"}
         
+        # Quality only changes the encoder settings for MP3
+        key_quality = quality if output_format.lower() == '.mp3' else None
+        
+        try:
+            fingerprint = self._content_fingerprint(input_path)
+        except Exception as e:
+            logger.error(f"Error converting audio format: {e}")
+            return {"error": str(e)}
+        
+        result = self.conversion_cache.get_or_convert(
+            ConversionCache.make_key(fingerprint, output_format, key_quality),
+            lambda: self._convert_format_uncached(input_path, output_format, quality)
+        )
+        
+        if result.get("from_cache"):
+            self.temp_storage.touch(result["output_path"])
+            result["input_format"] = Path(input_path).suffix.lower()[1:]
+            result["quality"] = quality
+        
+        return result
+    
+    def _content_fingerprint(self, file_path: str) -> str:
+        """Fingerprint file contents, falling back to path, size and mtime without a result store"""
+        if self.result_store is not None:
+            return self.result_store.fingerprint(file_path)
+        return ":".join(str(part) for part in DecodedAudioCache.make_key(file_path))
+    
+    def _convert_format_uncached(self, input_path: str, output_format: str, quality: str) -> Dict[str, Any]:
+        """Decode and re-encode input_path without consulting the conversion cache"""
         try:
-            # Load audio
-            audio = AudioSegment.from_file(input_path)
-            
             # Generate output path
             input_name = Path(input_path).stem
-            output_path = os.path.join(self.temp_dir, f"{input_name}_converted{output_format}")
-            output_path = self._register_temp_file(output_path)
-            
-            # Set quality parameters
-            export_params = {}
-            if output_format.lower() == '.mp3':
-                if quality == "high":
-                    export_params["bitrate"] = "320k"
-                elif quality == "medium":
-                    export_params["bitrate"] = "192k"
-                elif quality == "low":
-                    export_params["bitrate"] = "128k"
-            
-            # Export with format
-            audio.export(output_path, format=output_format[1:], **export_params)
-            
-            # Get info about converted file
-            result = {
-                "status": "success",
-                "output_path": output_path,
-                "input_format": Path(input_path).suffix.lower()[1:],
-                "output_format": output_format[1:],
-                "quality": quality,
-                "original_size_mb": round(os.path.getsize(input_path) / (1024 * 1024), 2),
-                "converted_size_mb": round(os.path.getsize(output_path) / (1024 * 1024), 2)
-            }
-            
-            return result
+            output_path = self.temp_storage.allocate(f"{input_name}_converted", output_format)
             
+            if FFmpegUtils.is_available():
+                # Decode and encode in one ffmpeg pass without loading the audio here
+                bitrate = self._export_params(output_format, quality).get("bitrate")
+                TranscodePipeline(input_path).encode(output_path, ["-b:a", bitrate] if bitrate else None).run()
+            else:
+                try:
+                    with self.memory_budget.reserve(self._estimate_decoded_bytes(input_path), f"convert {input_name}"):
+                        audio = self._load_audio(input_path)
+                        audio.export(output_path, format=output_format[1:], **self._export_params(output_format, quality))
+                except MemoryBudgetBusy:
+                    self.temp_storage.discard(output_path)
+                    raise
+            
+            return self._conversion_result(input_path, output_path, output_format, quality)
+            
+        except MemoryBudgetBusy:
+            raise
         except Exception as e:
             logger.error(f"Error converting audio format: {e}")
             return {"error": str(e)}
     
-    def trim_audio(self, input_path: str, start_seconds: float, end_seconds: Optional[float] = None) -> Dict[str, Any]:
-        """Trim audio file to specified time range"""
+    @staticmethod
+    def _export_params(output_format: str, quality: str) -> Dict[str, Any]:
+        """Return pydub export parameters for a format and quality level"""
+        if output_format.lower() == '.mp3' and quality in MP3_BITRATES:
+            return {"bitrate": MP3_BITRATES[quality]}
+        return {}
+    
+    @staticmethod
+    def _conversion_result(input_path: str, output_path: str, output_format: str, quality: str) -> Dict[str, Any]:
+        """Describe a finished conversion"""
+        return {
+            "status": "success",
+            "output_path": output_path,
+            "input_format": Path(input_path).suffix.lower()[1:],
+            "output_format": output_format[1:],
+            "quality": quality,
+            "original_size_mb": round(os.path.getsize(input_path) / (1024 * 1024), 2),
+            "converted_size_mb": round(os.path.getsize(output_path) / (1024 * 1024), 2)
+        }
+    
+    async def convert_batch(
+        self,
+        sources: List[str],
+        output_formats: List[str],
+        quality: str = "medium",
+        on_file: Optional[BatchFileCallback] = None
+    ) -> Dict[str, Any]:
+        """Convert every audio file in sources to each of output_formats
+        
+        Sources may be files, directories (searched recursively) or glob
+        patterns. Each input is decoded once and encoded to all formats by a
+        single ffmpeg process, and inputs are spread over convert_workers
+        processes at a time. Outputs of identical earlier conversions are reused.
+        """
+        formats: List[str] = []
+        for output_format in output_formats:
+            if not output_format.startswith('.'):
+                output_format = f".{output_format}"
+            output_format = output_format.lower()
+            if output_format not in AudioUtils.SUPPORTED_FORMATS:
+                return {"error": f"Unsupported output format: {output_format}"}
+            if output_format not in formats:
+                formats.append(output_format)
+        
+        if not formats:
+            return {"error": "No output formats given"}
+        
+        files: List[str] = []
+        try:
+            for source in sources:
+                for file_path in await self._run_blocking(AudioUtils.find_audio_files, source):
+                    if file_path not in files:
+                        files.append(file_path)
+        except Exception as e:
+            return {"error": f"Could not list audio files: {e}"}
+        
+        if not files:
+            return {"error": f"No supported audio files found for: {', '.join(sources)}"}
+        
+        logger.info(f"Converting {len(files)} files to {', '.join(formats)} with {self.convert_workers} workers")
+        
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        pool = self._get_convert_pool()
+        entries: Dict[str, Dict[str, Any]] = {}
+        
+        async def convert_file(file_path: str) -> None:
+            entry = await loop.run_in_executor(pool, self._convert_file_formats, file_path, formats, quality)
+            entries[file_path] = entry
+            if on_file is not None:
+                await on_file(entry, len(entries), len(files))
+        
+        await asyncio.gather(*(convert_file(f) for f in files))
+        
+        elapsed = time.time() - start_time
+        converted = [entries[f] for f in files if entries[f]["status"] == "success"]
+        audio_seconds = sum(entry["duration_seconds"] for entry in converted)
+        
+        return {
+            "status": "success",
+            "total_files": len(files),
+            "converted": len(converted),
+            "failed": len(files) - len(converted),
+            "output_formats": [f[1:] for f in formats],
+            "quality": quality,
+            "workers": self.convert_workers,
+            "outputs_from_cache": sum(
+                1 for entry in converted for output in entry["outputs"] if output["from_cache"]
+            ),
+            "elapsed_seconds": round(elapsed, 2),
+            "audio_seconds": round(audio_seconds, 2),
+            "audio_seconds_per_second": round(audio_seconds / elapsed, 1) if elapsed > 0 else 0.0,
+            "files": [entries[f] for f in files]
+        }
+    
+    def _get_convert_pool(self) -> ThreadPoolExecutor:
+        """Create the conversion pool on first use
+        
+        Each thread drives its own ffmpeg process, so conversions use one core per worker.
+        """
+        if self._convert_pool is None:
+            self._convert_pool = ThreadPoolExecutor(
+                max_workers=self.convert_workers, thread_name_prefix="audio-convert"
+            )
+        return self._convert_pool
+    
+    def _convert_file_formats(self, file_path: str, formats: List[str], quality: str) -> Dict[str, Any]:
+        """Convert one file to several formats, decoding it once, and return its batch entry"""
+        start_time = time.time()
+        entry: Dict[str, Any] = {"file_path": file_path}
+        allocated: Dict[str, str] = {}
+        
+        try:
+            fingerprint = self._content_fingerprint(file_path)
+            keys = {
+                fmt: ConversionCache.make_key(fingerprint, fmt, quality if fmt == '.mp3' else None)
+                for fmt in formats
+            }
+            
+            results: Dict[str, Dict[str, Any]] = {}
+            for fmt in formats:
+                cached = self.conversion_cache.get(keys[fmt])
+                if cached is not None:
+                    self.temp_storage.touch(cached["output_path"])
+                    results[fmt] = cached
+            
+            missing = [fmt for fmt in formats if fmt not in results]
+            if missing:
+                stem = Path(file_path).stem
+                allocated = {fmt: self.temp_storage.allocate(f"{stem}_converted", fmt) for fmt in missing}
+                
+                if FFmpegUtils.is_available():
+                    FFmpegUtils.convert_multi(file_path, [
+                        (allocated[fmt], ["-b:a", MP3_BITRATES[quality]] if fmt == '.mp3' and quality in MP3_BITRATES else [])
+                        for fmt in missing
+                    ])
+                else:
+                    with self.memory_budget.reserve(self._estimate_decoded_bytes(file_path), f"convert {stem}"):
+                        audio = self._load_audio(file_path)
+                        for fmt in missing:
+                            audio.export(allocated[fmt], format=fmt[1:], **self._export_params(fmt, quality))
+                
+                for fmt in missing:
+                    results[fmt] = self._conversion_result(file_path, allocated[fmt], fmt, quality)
+                    self.conversion_cache.put(keys[fmt], results[fmt])
+            
+            probed = self._probe_safely(file_path)
+            entry.update({
+                "status": "success",
+                "duration_seconds": probed["duration_seconds"] if probed else 0.0,
+                "outputs": [
+                    {
+                        "format": fmt[1:],
+                        "output_path": results[fmt]["output_path"],
+                        "size_mb": results[fmt]["converted_size_mb"],
+                        "from_cache": bool(results[fmt].get("from_cache"))
+                    }
+                    for fmt in formats
+                ]
+            })
+            
+        except Exception as e:
+            logger.error(f"Error converting {file_path}: {e}")
+            for output_path in allocated.values():
+                self.temp_storage.discard(output_path)
+            entry.update({"status": "error", "error": str(e)})
+        
+        entry["elapsed_seconds"] = round(time.time() - start_time, 3)
+        return entry
+    
+    def trim_audio(
+        self,
+        input_path: str,
+        start_seconds: float,
+        end_seconds: Optional[float] = None,
+        streaming: bool = True
+    ) -> Dict[str, Any]:
+        """Trim audio file to specified time range
+        
+        With streaming enabled and ffmpeg available, the input is seeked
+        directly so only the requested range is read.
+        """
         if not AudioUtils.validate_audio_file(input_path):
             return {"error": "Invalid or unsupported audio file"}
         
         try:
-            audio = AudioSegment.from_file(input_path)
+            buffer = self._open_wav_buffer(input_path)
+            probed = self._probe_safely(input_path) if buffer is None else None
+            
+            # The decoded file and the trimmed copy are both held in memory
+            estimated = 2 * self._estimate_decoded_bytes(input_path, buffer, probed)
+            routed = not streaming and not self.memory_budget.fits(estimated)
+            
+            if (streaming or routed) and buffer is not None:
+                if routed:
+                    self.memory_budget.record_routed()
+                return self._trim_wav(input_path, buffer, start_seconds, end_seconds)
+            
+            if (streaming or routed) and FFmpegUtils.is_available() and probed is not None:
+                if routed:
+                    self.memory_budget.record_routed()
+                return self._trim_streaming(input_path, start_seconds, end_seconds, probed)
+            
+            with self.memory_budget.reserve(estimated, f"trim {Path(input_path).name}"):
+                return self._trim_in_memory(input_path, start_seconds, end_seconds)
+        except MemoryBudgetBusy:
+            raise
+        except Exception as e:
+            logger.error(f"Error trimming audio: {e}")
+            return {"error": str(e)}
+    
+    def _trim_in_memory(self, input_path: str, start_seconds: float, end_seconds: Optional[float]) -> Dict[str, Any]:
+        """Trim by decoding the whole file with pydub"""
+        try:
+            audio = self._load_audio(input_path)
             duration = len(audio) / 1000.0
             
             # Validate time range
-            if start_seconds < 0 or start_seconds >= duration:
-                return {"error": f"Invalid start time. Must be between 0 and {duration:.2f} seconds"}
-            
-            if end_seconds is not None and (end_seconds <= start_seconds or end_seconds > duration):
-                return {"error": f"Invalid end time. Must be between {start_seconds:.2f} and {duration:.2f} seconds"}
+            range_error = self._validate_trim_range(start_seconds, end_seconds, duration)
+            if range_error:
+                return {"error": range_error}
             
             # Convert to milliseconds
             start_ms = int(start_seconds * 1000)
@@ -140,14 +642,10 @@ class AudioProcessor:
             # Trim audio
             trimmed_audio = audio[start_ms:end_ms]
             
-            # Generate output path
-            input_name = Path(input_path).stem
-            input_ext = Path(input_path).suffix
-            output_path = os.path.join(self.temp_dir, f"{input_name}_trimmed{input_ext}")
-            output_path = self._register_temp_file(output_path)
+            output_path = self._trim_output_path(input_path)
             
             # Export trimmed audio
-            trimmed_audio.export(output_path, format=input_ext[1:])
+            trimmed_audio.export(output_path, format=Path(input_path).suffix[1:])
             
             result = {
                 "status": "success",
@@ -155,7 +653,8 @@ class AudioProcessor:
                 "original_duration": AudioUtils.format_duration(duration),
                 "trimmed_duration": AudioUtils.format_duration(len(trimmed_audio) / 1000.0),
                 "start_time": AudioUtils.format_duration(start_seconds),
-                "end_time": AudioUtils.format_duration(end_seconds) if end_seconds else "end of file"
+                "end_time": AudioUtils.format_duration(end_seconds) if end_seconds else "end of file",
+                "trim_mode": "in_memory"
             }
             
             return result
@@ -164,8 +663,114 @@ class AudioProcessor:
             logger.error(f"Error trimming audio: {e}")
             return {"error": str(e)}
     
-    def merge_audio(self, input_paths: List[str], output_format: str = "wav") -> Dict[str, Any]:
-        """Merge multiple audio files into one"""
+    def _trim_streaming(
+        self,
+        input_path: str,
+        start_seconds: float,
+        end_seconds: Optional[float],
+        probed: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Trim by seeking with ffmpeg, decoding only the requested range
+        
+        The range is re-encoded rather than packet-copied, so the cut lands
+        on the requested times instead of the nearest codec frame.
+        """
+        duration = probed["duration_seconds"]
+        
+        range_error = self._validate_trim_range(start_seconds, end_seconds, duration)
+        if range_error:
+            return {"error": range_error}
+        
+        try:
+            input_ext = Path(input_path).suffix.lower()
+            output_path = self._trim_output_path(input_path)
+            
+            # Keep the original sample width when re-encoding PCM
+            codec_args = None
+            if input_ext == '.wav':
+                codec_args = ["-c:a", FFmpegUtils.pcm_codec(probed["sample_width"])]
+            
+            TranscodePipeline(input_path).trim(start_seconds, end_seconds).encode(
+                output_path, codec_args
+            ).run()
+            
+            trimmed_seconds = (end_seconds if end_seconds is not None else duration) - start_seconds
+            
+            result = {
+                "status": "success",
+                "output_path": output_path,
+                "original_duration": AudioUtils.format_duration(duration),
+                "trimmed_duration": AudioUtils.format_duration(trimmed_seconds),
+                "start_time": AudioUtils.format_duration(start_seconds),
+                "end_time": AudioUtils.format_duration(end_seconds) if end_seconds else "end of file",
+                "trim_mode": "seek_decode"
+            }
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error trimming audio: {e}")
+            return {"error": str(e)}
+    
+    def _trim_wav(
+        self,
+        input_path: str,
+        buffer: AudioBuffer,
+        start_seconds: float,
+        end_seconds: Optional[float]
+    ) -> Dict[str, Any]:
+        """Trim a WAV by copying only the requested frames out of the mapped data chunk"""
+        duration = buffer.duration_seconds
+        
+        range_error = self._validate_trim_range(start_seconds, end_seconds, duration)
+        if range_error:
+            return {"error": range_error}
+        
+        try:
+            trimmed = buffer.slice_seconds(start_seconds, end_seconds)
+            output_path = self._trim_output_path(input_path)
+            AudioBuffer.write_wav([trimmed], output_path)
+            
+            result = {
+                "status": "success",
+                "output_path": output_path,
+                "original_duration": AudioUtils.format_duration(duration),
+                "trimmed_duration": AudioUtils.format_duration(trimmed.duration_seconds),
+                "start_time": AudioUtils.format_duration(start_seconds),
+                "end_time": AudioUtils.format_duration(end_seconds) if end_seconds else "end of file",
+                "trim_mode": "wav_mmap"
+            }
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error trimming audio: {e}")
+            return {"error": str(e)}
+    
+    @staticmethod
+    def _validate_trim_range(start_seconds: float, end_seconds: Optional[float], duration: float) -> Optional[str]:
+        """Return an error message if the trim range falls outside the audio"""
+        if start_seconds < 0 or start_seconds >= duration:
+            return f"Invalid start time. Must be between 0 and {duration:.2f} seconds"
+        
+        if end_seconds is not None and (end_seconds <= start_seconds or end_seconds > duration):
+            return f"Invalid end time. Must be between {start_seconds:.2f} and {duration:.2f} seconds"
+        
+        return None
+    
+    def _trim_output_path(self, input_path: str) -> str:
+        """Generate and register the output path for a trimmed file"""
+        input_name = Path(input_path).stem
+        input_ext = Path(input_path).suffix
+        return self.temp_storage.allocate(f"{input_name}_trimmed", input_ext)
+    
+    def merge_audio(self, input_paths: List[str], output_format: str = "wav", streaming: bool = True) -> Dict[str, Any]:
+        """Merge multiple audio files into one
+        
+        With streaming enabled and ffmpeg available, inputs are decoded as raw
+        PCM and piped into a single encoder, so nothing is written besides the
+        output and memory use does not grow with the number or length of inputs.
+        """
         if not input_paths:
             return {"error": "No input files provided"}
         
@@ -174,13 +779,49 @@ class AudioProcessor:
             if not AudioUtils.validate_audio_file(path):
                 return {"error": f"Invalid or unsupported audio file: {path}"}
         
+        try:
+            buffers = [self._open_wav_buffer(path) for path in input_paths]
+            # Mapped WAVs describe themselves; only other inputs need a header probe
+            probes = [
+                buffer.info() if buffer is not None else self._probe_safely(path)
+                for path, buffer in zip(input_paths, buffers)
+            ]
+            
+            # Decoded inputs and the combined copy are both held in memory
+            estimated = 2 * sum(
+                self._estimate_decoded_bytes(path, buffer, probed)
+                for path, buffer, probed in zip(input_paths, buffers, probes)
+            )
+            routed = not streaming and not self.memory_budget.fits(estimated)
+            
+            if (streaming or routed) and output_format.lower().lstrip('.') == 'wav':
+                if all(buffers) and all(buffers[0].same_format(buffer) for buffer in buffers[1:]):
+                    if routed:
+                        self.memory_budget.record_routed()
+                    return self._merge_wav(input_paths, buffers)
+            
+            if (streaming or routed) and FFmpegUtils.is_available() and all(probes):
+                if routed:
+                    self.memory_budget.record_routed()
+                return self._merge_streaming(input_paths, probes, output_format)
+            
+            with self.memory_budget.reserve(estimated, f"merge of {len(input_paths)} files"):
+                return self._merge_in_memory(input_paths, output_format)
+        except MemoryBudgetBusy:
+            raise
+        except Exception as e:
+            logger.error(f"Error merging audio files: {e}")
+            return {"error": str(e)}
+    
+    def _merge_in_memory(self, input_paths: List[str], output_format: str) -> Dict[str, Any]:
+        """Merge by decoding every input with pydub and appending them"""
         try:
             # Load and combine audio files
             combined_audio = AudioSegment.empty()
             file_info = []
             
             for i, path in enumerate(input_paths):
-                audio = AudioSegment.from_file(path)
+                audio = self._load_audio(path)
                 combined_audio += audio
                 
                 file_info.append({
@@ -193,8 +834,7 @@ class AudioProcessor:
             if not output_format.startswith('.'):
                 output_format = f".{output_format}"
             
-            output_path = os.path.join(self.temp_dir, f"merged_audio{output_format}")
-            output_path = self._register_temp_file(output_path)
+            output_path = self.temp_storage.allocate("merged_audio", output_format)
             
             # Export merged audio
             combined_audio.export(output_path, format=output_format[1:])
@@ -205,7 +845,8 @@ class AudioProcessor:
                 "merged_files": file_info,
                 "total_files": len(input_paths),
                 "total_duration": AudioUtils.format_duration(len(combined_audio) / 1000.0),
-                "output_format": output_format[1:]
+                "output_format": output_format[1:],
+                "merge_mode": "in_memory"
             }
             
             return result
@@ -214,42 +855,196 @@ class AudioProcessor:
             logger.error(f"Error merging audio files: {e}")
             return {"error": str(e)}
     
-    async def transcribe_audio(self, file_path: str, model: str = "base") -> Dict[str, Any]:
-        """Transcribe audio to text using Whisper (if available)"""
-        if not AudioUtils.validate_audio_file(file_path):
-            return {"error": "Invalid or unsupported audio file"}
+    def _merge_wav(self, input_paths: List[str], buffers: List[AudioBuffer]) -> Dict[str, Any]:
+        """Merge WAV files of identical format by copying their mapped data chunks back to back"""
+        try:
+            output_path = self.temp_storage.allocate("merged_audio", ".wav")
+            frame_count = AudioBuffer.write_wav(buffers, output_path)
+            
+            file_info = [
+                {
+                    "file": Path(path).name,
+                    "duration": AudioUtils.format_duration(buffer.duration_seconds),
+                    "position": i + 1
+                }
+                for i, (path, buffer) in enumerate(zip(input_paths, buffers))
+            ]
+            
+            result = {
+                "status": "success",
+                "output_path": output_path,
+                "merged_files": file_info,
+                "total_files": len(input_paths),
+                "total_duration": AudioUtils.format_duration(frame_count / buffers[0].sample_rate),
+                "output_format": "wav",
+                "merge_mode": "wav_mmap"
+            }
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error merging audio files: {e}")
+            return {"error": str(e)}
+    
+    def _merge_streaming(
+        self,
+        input_paths: List[str],
+        probes: List[Dict[str, Any]],
+        output_format: str
+    ) -> Dict[str, Any]:
+        """Merge by piping each input's normalized PCM into a single ffmpeg encoder"""
+        if not output_format.startswith('.'):
+            output_format = f".{output_format}"
+        
+        # Normalize to the highest rate, channel count and width, as pydub does when appending
+        sample_rate = max(probed["sample_rate"] for probed in probes)
+        channels = max(probed["channels"] for probed in probes)
+        sample_width = max(probed["sample_width"] for probed in probes)
         
         try:
-            import whisper
+            output_path = self.temp_storage.allocate("merged_audio", output_format)
             
-            # Load model
-            logger.info(f"Loading Whisper model: {model}")
-            whisper_model = whisper.load_model(model)
+            codec_args = None
+            if output_format.lower() == '.wav':
+                codec_args = ["-c:a", FFmpegUtils.pcm_codec(sample_width)]
             
-            # Transcribe
-            logger.info(f"Transcribing audio file: {file_path}")
-            result = whisper_model.transcribe(file_path)
+            # Decoders ahead of the one being written run concurrently
+            TranscodePipeline(input_paths, prefetch=self.merge_workers).resample(
+                sample_rate, channels, sample_width
+            ).encode(output_path, codec_args).run()
             
-            response = {
+            file_info = [
+                {
+                    "file": Path(path).name,
+                    "duration": AudioUtils.format_duration(probed["duration_seconds"]),
+                    "position": i + 1
+                }
+                for i, (path, probed) in enumerate(zip(input_paths, probes))
+            ]
+            total_seconds = sum(probed["duration_seconds"] for probed in probes)
+            
+            result = {
                 "status": "success",
-                "transcript": result["text"],
-                "language": result.get("language", "unknown"),
-                "model_used": model,
-                "file_path": file_path
+                "output_path": output_path,
+                "merged_files": file_info,
+                "total_files": len(input_paths),
+                "total_duration": AudioUtils.format_duration(total_seconds),
+                "output_format": output_format[1:],
+                "merge_mode": "streaming"
             }
             
-            # Add segments if available
-            if "segments" in result:
-                segments = []
-                for segment in result["segments"]:
-                    segments.append({
-                        "start": segment["start"],
-                        "end": segment["end"],
-                        "text": segment["text"]
-                    })
-                response["segments"] = segments
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error merging audio files: {e}")
+            return {"error": str(e)}
+    
+    def load_waveform(self, file_path: str) -> Waveform:
+        """Decode a file once to the 16 kHz mono waveform shared by analysis stages"""
+        probed = self._probe_safely(file_path)
+        return Waveform.load(
+            file_path,
+            duration_seconds=probed["duration_seconds"] if probed else None,
+            mmap_dir=self.temp_dir,
+            mmap_threshold_seconds=self.waveform_mmap_seconds
+        )
+    
+    async def transcribe_audio(
+        self,
+        file_path: str,
+        model: str = "base",
+        waveform: Optional[Waveform] = None,
+        long_form: bool = False,
+        chunk_workers: Optional[int] = None,
+        on_segments: Optional[SegmentCallback] = None,
+        speech: Optional[Tuple[Waveform, Optional[SpeechTimeline]]] = None
+    ) -> Dict[str, Any]:
+        """Transcribe audio to text using Whisper (if available)
+        
+        Pass a preloaded waveform to skip decoding the file again, and the
+        (speech waveform, timeline) from _speech_waveform to skip VAD. With
+        long_form, the audio is split at silences and the chunks are
+        transcribed in parallel, up to chunk_workers at a time.
+        
+        With on_segments, the audio is transcribed in short chunks and the
+        callback receives (segments, seconds_done, total_seconds) as each
+        chunk's segments become final, before the full result is returned.
+        """
+        if not AudioUtils.validate_audio_file(file_path):
+            return {"error": "Invalid or unsupported audio file"}
+        
+        if on_segments is not None:
+            mode = "streaming"
+        else:
+            mode = "long_form" if long_form else "single"
+        
+        result = await self._get_or_compute_result(
+            "transcribe_audio",
+            file_path,
+            self._transcription_params(model, mode),
+            lambda: self._transcribe_audio_uncached(file_path, model, waveform, mode, chunk_workers, on_segments, speech)
+        )
+        
+        # A stored result arrives all at once, so hand every segment over in one go
+        if on_segments is not None and result.get("from_cache"):
+            segments = result.get("segments", [])
+            end_seconds = segments[-1]["end"] if segments else 0.0
+            await on_segments(segments, end_seconds, end_seconds)
+        
+        return result
+    
+    async def _transcribe_audio_uncached(
+        self,
+        file_path: str,
+        model: str,
+        waveform: Optional[Waveform],
+        mode: str,
+        chunk_workers: Optional[int],
+        on_segments: Optional[SegmentCallback],
+        speech: Optional[Tuple[Waveform, Optional[SpeechTimeline]]] = None
+    ) -> Dict[str, Any]:
+        """Run Whisper transcription without consulting the result store"""
+        owns_waveform = waveform is None and speech is None
+        speech_waveform = None
+        
+        try:
+            if speech is not None:
+                speech_waveform, timeline = speech
+            else:
+                if waveform is None:
+                    waveform = await self._run_blocking(self.load_waveform, file_path)
+                speech_waveform, timeline = await self._speech_waveform(waveform)
+            
+            if on_segments is not None and timeline is not None and timeline.applied:
+                stream_callback = on_segments
+                
+                async def on_segments(segments, seconds_done, total_seconds):
+                    await stream_callback(
+                        remap_segments(segments, timeline),
+                        timeline.to_original(seconds_done, is_end=True),
+                        timeline.original_seconds
+                    )
+            
+            # Transcribe with a warm model, off the event loop when an execution layer is set
+            logger.info(f"Transcribing audio file: {file_path}")
+            if mode == "streaming":
+                result = await self._transcribe_long_form(
+                    speech_waveform,
+                    model,
+                    chunk_workers,
+                    target_chunk_seconds=STREAMING_CHUNK_SECONDS,
+                    on_segments=on_segments
+                )
+            elif mode == "long_form":
+                result = await self._transcribe_long_form(speech_waveform, model, chunk_workers)
+            else:
+                result = await self._run_inference(run_whisper_transcription, speech_waveform, model)
+            
+            result["segments"] = remap_segments(result["segments"], timeline)
+            if timeline is not None:
+                result["vad"] = timeline.summary()
             
-            return response
+            return self._transcription_response(result, model, file_path)
             
         except ImportError:
             return {
@@ -259,6 +1054,232 @@ class AudioProcessor:
         except Exception as e:
             logger.error(f"Error transcribing audio: {e}")
             return {"error": str(e)}
+        finally:
+            if speech is None and speech_waveform is not None and speech_waveform is not waveform:
+                speech_waveform.close()
+            if owns_waveform and waveform is not None:
+                waveform.close()
+    
+    @staticmethod
+    def _transcription_response(result: Dict[str, Any], model: str, file_path: str) -> Dict[str, Any]:
+        """Build the transcribe_audio response from a Whisper result"""
+        response = {
+            "status": "success",
+            "transcript": result["text"],
+            "language": result["language"],
+            "model_used": model,
+            "file_path": file_path,
+            "segments": result["segments"]
+        }
+        
+        if "chunks" in result:
+            response["chunks"] = result["chunks"]
+        
+        if "vad" in result:
+            response["vad"] = result["vad"]
+        
+        return response
+    
+    async def transcribe_batch(
+        self,
+        source: str,
+        model: str = "base",
+        manifest_path: Optional[str] = None,
+        max_in_flight: Optional[int] = None,
+        on_file: Optional[BatchFileCallback] = None
+    ) -> Dict[str, Any]:
+        """Transcribe every audio file in a directory or glob into a JSONL manifest
+        
+        Files are decoded and transcribed inside the inference workers, so each
+        worker keeps its Whisper model warm across files. Entries are appended
+        to the manifest as files finish, and files already transcribed with the
+        same model and unchanged since are skipped on a rerun.
+        """
+        try:
+            files = await self._run_blocking(AudioUtils.find_audio_files, source)
+        except Exception as e:
+            return {"error": f"Could not list audio files: {e}"}
+        
+        if not files:
+            return {"error": f"No supported audio files found for: {source}"}
+        
+        if manifest_path is None:
+            manifest_path = self._default_manifest_path(source)
+        
+        manifest = TranscriptManifest(manifest_path)
+        completed = await self._run_blocking(manifest.completed, model)
+        pending = [f for f in files if not manifest.is_done(completed, f)]
+        skipped = len(files) - len(pending)
+        
+        logger.info(f"Batch transcription: {len(pending)} files to transcribe, {skipped} already done")
+        
+        # Keep the inference pool busy without holding every file's task at once
+        if max_in_flight is None:
+            max_in_flight = 2 * (self.execution.cpu_concurrency if self.execution else 1)
+        semaphore = asyncio.Semaphore(max_in_flight)
+        counts = {"success": 0, "error": 0}
+        start_time = time.time()
+        
+        async def transcribe_file(file_path: str) -> None:
+            async with semaphore:
+                file_start = time.time()
+                result = await self._get_or_compute_result(
+                    "transcribe_audio",
+                    file_path,
+                    self._transcription_params(model, "single"),
+                    lambda: self._transcribe_file_uncached(file_path, model)
+                )
+                
+                try:
+                    entry = TranscriptManifest.file_identity(file_path)
+                except OSError as e:
+                    # Removed or unreadable since the batch was listed
+                    entry = {"file_path": os.path.abspath(file_path)}
+                    result = {"error": f"File unavailable: {e}"}
+                entry["model"] = model
+                entry["elapsed_seconds"] = round(time.time() - file_start, 3)
+                if "error" in result:
+                    entry["status"] = "error"
+                    entry["error"] = result["error"]
+                else:
+                    entry["status"] = "success"
+                    entry["transcript"] = result["transcript"]
+                    entry["language"] = result["language"]
+                    entry["segments"] = result["segments"]
+                    if "vad" in result:
+                        entry["skipped_fraction"] = result["vad"]["skipped_fraction"]
+                
+                await self._run_blocking(manifest.append, entry)
+                counts[entry["status"]] += 1
+                
+                if on_file is not None:
+                    await on_file(entry, counts["success"] + counts["error"], len(pending))
+        
+        await asyncio.gather(*(transcribe_file(f) for f in pending))
+        
+        elapsed = time.time() - start_time
+        return {
+            "status": "success",
+            "source": source,
+            "manifest_path": manifest_path,
+            "model_used": model,
+            "total_files": len(files),
+            "skipped": skipped,
+            "transcribed": counts["success"],
+            "failed": counts["error"],
+            "elapsed_seconds": round(elapsed, 2),
+            "files_per_minute": round(60 * len(pending) / elapsed, 1) if pending and elapsed > 0 else 0.0
+        }
+    
+    def _default_manifest_path(self, source: str) -> str:
+        """Return the manifest path for a batch source when the caller gives none
+        
+        Manifests live in the cache directory rather than next to the
+        recordings, which may be read-only or shared; the name is derived from
+        the source so a rerun of the same batch finds its manifest again.
+        """
+        source_key = hashlib.sha1(os.path.abspath(source).encode()).hexdigest()[:16]
+        stem = re.sub(r"[^A-Za-z0-9_-]+", "_", Path(source.rstrip(os.sep)).stem).strip("_") or "batch"
+        return os.path.join(self.cache_dir, DEFAULT_MANIFEST_DIR, f"{stem}-{source_key}.jsonl")
+    
+    async def _transcribe_file_uncached(self, file_path: str, model: str) -> Dict[str, Any]:
+        """Transcribe one file by path, letting the inference worker decode it"""
+        try:
+            result = await self._run_inference(run_whisper_file, file_path, model, self.vad_filter)
+            return self._transcription_response(result, model, file_path)
+        except ImportError:
+            return {"error": "Whisper not installed. Install with: pip install openai-whisper"}
+        except Exception as e:
+            logger.error(f"Error transcribing {file_path}: {e}")
+            return {"error": str(e)}
+    
+    async def _transcribe_long_form(
+        self,
+        waveform: Waveform,
+        model: str,
+        chunk_workers: Optional[int] = None,
+        target_chunk_seconds: float = 300.0,
+        on_segments: Optional[SegmentCallback] = None
+    ) -> Dict[str, Any]:
+        """Transcribe silence-delimited chunks in parallel and stitch them on the global timeline
+        
+        Chunks are stitched in order as they finish; on_segments, if given,
+        receives each chunk's new segments as soon as they are final.
+        """
+        chunks = plan_chunks(
+            waveform.samples,
+            waveform.sample_rate,
+            target_chunk_seconds=target_chunk_seconds,
+            search_seconds=target_chunk_seconds / 10
+        )
+        logger.info(f"Transcribing {len(chunks)} chunks in parallel")
+        
+        semaphore = asyncio.Semaphore(chunk_workers or len(chunks))
+        
+        async def transcribe_chunk(chunk) -> Dict[str, Any]:
+            start, end, _, _ = chunk
+            if waveform.mmap_path is None:
+                # Send only the chunk's samples; a whole in-memory waveform would be pickled per chunk
+                args = (Waveform(waveform.samples[start:end], waveform.sample_rate), 0, end - start, model, start)
+            else:
+                args = (waveform, start, end, model)
+            async with semaphore:
+                return await self._run_inference(run_whisper_chunk, *args)
+        
+        tasks = [asyncio.ensure_future(transcribe_chunk(chunk)) for chunk in chunks]
+        segments: List[Dict[str, Any]] = []
+        languages = []
+        
+        try:
+            for chunk, task in zip(chunks, tasks):
+                chunk_result = await task
+                languages.append(chunk_result["language"])
+                
+                new_segments = self._stitch_chunk(segments, chunk, chunk_result, waveform.sample_rate)
+                segments.extend(new_segments)
+                
+                if on_segments is not None:
+                    await on_segments(new_segments, chunk[3] / waveform.sample_rate, waveform.duration_seconds)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        
+        return {
+            "text": " ".join(segment["text"].strip() for segment in segments),
+            "language": max(set(languages), key=languages.count),
+            "segments": segments,
+            "chunks": len(chunks)
+        }
+    
+    @staticmethod
+    def _stitch_chunk(
+        stitched: List[Dict[str, Any]],
+        chunk: Any,
+        chunk_result: Dict[str, Any],
+        sample_rate: int
+    ) -> List[Dict[str, Any]]:
+        """Return the segments a chunk owns, dropping text repeated across the overlap"""
+        _, _, own_start, own_end = chunk
+        own_start_seconds = own_start / sample_rate
+        own_end_seconds = own_end / sample_rate
+        previous = stitched[-1] if stitched else None
+        new_segments = []
+        
+        for segment in chunk_result["segments"]:
+            midpoint = (segment["start"] + segment["end"]) / 2
+            if not own_start_seconds <= midpoint < own_end_seconds:
+                continue
+            
+            text = " ".join(segment["text"].lower().split())
+            if previous is not None and text == " ".join(previous["text"].lower().split()) \
+                    and segment["start"] < previous["end"]:
+                continue
+            
+            new_segments.append(segment)
+            previous = segment
+        
+        return new_segments
     
     async def generate_speech(self, text: str, output_format: str = "mp3", voice: str = "default") -> Dict[str, Any]:
         """Generate speech from text using TTS"""
@@ -266,30 +1287,15 @@ class AudioProcessor:
             return {"error": "No text provided"}
         
         try:
-            from gtts import gTTS
-            
             # Generate output path
             if not output_format.startswith('.'):
                 output_format = f".{output_format}"
             
-            output_path = os.path.join(self.temp_dir, f"generated_speech{output_format}")
-            output_path = self._register_temp_file(output_path)
+            output_path = self.temp_storage.allocate("generated_speech", output_format)
             
-            # Generate speech
+            # The gTTS request and any re-encode block, so they run off the event loop
             logger.info(f"Generating speech for text: {text[:50]}...")
-            tts = gTTS(text=text, lang='en', slow=False)
-            
-            # Save to temporary file first (gTTS saves as mp3)
-            temp_mp3 = os.path.join(self.temp_dir, "temp_speech.mp3")
-            tts.save(temp_mp3)
-            
-            # Convert to desired format if needed
-            if output_format.lower() != '.mp3':
-                audio = AudioSegment.from_mp3(temp_mp3)
-                audio.export(output_path, format=output_format[1:])
-                os.remove(temp_mp3)
-            else:
-                os.rename(temp_mp3, output_path)
+            await self._run_blocking(self._synthesize_speech, text, output_path, output_format)
             
             result = {
                 "status": "success",
@@ -310,27 +1316,80 @@ class AudioProcessor:
             logger.error(f"Error generating speech: {e}")
             return {"error": str(e)}
     
-    async def diarize_speakers(self, file_path: str) -> Dict[str, Any]:
-        """Perform speaker diarization to identify who spoke when"""
+    def _synthesize_speech(self, text: str, output_path: str, output_format: str) -> None:
+        """Fetch speech for text from gTTS and write it to output_path (blocking)"""
+        gTTS = get_process_capabilities().require("tts").gTTS
+        tts = gTTS(text=text, lang='en', slow=False)
+        
+        # gTTS saves as mp3; convert to the desired format if needed
+        if output_format.lower() != '.mp3':
+            temp_mp3 = self.temp_storage.allocate("temp_speech", ".mp3", pinned=True)
+            try:
+                tts.save(temp_mp3)
+                audio = AudioSegment.from_mp3(temp_mp3)
+                audio.export(output_path, format=output_format[1:])
+            finally:
+                self.temp_storage.discard(temp_mp3)
+        else:
+            tts.save(output_path)
+    
+    async def diarize_speakers(
+        self,
+        file_path: str,
+        waveform: Optional[Waveform] = None,
+        speech: Optional[Tuple[Waveform, Optional[SpeechTimeline]]] = None
+    ) -> Dict[str, Any]:
+        """Perform speaker diarization to identify who spoke when
+        
+        Pass a preloaded waveform to skip decoding the file again, and the
+        (speech waveform, timeline) from _speech_waveform to skip VAD.
+        """
         if not AudioUtils.validate_audio_file(file_path):
             return {"error": "Invalid or unsupported audio file"}
         
+        return await self._get_or_compute_result(
+            "diarize_speakers",
+            file_path,
+            self._diarization_params(),
+            lambda: self._diarize_speakers_uncached(file_path, waveform, speech)
+        )
+    
+    async def _diarize_speakers_uncached(
+        self,
+        file_path: str,
+        waveform: Optional[Waveform],
+        speech: Optional[Tuple[Waveform, Optional[SpeechTimeline]]] = None
+    ) -> Dict[str, Any]:
+        """Run speaker diarization without consulting the result store"""
+        owns_waveform = waveform is None and speech is None
+        speech_waveform = None
+        
         try:
-            from pyannote.audio import Pipeline
-            
-            # Load the speaker diarization pipeline
-            logger.info("Loading speaker diarization pipeline...")
-            pipeline = Pipeline.from_pretrained("pyannote/speaker-diarization-3.1")
+            if speech is not None:
+                speech_waveform, timeline = speech
+            else:
+                if waveform is None:
+                    waveform = await self._run_blocking(self.load_waveform, file_path)
+                speech_waveform, timeline = await self._speech_waveform(waveform)
             
-            # Perform diarization
+            # Perform diarization with a warm pipeline
             logger.info(f"Performing speaker diarization on: {file_path}")
-            diarization = pipeline(file_path)
+            diarization = await self._run_inference(run_speaker_diarization, speech_waveform)
+            
+            # Turns that spanned removed silence are split back into their speech regions
+            turns = diarization["turns"]
+            if timeline is not None and timeline.applied:
+                turns = [
+                    (span_start, span_end, speaker)
+                    for turn_start, turn_end, speaker in turns
+                    for span_start, span_end in timeline.split_span(turn_start, turn_end)
+                ]
             
             # Process results
             speakers = {}
             segments = []
             
-            for turn, _, speaker in diarization.itertracks(yield_label=True):
+            for turn_start, turn_end, speaker in turns:
                 speaker_id = f"Speaker_{speaker}"
                 
                 # Track speaker info
@@ -341,13 +1400,13 @@ class AudioProcessor:
                     }
                 
                 # Add segment
-                segment_duration = turn.end - turn.start
+                segment_duration = turn_end - turn_start
                 speakers[speaker_id]["total_speaking_time"] += segment_duration
                 speakers[speaker_id]["segments"] += 1
                 
                 segments.append({
-                    "start": round(turn.start, 2),
-                    "end": round(turn.end, 2),
+                    "start": round(turn_start, 2),
+                    "end": round(turn_end, 2),
                     "duration": round(segment_duration, 2),
                     "speaker": speaker_id
                 })
@@ -374,6 +1433,9 @@ class AudioProcessor:
                 "total_segments": len(segments)
             }
             
+            if timeline is not None:
+                result["vad"] = timeline.summary()
+            
             return result
             
         except ImportError:
@@ -384,128 +1446,327 @@ class AudioProcessor:
         except Exception as e:
             logger.error(f"Error performing speaker diarization: {e}")
             return {"error": str(e)}
+        finally:
+            if speech is None and speech_waveform is not None and speech_waveform is not waveform:
+                speech_waveform.close()
+            if owns_waveform and waveform is not None:
+                waveform.close()
     
-    async def detect_emotions(self, file_path: str, api_key: str) -> Dict[str, Any]:
-        """Detect emotions in audio using Hume AI API"""
+    async def detect_emotions(
+        self,
+        file_path: str,
+        api_key: str,
+        waveform: Optional[Waveform] = None,
+        speech: Optional[Tuple[Waveform, Optional[SpeechTimeline]]] = None
+    ) -> Dict[str, Any]:
+        """Detect emotions in audio using Hume AI API
+        
+        Pass a preloaded waveform to skip decoding the file again when the
+        VAD filter cuts the upload down to speech, and the (speech waveform,
+        timeline) from _speech_waveform to skip VAD as well.
+        """
         if not AudioUtils.validate_audio_file(file_path):
             return {"error": "Invalid or unsupported audio file"}
         
         if not api_key:
             return {"error": "Hume API key not provided"}
         
+        return await self._get_or_compute_result(
+            "detect_emotions",
+            file_path,
+            self._emotion_params(),
+            lambda: self._detect_emotions_uncached(file_path, api_key, waveform, speech)
+        )
+    
+    async def _detect_emotions_uncached(
+        self,
+        file_path: str,
+        api_key: str,
+        waveform: Optional[Waveform] = None,
+        speech: Optional[Tuple[Waveform, Optional[SpeechTimeline]]] = None
+    ) -> Dict[str, Any]:
+        """Call the Hume API without consulting the result store"""
+        upload_path, timeline = file_path, None
+        
         try:
-            import httpx
-            import base64
-            import json
-            
-            # Read and encode audio file
-            with open(file_path, "rb") as audio_file:
-                audio_data = base64.b64encode(audio_file.read()).decode('utf-8')
-            
-            # Get file extension for mime type
-            file_ext = Path(file_path).suffix.lower()
-            mime_type_map = {
-                '.wav': 'audio/wav',
-                '.mp3': 'audio/mpeg',
-                '.m4a': 'audio/mp4',
-                '.flac': 'audio/flac',
-                '.ogg': 'audio/ogg'
-            }
-            mime_type = mime_type_map.get(file_ext, 'audio/wav')
-            
-            # Prepare request payload
-            payload = {
-                "data": audio_data,
-                "type": mime_type
-            }
+            upload_path, timeline = await self._prepare_emotion_upload(file_path, waveform, speech)
             
-            headers = {
-                "X-Hume-Api-Key": api_key,
-                "Content-Type": "application/json"
-            }
-            
-            # Make API request
             logger.info(f"Sending audio to Hume API for emotion detection...")
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    "https://api.hume.ai/v0/batch/jobs",
-                    headers=headers,
-                    json={
-                        "models": {
-                            "prosody": {}
-                        },
-                        "transcription": {
-                            "identify_speakers": True
-                        },
-                        "notify": False,
-                        "urls": [],
-                        "files": [payload]
-                    }
-                )
-                
-                if response.status_code != 200:
-                    return {"error": f"Hume API error: {response.status_code} - {response.text}"}
-                
-                job_data = response.json()
-                job_id = job_data.get("job_id")
-                
-                if not job_id:
-                    return {"error": "Failed to get job ID from Hume API"}
-                
-                # Poll for results
-                max_attempts = 30
-                for attempt in range(max_attempts):
-                    await asyncio.sleep(2)  # Wait 2 seconds between polls
-                    
-                    status_response = await client.get(
-                        f"https://api.hume.ai/v0/batch/jobs/{job_id}",
-                        headers=headers
-                    )
-                    
-                    if status_response.status_code != 200:
-                        continue
-                    
-                    status_data = status_response.json()
-                    state = status_data.get("state", {}).get("status")
-                    
-                    if state == "COMPLETED":
-                        # Get results
-                        results_response = await client.get(
-                            f"https://api.hume.ai/v0/batch/jobs/{job_id}/predictions",
-                            headers=headers
-                        )
-                        
-                        if results_response.status_code == 200:
-                            results = results_response.json()
-                            return self._process_hume_results(results, file_path)
-                        else:
-                            return {"error": f"Failed to get results: {results_response.status_code}"}
-                    
-                    elif state == "FAILED":
-                        return {"error": "Hume API job failed"}
-                
-                return {"error": "Timeout waiting for Hume API results"}
+            job_id = await self.hume_client.submit_job(api_key, [upload_path], HUME_JOB_CONFIG)
+            await self.hume_client.wait_for_job(api_key, job_id)
+            results = await self.hume_client.get_predictions(api_key, job_id)
+            
+            result = self._process_hume_results(results, file_path)
+            return self._finish_emotion_result(result, file_path, upload_path, timeline)
             
         except ImportError:
             return {
                 "error": "httpx not installed. Install with: pip install httpx",
                 "suggestion": "Run: pip install httpx"
             }
+        except HumeAPIError as e:
+            return {"error": str(e)}
+        except TimeoutError:
+            return {"error": "Timeout waiting for Hume API results"}
         except Exception as e:
             logger.error(f"Error detecting emotions: {e}")
             return {"error": str(e)}
+        finally:
+            if upload_path != file_path:
+                self.temp_storage.discard(upload_path)
+    
+    async def _prepare_emotion_upload(
+        self,
+        file_path: str,
+        waveform: Optional[Waveform] = None,
+        speech: Optional[Tuple[Waveform, Optional[SpeechTimeline]]] = None
+    ) -> Tuple[str, Optional[SpeechTimeline]]:
+        """Return the path to upload for file_path and the timeline to map results back
+        
+        With the VAD filter on and enough silence to skip, the upload is the
+        speech alone; otherwise it is the whole recording. Either is encoded
+        with the upload profile into temp storage, and the original file is
+        sent only when the profile is "original" or encoding does not help.
+        """
+        timeline = None
+        
+        if self.vad_filter:
+            owns_waveform = waveform is None and speech is None
+            speech_waveform = None
+            
+            try:
+                if speech is not None:
+                    speech_waveform, timeline = speech
+                else:
+                    if waveform is None:
+                        waveform = await self._run_blocking(self.load_waveform, file_path)
+                    speech_waveform, timeline = await self._speech_waveform(waveform)
+                if timeline.applied:
+                    upload_path = await self._run_blocking(self._encode_speech_upload, speech_waveform)
+                    return upload_path, timeline
+                
+            except Exception as e:
+                logger.warning(f"VAD pre-filter failed for {file_path}, uploading the full file: {e}")
+                timeline = None
+            finally:
+                if speech is None and speech_waveform is not None and speech_waveform is not waveform:
+                    speech_waveform.close()
+                if owns_waveform and waveform is not None:
+                    waveform.close()
+        
+        upload_path = await self._run_blocking(self._encode_file_upload, file_path)
+        return upload_path, timeline
+    
+    def _encode_speech_upload(self, waveform: Waveform) -> str:
+        """Pipe a speech-only waveform through the upload encoder, falling back to WAV"""
+        profile = UPLOAD_PROFILES.get(self.upload_profile)
+        if profile is None or not FFmpegUtils.is_available():
+            return self._write_speech_wav(waveform)
+        
+        samples = np.asarray(waveform.samples)
+        output_path = self.temp_storage.allocate("speech", profile["suffix"], pinned=True)
+        chunks = (
+            samples[start:start + UPLOAD_PIPE_SAMPLES].astype("<f4").tobytes()
+            for start in range(0, len(samples), UPLOAD_PIPE_SAMPLES)
+        )
+        try:
+            FFmpegUtils.encode_pcm_stream(
+                chunks,
+                waveform.sample_rate,
+                1,
+                output_path,
+                ["-ar", str(UPLOAD_SAMPLE_RATE), "-ac", "1"] + profile["codec_args"]
+            )
+            return output_path
+        except (RuntimeError, OSError) as e:
+            logger.warning(f"Upload encoding failed, sending speech as WAV: {e}")
+            self.temp_storage.discard(output_path)
+            return self._write_speech_wav(waveform)
+    
+    def _encode_file_upload(self, file_path: str) -> str:
+        """Transcode a recording with the upload profile, or return it unchanged
+        
+        ffmpeg decodes and encodes in one streaming pass. The original is kept
+        when it is already smaller than the encoded copy.
+        """
+        profile = UPLOAD_PROFILES.get(self.upload_profile)
+        if profile is None or not FFmpegUtils.is_available():
+            return file_path
+        
+        output_path = self.temp_storage.allocate(file_path, profile["suffix"], pinned=True)
+        try:
+            FFmpegUtils.run([
+                "-i", file_path,
+                "-map", "0:a:0",
+                "-ar", str(UPLOAD_SAMPLE_RATE),
+                "-ac", "1"
+            ] + profile["codec_args"] + [output_path])
+        except (RuntimeError, OSError) as e:
+            logger.warning(f"Upload encoding failed for {file_path}, sending the original: {e}")
+            self.temp_storage.discard(output_path)
+            return file_path
+        
+        if os.path.getsize(output_path) >= os.path.getsize(file_path):
+            self.temp_storage.discard(output_path)
+            return file_path
+        return output_path
+    
+    def _write_speech_wav(self, waveform: Waveform) -> str:
+        """Write a waveform to a 16-bit PCM WAV in temp storage"""
+        pcm = np.clip(np.asarray(waveform.samples) * 32767.0, -32768, 32767).astype("<i2")
+        buffer = AudioBuffer(pcm.view(np.uint8).reshape(-1, 2), waveform.sample_rate, 1, 2)
+        output_path = self.temp_storage.allocate("speech", ".wav", pinned=True)
+        AudioBuffer.write_wav([buffer], output_path)
+        return output_path
+    
+    @staticmethod
+    def _finish_emotion_result(
+        result: Dict[str, Any],
+        file_path: str,
+        upload_path: str,
+        timeline: Optional[SpeechTimeline]
+    ) -> Dict[str, Any]:
+        """Map emotion segments back to the original timeline and record what was uploaded"""
+        if "error" in result:
+            return result
+        
+        if timeline is not None and timeline.applied:
+            for segment in result["segments"]:
+                segment["start"] = timeline.to_original(segment["start"])
+                segment["end"] = timeline.to_original(segment["end"], is_end=True)
+                segment["duration"] = segment["end"] - segment["start"]
+        
+        if timeline is not None:
+            result["vad"] = timeline.summary()
+        result["original_bytes"] = os.path.getsize(file_path)
+        result["uploaded_bytes"] = os.path.getsize(upload_path)
+        result["upload_format"] = Path(upload_path).suffix.lstrip(".").lower()
+        return result
+    
+    async def detect_emotions_batch(
+        self,
+        source: str,
+        api_key: str,
+        files_per_job: int = 50,
+        max_concurrent_jobs: int = 4
+    ) -> Dict[str, Any]:
+        """Detect emotions in every audio file of a directory or glob using few Hume jobs
+        
+        Files with a stored result are not uploaded again. The rest are sent
+        files_per_job at a time, each group as a single Hume job, and the
+        predictions are split back out per file. At most max_concurrent_jobs
+        groups are prepared and in flight at once.
+        """
+        if not api_key:
+            return {"error": "Hume API key not provided"}
+        
+        try:
+            files = await self._run_blocking(AudioUtils.find_audio_files, source)
+        except Exception as e:
+            return {"error": f"Could not list audio files: {e}"}
+        
+        if not files:
+            return {"error": f"No supported audio files found for: {source}"}
+        
+        start_time = time.time()
+        params = self._emotion_params()
+        results: Dict[str, Dict[str, Any]] = {}
+        store_keys: Dict[str, str] = {}
+        
+        for file_path in files:
+            key, stored = await self._lookup_result("detect_emotions", file_path, params)
+            if stored is not None:
+                results[file_path] = stored
+            elif key is not None:
+                store_keys[file_path] = key
+        
+        pending = [f for f in files if f not in results]
+        groups = [pending[i:i + files_per_job] for i in range(0, len(pending), files_per_job)]
+        requests_before = self.hume_client.stats()["requests"]
+        
+        logger.info(f"Emotion batch: {len(pending)} files in {len(groups)} Hume jobs, {len(results)} from cache")
+        
+        job_slots = asyncio.Semaphore(max(1, max_concurrent_jobs))
+        
+        async def run_group(group: List[str]) -> Dict[str, Dict[str, Any]]:
+            async with job_slots:
+                return await self._detect_emotions_group(group, api_key)
+        
+        group_results = await asyncio.gather(*(run_group(group) for group in groups))
+        
+        for group_result in group_results:
+            for file_path, result in group_result.items():
+                results[file_path] = result
+                if "error" not in result and file_path in store_keys:
+                    await self._run_blocking(self.result_store.put, store_keys[file_path], "detect_emotions", result)
+        
+        failed = [f for f in files if "error" in results[f]]
+        return {
+            "status": "success",
+            "source": source,
+            "total_files": len(files),
+            "from_cache": len(files) - len(pending),
+            "analyzed": len(pending) - len(failed),
+            "failed": len(failed),
+            "hume_jobs": len(groups),
+            "api_requests": self.hume_client.stats()["requests"] - requests_before,
+            "elapsed_seconds": round(time.time() - start_time, 2),
+            "files": results
+        }
+    
+    async def _detect_emotions_group(self, file_paths: List[str], api_key: str) -> Dict[str, Dict[str, Any]]:
+        """Run one Hume job for file_paths and return a result per file"""
+        prepared = await asyncio.gather(*(self._prepare_emotion_upload(f) for f in file_paths))
+        upload_paths = [upload_path for upload_path, _ in prepared]
+        
+        try:
+            try:
+                job_id = await self.hume_client.submit_job(api_key, upload_paths, HUME_JOB_CONFIG)
+                await self.hume_client.wait_for_job(api_key, job_id)
+                predictions = await self.hume_client.get_predictions(api_key, job_id)
+            except ImportError:
+                return {f: {"error": "httpx not installed. Install with: pip install httpx"} for f in file_paths}
+            except TimeoutError:
+                return {f: {"error": "Timeout waiting for Hume API results"} for f in file_paths}
+            except Exception as e:
+                logger.error(f"Error in Hume batch job: {e}")
+                return {f: {"error": str(e)} for f in file_paths}
+            
+            names = HumeClient.upload_names(upload_paths)
+            by_name = HumeClient.split_predictions(predictions, names)
+            
+            results = {}
+            for file_path, name, (upload_path, timeline) in zip(file_paths, names, prepared):
+                if name in by_name:
+                    result = self._summarize_hume_prediction(by_name[name], file_path)
+                    results[file_path] = self._finish_emotion_result(result, file_path, upload_path, timeline)
+                else:
+                    results[file_path] = {"error": "No emotion predictions found in results"}
+            return results
+        finally:
+            for file_path, upload_path in zip(file_paths, upload_paths):
+                if upload_path != file_path:
+                    self.temp_storage.discard(upload_path)
     
     def _process_hume_results(self, results: Dict[str, Any], file_path: str) -> Dict[str, Any]:
-        """Process Hume API results into a structured format"""
+        """Process Hume API results for a single-file job into a structured format"""
         try:
             # Extract prosody predictions
             predictions = results[0].get("results", {}).get("predictions", [])
-            
-            if not predictions:
-                return {"error": "No emotion predictions found in results"}
-            
-            prosody_data = predictions[0].get("models", {}).get("prosody", {}).get("grouped_predictions", [])
+        except Exception as e:
+            logger.error(f"Error processing Hume results: {e}")
+            return {"error": f"Error processing emotion results: {str(e)}"}
+        
+        if not predictions:
+            return {"error": "No emotion predictions found in results"}
+        
+        return self._summarize_hume_prediction(predictions[0], file_path)
+    
+    def _summarize_hume_prediction(self, prediction_entry: Dict[str, Any], file_path: str) -> Dict[str, Any]:
+        """Summarize the prosody predictions Hume returned for one file"""
+        try:
+            prosody_data = prediction_entry.get("models", {}).get("prosody", {}).get("grouped_predictions", [])
             
             if not prosody_data:
                 return {"error": "No prosody data found in results"}
@@ -586,62 +1847,294 @@ class AudioProcessor:
             return {"error": f"Error processing emotion results: {str(e)}"}
     
     async def analyze_conversation(self, file_path: str, hume_api_key: Optional[str] = None) -> Dict[str, Any]:
-        """Comprehensive conversation analysis combining transcription, diarization, and emotion detection"""
+        """Comprehensive conversation analysis combining transcription, diarization, and emotion detection
+        
+        Independent components run concurrently; insights are generated once
+        the components they depend on have finished. Only the components are
+        kept in the result store, so a component that failed is retried on
+        the next analysis while the others are served from the store.
+        """
         if not AudioUtils.validate_audio_file(file_path):
             return {"error": "Invalid or unsupported audio file"}
         
         logger.info(f"Starting comprehensive conversation analysis for: {file_path}")
         
+        async def no_api_key() -> Dict[str, Any]:
+            return {"error": "Hume API key not provided"}
+        
+        async def insights(deps: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            successful = {name: result for name, result in deps.items() if "error" not in result}
+            if len(successful) < 2:
+                return None
+            return self._generate_conversation_insights(successful)
+        
+        # Result store operation and params of each component that reads the decoded audio
+        decoding_components = {
+            "transcription": ("transcribe_audio", self._transcription_params("base", "single")),
+            "diarization": ("diarize_speakers", self._diarization_params())
+        }
+        if hume_api_key and self.vad_filter:
+            decoding_components["emotions"] = ("detect_emotions", self._emotion_params())
+        
+        async def find_stored(deps: Dict[str, Any]) -> List[str]:
+            return await self._stored_results(file_path, decoding_components)
+        
+        # Waveforms as the graph produces them, so they are closed even if it raises
+        opened: Dict[str, Any] = {}
+        
+        async def load_shared_waveform(deps: Dict[str, Any]) -> Optional[Waveform]:
+            if set(decoding_components) <= set(deps["stored"]):
+                logger.info(f"All components of {file_path} are stored, skipping the decode")
+                return None
+            # On failure each stage falls back to decoding on its own and reports its error
+            try:
+                opened["waveform"] = await self._run_blocking(self.load_waveform, file_path)
+                return opened["waveform"]
+            except Exception as e:
+                logger.warning(f"Could not preload waveform for {file_path}: {e}")
+                return None
+        
+        async def select_speech(deps: Dict[str, Any]) -> Optional[Tuple[Waveform, Optional[SpeechTimeline]]]:
+            # Run VAD once for every component instead of once each
+            if deps["waveform"] is None:
+                return None
+            try:
+                opened["speech"] = await self._speech_waveform(deps["waveform"])
+                return opened["speech"]
+            except Exception as e:
+                logger.warning(f"VAD failed for {file_path}, components will retry it: {e}")
+                return None
+        
+        # Component name -> (dependencies, coroutine factory taking dependency results)
+        graph = {
+            "audio_info": ([], lambda deps: self.run_within_budget(self.get_audio_info, file_path)),
+            "stored": ([], find_stored),
+            "waveform": (["stored"], load_shared_waveform),
+            "speech": (["waveform"], select_speech),
+            "transcription": (
+                ["waveform", "speech"],
+                lambda deps: self.transcribe_audio(file_path, "base", waveform=deps["waveform"], speech=deps["speech"])
+            ),
+            "diarization": (
+                ["waveform", "speech"],
+                lambda deps: self.diarize_speakers(file_path, waveform=deps["waveform"], speech=deps["speech"])
+            ),
+            "emotions": (
+                ["waveform", "speech"],
+                lambda deps: self.detect_emotions(
+                    file_path, hume_api_key, waveform=deps["waveform"], speech=deps["speech"]
+                ) if hume_api_key else no_api_key()
+            ),
+            "insights": (["transcription", "diarization", "emotions"], insights)
+        }
+        
         try:
-            # Get basic audio info
-            audio_info = self.get_audio_info(file_path)
+            component_results, component_timings = await self._run_component_graph(graph)
             
             results = {
                 "status": "success",
                 "file_path": file_path,
-                "audio_info": audio_info,
-                "analysis_components": []
+                "audio_info": component_results["audio_info"],
+                "analysis_components": [],
+                "component_timings": component_timings
             }
             
-            # 1. Transcription
-            logger.info("Starting transcription...")
-            transcription_result = await self.transcribe_audio(file_path, "base")
-            if "error" not in transcription_result:
-                results["transcription"] = transcription_result
-                results["analysis_components"].append("transcription")
-            else:
-                results["transcription_error"] = transcription_result["error"]
-            
-            # 2. Speaker Diarization
-            logger.info("Starting speaker diarization...")
-            diarization_result = await self.diarize_speakers(file_path)
-            if "error" not in diarization_result:
-                results["diarization"] = diarization_result
-                results["analysis_components"].append("diarization")
-            else:
-                results["diarization_error"] = diarization_result["error"]
-            
-            # 3. Emotion Detection (if API key provided)
-            if hume_api_key:
-                logger.info("Starting emotion detection...")
-                emotion_result = await self.detect_emotions(file_path, hume_api_key)
-                if "error" not in emotion_result:
-                    results["emotions"] = emotion_result
-                    results["analysis_components"].append("emotions")
+            for name in ("transcription", "diarization", "emotions"):
+                component_result = component_results[name]
+                if "error" not in component_result:
+                    results[name] = component_result
+                    results["analysis_components"].append(name)
                 else:
-                    results["emotions_error"] = emotion_result["error"]
-            else:
-                results["emotions_error"] = "Hume API key not provided"
+                    results[f"{name}_error"] = component_result["error"]
             
-            # 4. Combine results for insights
-            if len(results["analysis_components"]) >= 2:
-                results["insights"] = self._generate_conversation_insights(results)
+            if component_results["insights"] is not None:
+                results["insights"] = component_results["insights"]
             
             return results
             
         except Exception as e:
             logger.error(f"Error in conversation analysis: {e}")
             return {"error": str(e)}
+        finally:
+            shared_waveform = opened.get("waveform")
+            speech = opened.get("speech")
+            if speech is not None and speech[0] is not shared_waveform:
+                speech[0].close()
+            if shared_waveform is not None:
+                shared_waveform.close()
+    
+    async def _speech_waveform(self, waveform: Waveform) -> Tuple[Waveform, Optional[SpeechTimeline]]:
+        """Cut waveform down to speech when the VAD filter is on; returns the timeline to map results back"""
+        if not self.vad_filter:
+            return waveform, None
+        
+        speech_waveform, timeline = await self._run_blocking(speech_only, waveform, self.temp_dir)
+        if timeline.applied:
+            logger.info(
+                f"VAD kept {timeline.speech_seconds:.1f}s of {timeline.original_seconds:.1f}s "
+                f"({timeline.skipped_fraction * 100:.0f}% skipped)"
+            )
+        return speech_waveform, timeline
+    
+    def _transcription_params(self, model: str, mode: str) -> Dict[str, Any]:
+        """Result store params of a transcription"""
+        return {"model": model, "mode": mode, "vad": self.vad_filter}
+    
+    def _diarization_params(self) -> Dict[str, Any]:
+        """Result store params of a diarization"""
+        return {"pipeline": DIARIZATION_PIPELINE, "vad": self.vad_filter}
+    
+    def _emotion_params(self) -> Dict[str, Any]:
+        """Result store params of an emotion detection"""
+        return {"models": ["prosody"], "vad": self.vad_filter, "upload": self.upload_profile}
+    
+    async def _stored_results(self, file_path: str, requests: Dict[str, Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """Return the names of the (operation, params) requests whose results are stored for file_path"""
+        if self.result_store is None:
+            return []
+        
+        try:
+            fingerprint = await self._run_blocking(self.result_store.fingerprint, file_path)
+        except Exception as e:
+            logger.warning(f"Could not fingerprint {file_path}, skipping result store: {e}")
+            return []
+        
+        stored = []
+        for name, (operation, params) in requests.items():
+            key = ResultStore.make_key(operation, fingerprint, params)
+            if await self._run_blocking(self.result_store.contains, key):
+                stored.append(name)
+        return stored
+    
+    async def _get_or_compute_result(
+        self,
+        operation: str,
+        file_path: str,
+        params: Dict[str, Any],
+        compute
+    ) -> Dict[str, Any]:
+        """Serve a result from the persistent result store, computing it on a miss"""
+        if self.result_store is None:
+            return await compute()
+        
+        try:
+            fingerprint = await self._run_blocking(self.result_store.fingerprint, file_path)
+        except Exception as e:
+            logger.warning(f"Could not fingerprint {file_path}, skipping result store: {e}")
+            return await compute()
+        
+        result = await self.result_store.get_or_compute(operation, fingerprint, params, compute, self._run_blocking)
+        return self._with_request_path(result, file_path)
+    
+    @staticmethod
+    def _with_request_path(result: Dict[str, Any], file_path: str) -> Dict[str, Any]:
+        """Point the file_path fields of a stored or shared result at the file this request named
+        
+        Results are keyed by content, so they may have been computed for a
+        byte-identical copy at another path. Nested component results, such
+        as audio_info in a conversation analysis, are rewritten too.
+        """
+        result = dict(result)
+        if "file_path" in result:
+            result["file_path"] = file_path
+        for key, value in list(result.items()):
+            if isinstance(value, dict) and "file_path" in value:
+                result[key] = dict(value, file_path=file_path)
+        return result
+    
+    async def _lookup_result(
+        self,
+        operation: str,
+        file_path: str,
+        params: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Return (store key, stored result) for file_path; the key is None when the store is unavailable"""
+        if self.result_store is None:
+            return None, None
+        
+        try:
+            fingerprint = await self._run_blocking(self.result_store.fingerprint, file_path)
+        except Exception as e:
+            logger.warning(f"Could not fingerprint {file_path}, skipping result store: {e}")
+            return None, None
+        
+        key, stored = await self._run_blocking(self.result_store.lookup, operation, fingerprint, params)
+        if stored is not None:
+            stored = self._with_request_path(stored, file_path)
+        return key, stored
+    
+    def get_conversion_cache_stats(self) -> Dict[str, Any]:
+        """Get conversion output reuse counters"""
+        return self.conversion_cache.stats()
+    
+    def get_memory_budget_stats(self) -> Dict[str, Any]:
+        """Get the decode memory ledger"""
+        return self.memory_budget.stats()
+    
+    def get_temp_storage_stats(self) -> Dict[str, Any]:
+        """Get output file usage against the temp storage quota"""
+        return self.temp_storage.stats()
+    
+    def get_result_store_stats(self) -> Optional[Dict[str, Any]]:
+        """Get result store hit rate and size, or None when the store is disabled"""
+        return self.result_store.stats() if self.result_store else None
+    
+    async def run_within_budget(self, func, *args, **kwargs) -> Any:
+        """Run a decoding method on the I/O pool, waiting for decode memory on the event loop
+        
+        A pool thread never blocks on the memory budget: when memory is
+        short, the call gives up its thread, waits here until enough is free
+        and is retried.
+        """
+        deadline = time.monotonic() + self.memory_budget.wait_timeout_seconds
+        while True:
+            try:
+                return await self._run_blocking(self.memory_budget.call_without_waiting, func, *args, **kwargs)
+            except MemoryBudgetBusy as busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not await self.memory_budget.wait_for_room(busy.nbytes, remaining):
+                    return {"error": f"Timed out waiting for memory to decode {busy.label}"}
+    
+    async def _run_blocking(self, func, *args, **kwargs) -> Any:
+        """Run blocking work on the execution layer's I/O pool, or inline without one"""
+        if self.execution is not None:
+            return await self.execution.run_io(func, *args, **kwargs)
+        return func(*args, **kwargs)
+    
+    @staticmethod
+    async def _run_component_graph(graph: Dict[str, Any]) -> Any:
+        """Run components concurrently as soon as their dependencies finish
+        
+        Returns the results by component name and each component's wall time in seconds.
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+        timings: Dict[str, float] = {}
+        
+        async def run_component(name: str) -> Any:
+            dependencies, factory = graph[name]
+            dependency_results = {dep: await tasks[dep] for dep in dependencies}
+            
+            logger.info(f"Starting {name}...")
+            started = time.perf_counter()
+            try:
+                return await factory(dependency_results)
+            finally:
+                timings[name] = round(time.perf_counter() - started, 3)
+                logger.info(f"Finished {name} in {timings[name]:.2f}s")
+        
+        for name in graph:
+            tasks[name] = asyncio.ensure_future(run_component(name))
+        
+        try:
+            results = dict(zip(tasks, await asyncio.gather(*tasks.values())))
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            # Let cancelled components unwind before the caller releases what they use
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        
+        return results, timings
     
     def _generate_conversation_insights(self, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
         """Generate insights from combined analysis results"""
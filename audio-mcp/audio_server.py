@@ -1,11 +1,22 @@
 import logging
 import os
+import json
 import asyncio
+import atexit
+from contextlib import asynccontextmanager
 from typing import Optional, List, Dict, Any
-from fastmcp import FastMCP
+from fastmcp import FastMCP, Context
 from pathlib import Path
 
 from audio_processor import AudioProcessor
+from model_registry import ModelRegistry, set_process_registry, configure_process_registry
+from execution import ExecutionLayer
+from result_store import ResultStore
+from job_queue import JobQueue
+from hume_client import HumeClient
+from temp_storage import TempStorage
+from memory_budget import MemoryBudget
+from capabilities import CapabilityRegistry, set_process_capabilities
 from utils import AudioUtils
 
 # Configure logging
@@ -15,28 +26,195 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize MCP server
-mcp = FastMCP("audio-processing")
+# Server state, built by build_services() in the server process only. Spawn
+# workers import this module as __mp_main__, so module import must not open
+# stores, adopt output files or start threads.
+model_ram_bytes = 0
+model_registry: Optional[ModelRegistry] = None
+capabilities: Optional[CapabilityRegistry] = None
+prewarm_capabilities: List[str] = []
+execution: Optional[ExecutionLayer] = None
+cache_dir = ""
+result_store: Optional[ResultStore] = None
+hume_client: Optional[HumeClient] = None
+temp_storage: Optional[TempStorage] = None
+audio_processor: Optional[AudioProcessor] = None
+job_queue: Optional[JobQueue] = None
+
+async def run_transcribe_job(file_path: str, model: str = "base", long_form: bool = False) -> Dict[str, Any]:
+    return await audio_processor.transcribe_audio(file_path, model, long_form=long_form)
+
+async def run_batch_job(source: str, model: str = "base", manifest_path: Optional[str] = None) -> Dict[str, Any]:
+    return await audio_processor.transcribe_batch(source, model, manifest_path)
+
+async def run_diarize_job(file_path: str) -> Dict[str, Any]:
+    return await audio_processor.diarize_speakers(file_path)
+
+async def run_emotions_job(file_path: str, hume_api_key: Optional[str] = None) -> Dict[str, Any]:
+    return await audio_processor.detect_emotions(file_path, hume_api_key or os.getenv("HUME_API_KEY"))
+
+async def run_emotions_batch_job(source: str, hume_api_key: Optional[str] = None, files_per_job: int = 50) -> Dict[str, Any]:
+    return await audio_processor.detect_emotions_batch(source, hume_api_key or os.getenv("HUME_API_KEY"), files_per_job)
+
+async def run_analysis_job(file_path: str, hume_api_key: Optional[str] = None) -> Dict[str, Any]:
+    return await audio_processor.analyze_conversation(file_path, hume_api_key or os.getenv("HUME_API_KEY"))
+
+def build_services() -> None:
+    """Create the registries, stores, pools and queue shared by all tools; runs once"""
+    global model_ram_bytes, model_registry, capabilities, prewarm_capabilities, execution
+    global cache_dir, result_store, hume_client, temp_storage, audio_processor, job_queue
+    if audio_processor is not None:
+        return
+    
+    # Warm model registry shared by all tools
+    model_ram_bytes = int(os.getenv("AUDIO_MODEL_RAM_MB", "4096")) * 1024 * 1024
+    model_registry = ModelRegistry(max_bytes=model_ram_bytes)
+    set_process_registry(model_registry)
+    
+    # Optional backends are detected without importing them; AUDIO_PREWARM lists
+    # capabilities (or "all") to import in the background after startup
+    capabilities = CapabilityRegistry()
+    set_process_capabilities(capabilities)
+    prewarm_capabilities = [name.strip() for name in os.getenv("AUDIO_PREWARM", "").split(",") if name.strip()]
+    
+    # Worker pools that keep blocking audio work off the event loop
+    execution = ExecutionLayer(
+        cpu_workers=int(os.getenv("AUDIO_CPU_WORKERS", "0")) or None,
+        io_workers=int(os.getenv("AUDIO_IO_WORKERS", "0")) or None,
+        cpu_concurrency=int(os.getenv("AUDIO_CPU_CONCURRENCY", "0")) or None,
+        io_concurrency=int(os.getenv("AUDIO_IO_CONCURRENCY", "0")) or None,
+        use_processes=os.getenv("AUDIO_INFERENCE_BACKEND", "process") == "process",
+        process_initializer=configure_process_registry,
+        process_initargs=(model_ram_bytes,),
+        # Workers import only the inference functions, not this server module
+        worker_main="inference_worker"
+    )
+    
+    # Persistent store of transcription, diarization and emotion results
+    cache_dir = os.getenv("AUDIO_CACHE_DIR") or os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "audio-mcp"
+    )
+    result_store = ResultStore(
+        db_path=os.path.join(cache_dir, "results.sqlite3"),
+        ttl_seconds=float(os.getenv("AUDIO_RESULT_TTL_HOURS", "168")) * 3600,
+        max_bytes=int(os.getenv("AUDIO_RESULT_STORE_MB", "512")) * 1024 * 1024
+    ) if os.getenv("AUDIO_RESULT_STORE", "1") != "0" else None
+    
+    # Pooled Hume API client; HUME_API_BASE_URL can point at a local stand-in server
+    hume_client = HumeClient(
+        base_url=os.getenv("HUME_API_BASE_URL"),
+        poll_deadline_seconds=float(os.getenv("HUME_POLL_DEADLINE_SECONDS", "600"))
+    )
+    
+    # Bounded storage for output files returned to clients
+    temp_storage = TempStorage(
+        root=os.getenv("AUDIO_OUTPUT_DIR") or None,
+        max_bytes=int(os.getenv("AUDIO_OUTPUT_QUOTA_MB", "2048")) * 1024 * 1024,
+        ttl_seconds=float(os.getenv("AUDIO_OUTPUT_TTL_HOURS", "24")) * 3600
+    )
+    
+    # Global audio processor instance
+    audio_processor = AudioProcessor(
+        decode_cache_mb=int(os.getenv("AUDIO_DECODE_CACHE_MB", "512")),
+        cache_dir=cache_dir,
+        merge_workers=int(os.getenv("AUDIO_MERGE_WORKERS", "0")) or None,
+        convert_workers=int(os.getenv("AUDIO_CONVERT_WORKERS", "0")) or None,
+        model_registry=model_registry,
+        execution=execution,
+        result_store=result_store,
+        hume_client=hume_client,
+        temp_storage=temp_storage,
+        vad_filter=os.getenv("AUDIO_VAD_FILTER", "1") != "0",
+        upload_profile=os.getenv("HUME_UPLOAD_PROFILE", "opus"),
+        memory_budget=MemoryBudget(
+            max_bytes=int(os.getenv("AUDIO_MEMORY_BUDGET_MB", "1024")) * 1024 * 1024,
+            wait_timeout_seconds=float(os.getenv("AUDIO_MEMORY_WAIT_SECONDS", "300"))
+        )
+    )
+    
+    # Background queue for long-running tools, persisted across restarts
+    job_queue = JobQueue(
+        db_path=os.path.join(cache_dir, "jobs.sqlite3"),
+        handlers={
+            "transcribe_audio": run_transcribe_job,
+            "transcribe_batch": run_batch_job,
+            "diarize_speakers": run_diarize_job,
+            "detect_emotions": run_emotions_job,
+            "detect_emotions_batch": run_emotions_batch_job,
+            "analyze_conversation": run_analysis_job
+        },
+        workers=int(os.getenv("AUDIO_JOB_WORKERS", "2"))
+    )
+    
+    atexit.register(cleanup_on_exit)
 
-# Global audio processor instance
-audio_processor = AudioProcessor()
+@asynccontextmanager
+async def lifespan(server):
+    """Resume persisted jobs when the server starts and close pooled connections on shutdown
+    
+    Services are built here when the server was not started through main().
+    The output sweeper runs only while the server does, and pre-warming runs
+    as a background task, so it never delays the first response.
+    """
+    build_services()
+    temp_storage.start()
+    await job_queue.start()
+    prewarm_task = None
+    if prewarm_capabilities:
+        prewarm_task = asyncio.create_task(capabilities.prewarm(prewarm_capabilities, execution))
+    try:
+        yield
+    finally:
+        if prewarm_task is not None:
+            prewarm_task.cancel()
+        await job_queue.stop()
+        await hume_client.aclose()
+
+# Initialize MCP server
+mcp = FastMCP("audio-processing", lifespan=lifespan)
 
 def cleanup_on_exit():
     """Cleanup function to run on server shutdown"""
     logger.info("Cleaning up audio processor...")
     audio_processor.cleanup()
+    execution.shutdown()
+    job_queue.close()
+    model_registry.clear()
 
-# Register cleanup function
-import atexit
-atexit.register(cleanup_on_exit)
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as MM:SS for transcript segments"""
+    return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
+
+def format_vad_summary(result: Dict[str, Any]) -> str:
+    """Describe how much silence the VAD pre-filter skipped, if it ran"""
+    vad = result.get('vad')
+    if not vad:
+        return ""
+    if not vad['applied']:
+        return "Silence Skipped: none (too little silence to filter)\n"
+    return f"Silence Skipped: {vad['skipped_fraction'] * 100:.1f}% ({AudioUtils.format_duration(vad['speech_seconds'])} of speech in {AudioUtils.format_duration(vad['original_seconds'])})\n"
+
+def format_upload_summary(result: Dict[str, Any]) -> str:
+    """Describe how much smaller the upload was than the original file"""
+    if 'uploaded_bytes' not in result:
+        return ""
+    original = result['original_bytes']
+    uploaded = result['uploaded_bytes']
+    ratio = f", {original / uploaded:.1f}x smaller" if uploaded and uploaded < original else ""
+    return f"Uploaded: {uploaded / (1024 * 1024):.2f} MB {result['upload_format'].upper()} (original {original / (1024 * 1024):.2f} MB{ratio})\n"
 
 @mcp.tool()
-async def get_audio_info(file_path: str) -> str:
-    """Get comprehensive information about an audio file including duration, format, metadata, and technical details"""
+async def get_audio_info(file_path: str, decode: bool = False) -> str:
+    """Get comprehensive information about an audio file including duration, format, metadata, and technical details
+    
+    Args:
+        file_path: Path to the audio file
+        decode: Fully decode the file instead of reading container headers (slower)
+    """
     logger.info(f"Getting audio info for: {file_path}")
     
     try:
-        info = audio_processor.get_audio_info(file_path)
+        info = await audio_processor.run_within_budget(audio_processor.get_audio_info, file_path, decode=decode)
         
         if "error" in info:
             return f"Error: {info['error']}"
@@ -85,16 +263,18 @@ async def convert_audio_format(
     logger.info(f"Converting {input_path} to {output_format} format with {quality} quality")
     
     try:
-        result = audio_processor.convert_format(input_path, output_format, quality)
+        result = await audio_processor.run_within_budget(audio_processor.convert_format, input_path, output_format, quality)
         
         if "error" in result:
             return f"Error: {result['error']}"
         
+        status_line = "✓ Reused output of an identical earlier conversion" if result.get("from_cache") else "✓ Successfully converted audio file"
+        
         response = f"""
 Audio Format Conversion Complete:
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-✓ Successfully converted audio file
+{status_line}
 
 Input: {result['input_format'].upper()} → Output: {result['output_format'].upper()}
 Quality: {result['quality']}
@@ -113,6 +293,74 @@ The converted file has been saved to: {result['output_path']}
         logger.error(f"Error in convert_audio_format: {e}")
         return f"Error converting audio format: {str(e)}"
 
+@mcp.tool()
+async def convert_audio_batch(
+    sources: List[str],
+    output_formats: List[str],
+    quality: str = "medium",
+    ctx: Optional[Context] = None
+) -> str:
+    """Convert many audio files, each to one or more formats, in parallel
+    
+    Args:
+        sources: Audio files, directories (searched recursively) or glob patterns such as /archive/*.flac
+        output_formats: Target formats (mp3, wav, flac, ogg, etc.); each input is decoded once for all of them
+        quality: Quality level for lossy formats (low, medium, high)
+    """
+    logger.info(f"Batch converting {len(sources)} sources to {', '.join(output_formats)} with {quality} quality")
+    
+    on_file = None
+    if ctx is not None:
+        async def on_file(entry, files_done, total_files):
+            status = "✓" if entry['status'] == "success" else "✗"
+            await ctx.report_progress(
+                progress=files_done,
+                total=total_files,
+                message=f"{status} {os.path.basename(entry['file_path'])} ({entry['elapsed_seconds']:.1f}s)"
+            )
+    
+    try:
+        result = await audio_processor.convert_batch(sources, output_formats, quality, on_file=on_file)
+        
+        if "error" in result:
+            return f"Error: {result['error']}"
+        
+        response = f"""
+Batch Format Conversion Complete:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+✓ Processed {result['total_files']} audio files
+
+Output Formats: {', '.join(f.upper() for f in result['output_formats'])}
+Quality: {result['quality']}
+
+Summary:
+├── Converted: {result['converted']}
+├── Failed: {result['failed']}
+├── Outputs Reused: {result['outputs_from_cache']}
+├── Workers: {result['workers']}
+├── Elapsed: {AudioUtils.format_duration(result['elapsed_seconds'])}
+└── Throughput: {result['audio_seconds_per_second']}x realtime ({AudioUtils.format_duration(result['audio_seconds'])} of audio)
+
+Files:
+"""
+        
+        for entry in result['files']:
+            name = os.path.basename(entry['file_path'])
+            if entry['status'] != "success":
+                response += f"├── {name}: ✗ {entry['error']}\n"
+                continue
+            response += f"├── {name} ({entry['elapsed_seconds']:.2f}s)\n"
+            for output in entry['outputs']:
+                reused = " (reused)" if output['from_cache'] else ""
+                response += f"│   └── {output['format'].upper()}: {output['output_path']} ({output['size_mb']} MB){reused}\n"
+        
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error in convert_audio_batch: {e}")
+        return f"Error in batch conversion: {str(e)}"
+
 @mcp.tool()
 async def trim_audio(
     input_path: str, 
@@ -129,7 +377,7 @@ async def trim_audio(
     logger.info(f"Trimming audio from {start_seconds}s to {end_seconds}s")
     
     try:
-        result = audio_processor.trim_audio(input_path, start_seconds, end_seconds)
+        result = await audio_processor.run_within_budget(audio_processor.trim_audio, input_path, start_seconds, end_seconds)
         
         if "error" in result:
             return f"Error: {result['error']}"
@@ -169,7 +417,7 @@ async def merge_audio_files(
     logger.info(f"Merging {len(input_paths)} audio files")
     
     try:
-        result = audio_processor.merge_audio(input_paths, output_format)
+        result = await audio_processor.run_within_budget(audio_processor.merge_audio, input_paths, output_format)
         
         if "error" in result:
             return f"Error: {result['error']}"
@@ -201,18 +449,48 @@ Merged Files:
 @mcp.tool()
 async def transcribe_audio(
     file_path: str, 
-    model: str = "base"
+    model: str = "base",
+    long_form: bool = False,
+    stream: bool = False,
+    ctx: Optional[Context] = None
 ) -> str:
     """Transcribe audio file to text using Whisper AI
     
     Args:
         file_path: Path to the audio file to transcribe
         model: Whisper model to use (tiny, base, small, medium, large)
+        long_form: Split long recordings at silences and transcribe the chunks in parallel
+        stream: Send each timestamped segment as a progress notification as soon as it is transcribed
     """
     logger.info(f"Transcribing audio file: {file_path} with model: {model}")
     
+    on_segments = None
+    if stream and ctx is not None:
+        # Progress must only grow, but a segment can end before progress already
+        # reported (segment ends run past seconds_done at chunk overlaps); its
+        # line is sent with the next notification that moves progress forward
+        reported = 0.0
+        pending: List[str] = []
+        
+        async def on_segments(segments, seconds_done, total_seconds):
+            nonlocal reported
+            for segment in segments:
+                pending.append(
+                    f"[{format_timestamp(segment['start'])} - {format_timestamp(segment['end'])}] {segment['text'].strip()}"
+                )
+                if segment['end'] > reported:
+                    reported = segment['end']
+                    await ctx.report_progress(progress=reported, total=total_seconds, message="\n".join(pending))
+                    pending.clear()
+            if seconds_done > reported:
+                reported = seconds_done
+                await ctx.report_progress(progress=reported, total=total_seconds, message="\n".join(pending) or None)
+                pending.clear()
+    
     try:
-        result = await audio_processor.transcribe_audio(file_path, model)
+        result = await audio_processor.transcribe_audio(
+            file_path, model, long_form=long_form, on_segments=on_segments
+        )
         
         if "error" in result:
             return f"Error: {result['error']}"
@@ -226,7 +504,8 @@ Audio Transcription Complete:
 File: {result['file_path']}
 Model: {result['model_used']}
 Detected Language: {result['language']}
-
+Chunks: {result.get('chunks', 1)}
+{format_vad_summary(result)}
 Transcript:
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 {result['transcript']}
@@ -237,9 +516,7 @@ Transcript:
         if 'segments' in result:
             response += "\n\nTimestamped Segments:\n"
             for segment in result['segments']:
-                start_time = f"{int(segment['start'] // 60):02d}:{int(segment['start'] % 60):02d}"
-                end_time = f"{int(segment['end'] // 60):02d}:{int(segment['end'] % 60):02d}"
-                response += f"[{start_time} - {end_time}] {segment['text']}\n"
+                response += f"[{format_timestamp(segment['start'])} - {format_timestamp(segment['end'])}] {segment['text']}\n"
         
         return response
         
@@ -247,6 +524,60 @@ Transcript:
         logger.error(f"Error in transcribe_audio: {e}")
         return f"Error transcribing audio: {str(e)}"
 
+@mcp.tool()
+async def transcribe_batch(
+    source: str,
+    model: str = "base",
+    manifest_path: Optional[str] = None,
+    ctx: Optional[Context] = None
+) -> str:
+    """Transcribe every audio file in a directory or glob pattern into a JSONL manifest
+    
+    Args:
+        source: Directory (searched recursively) or glob pattern such as /calls/2024-06-01/*.wav
+        model: Whisper model to use (tiny, base, small, medium, large)
+        manifest_path: JSONL file to append results to (default: a file per source under the cache directory)
+    """
+    logger.info(f"Batch transcribing: {source} with model: {model}")
+    
+    on_file = None
+    if ctx is not None:
+        async def on_file(entry, files_done, total_files):
+            status = "✓" if entry['status'] == "success" else "✗"
+            await ctx.report_progress(
+                progress=files_done,
+                total=total_files,
+                message=f"{status} {os.path.basename(entry['file_path'])} ({entry['elapsed_seconds']:.1f}s)"
+            )
+    
+    try:
+        result = await audio_processor.transcribe_batch(source, model, manifest_path, on_file=on_file)
+        
+        if "error" in result:
+            return f"Error: {result['error']}"
+        
+        return f"""
+Batch Transcription Complete:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+✓ Processed {result['total_files']} audio files
+
+Source: {result['source']}
+Model: {result['model_used']}
+Manifest: {result['manifest_path']}
+
+Results:
+├── Transcribed: {result['transcribed']}
+├── Failed: {result['failed']}
+├── Skipped (already done): {result['skipped']}
+├── Elapsed: {AudioUtils.format_duration(result['elapsed_seconds'])}
+└── Throughput: {result['files_per_minute']} files/minute
+"""
+        
+    except Exception as e:
+        logger.error(f"Error in transcribe_batch: {e}")
+        return f"Error in batch transcription: {str(e)}"
+
 @mcp.tool()
 async def generate_speech(
     text: str, 
@@ -318,7 +649,7 @@ File: {result['file_path']}
 Total Duration: {AudioUtils.format_duration(result['total_duration'])}
 Number of Speakers: {result['num_speakers']}
 Total Segments: {result['total_segments']}
-
+{format_vad_summary(result)}
 Speaker Summary:
 """
         
@@ -365,7 +696,7 @@ Emotion Detection Results:
 
 File: {result['file_path']}
 Total Segments: {result['total_segments']}
-
+{format_vad_summary(result)}{format_upload_summary(result)}
 Top Emotions Detected:
 """
         
@@ -391,6 +722,55 @@ Top Emotions Detected:
         logger.error(f"Error in detect_emotions: {e}")
         return f"Error detecting emotions: {str(e)}"
 
+@mcp.tool()
+async def detect_emotions_batch(source: str, hume_api_key: str, files_per_job: int = 50) -> str:
+    """Detect emotions in every audio file of a directory or glob pattern with batched Hume AI jobs
+    
+    Args:
+        source: Directory (searched recursively) or glob pattern such as /calls/*.wav
+        hume_api_key: Hume AI API key for emotion detection
+        files_per_job: Number of files uploaded together in one Hume job
+    """
+    logger.info(f"Detecting emotions in batch: {source}")
+    
+    try:
+        result = await audio_processor.detect_emotions_batch(source, hume_api_key, files_per_job)
+        
+        if "error" in result:
+            return f"Error: {result['error']}"
+        
+        response = f"""
+Batch Emotion Detection Results:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+✓ Processed {result['total_files']} audio files
+
+Source: {result['source']}
+
+Summary:
+├── Analyzed: {result['analyzed']}
+├── From Cache: {result['from_cache']}
+├── Failed: {result['failed']}
+├── Hume Jobs: {result['hume_jobs']}
+├── API Requests: {result['api_requests']}
+└── Elapsed: {AudioUtils.format_duration(result['elapsed_seconds'])}
+
+Dominant Emotions by File:
+"""
+        
+        for file_path, file_result in result['files'].items():
+            name = os.path.basename(file_path)
+            if "error" in file_result:
+                response += f"├── {name}: ✗ {file_result['error']}\n"
+            else:
+                response += f"├── {name}: {', '.join(file_result['dominant_emotions'][:3])}\n"
+        
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error in detect_emotions_batch: {e}")
+        return f"Error detecting emotions: {str(e)}"
+
 @mcp.tool()
 async def analyze_conversation(
     file_path: str, 
@@ -477,6 +857,12 @@ Components: {', '.join(result['analysis_components'])}
                 response += f"├── Speaking Rate: {dynamics.get('words_per_minute', 0):.1f} words/minute\n"
                 response += f"└── Turn Taking: {dynamics.get('turn_taking', 0):.1f} turns/speaker\n"
         
+        # Component timings
+        if 'component_timings' in result:
+            response += f"\n⏱️ Component Timings:\n"
+            for component, seconds in result['component_timings'].items():
+                response += f"├── {component}: {seconds:.2f}s\n"
+        
         # Add errors if any
         errors = []
         if 'transcription_error' in result:
@@ -526,34 +912,222 @@ Notes:
     
     return response
 
-def main():
-    """Main function to run the audio processing MCP server"""
-    logger.info("Starting Audio Processing MCP Server...")
+@mcp.tool()
+async def submit_audio_job(
+    tool: str,
+    params: Dict[str, Any],
+    priority: str = "normal"
+) -> str:
+    """Queue a long-running audio tool in the background and return a job ID
     
-    # Log available features
-    try:
-        import whisper
-        logger.info("✓ Whisper transcription available")
-    except ImportError:
-        logger.warning("✗ Whisper transcription not available (install with: pip install openai-whisper)")
+    Args:
+        tool: Tool to run (transcribe_audio, transcribe_batch, diarize_speakers, detect_emotions, detect_emotions_batch, analyze_conversation)
+        params: Arguments for the tool, e.g. {"file_path": "/path/to/call.wav", "model": "base"}
+        priority: Job priority (high, normal, low)
+    """
+    logger.info(f"Submitting {tool} job with {priority} priority")
     
     try:
-        from gtts import gTTS
-        logger.info("✓ Text-to-speech available")
-    except ImportError:
-        logger.warning("✗ Text-to-speech not available (install with: pip install gTTS)")
+        job_id = await job_queue.submit(tool, params, priority)
+        
+        return f"""
+Audio Job Submitted:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+✓ Job queued
+
+Job ID: {job_id}
+Tool: {tool}
+Priority: {priority}
+
+Check progress with get_job_status("{job_id}") and fetch output with get_job_result("{job_id}").
+"""
+        
+    except Exception as e:
+        logger.error(f"Error in submit_audio_job: {e}")
+        return f"Error submitting job: {str(e)}"
+
+@mcp.tool()
+async def get_job_status(job_id: str) -> str:
+    """Get the state and timing of a background audio job
     
-    try:
-        from pyannote.audio import Pipeline
-        logger.info("✓ Speaker diarization available")
-    except ImportError:
-        logger.warning("✗ Speaker diarization not available (install with: pip install pyannote.audio)")
+    Args:
+        job_id: ID returned by submit_audio_job
+    """
+    status = job_queue.status(job_id)
     
-    try:
-        import httpx
-        logger.info("✓ Emotion detection API client available")
-    except ImportError:
-        logger.warning("✗ Emotion detection not available (install with: pip install httpx)")
+    if status is None:
+        return f"Error: Unknown job ID: {job_id}"
+    
+    execution_time = f"{status['execution_seconds']:.2f}s" if status['execution_seconds'] is not None else "not started"
+    
+    response = f"""
+Audio Job Status:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Job ID: {status['job_id']}
+Tool: {status['tool']}
+Priority: {status['priority']}
+State: {status['state']}
+
+Timing:
+├── Queue Wait: {status['queue_wait_seconds']:.2f}s
+└── Execution: {execution_time}
+"""
+    
+    if 'error' in status:
+        response += f"\nError: {status['error']}\n"
+    
+    return response
+
+@mcp.tool()
+async def get_job_result(job_id: str) -> str:
+    """Get the result of a finished background audio job as JSON
+    
+    Args:
+        job_id: ID returned by submit_audio_job
+    """
+    status = job_queue.status(job_id)
+    
+    if status is None:
+        return f"Error: Unknown job ID: {job_id}"
+    
+    if status['state'] in ("queued", "running"):
+        return f"Job {job_id} is still {status['state']}. Check again later."
+    
+    result = job_queue.result(job_id)
+    if result is None:
+        return f"Error: Job {job_id} {status['state']} without a result: {status.get('error', 'no details')}"
+    
+    return json.dumps(result, indent=2, default=str)
+
+@mcp.tool()
+async def cancel_job(job_id: str) -> str:
+    """Cancel a queued or running background audio job
+    
+    Args:
+        job_id: ID returned by submit_audio_job
+    """
+    if job_queue.cancel(job_id):
+        return f"✓ Job {job_id} cancelled"
+    
+    return f"Error: Job {job_id} not found or already finished"
+
+@mcp.tool()
+async def get_processor_stats() -> str:
+    """Report internal cache and resource statistics of the audio processor"""
+    
+    cache = audio_processor.get_cache_stats()
+    models = audio_processor.get_model_stats()
+    pools = execution.stats()
+    results = audio_processor.get_result_store_stats()
+    
+    response = f"""
+Audio Processor Statistics:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Decoded Audio Cache:
+├── Entries: {cache['entries']}
+├── Size: {cache['current_bytes'] / (1024 * 1024):.1f} MB / {cache['max_bytes'] / (1024 * 1024):.1f} MB
+├── Hits: {cache['hits']}
+├── Misses: {cache['misses']}
+├── Evictions: {cache['evictions']}
+└── Hit Rate: {cache['hit_rate'] * 100:.1f}%
+
+Warm Models ({models['resident_bytes'] / (1024 * 1024):.0f} MB / {models['max_bytes'] / (1024 * 1024):.0f} MB):
+"""
+    
+    if models['models']:
+        for model in models['models']:
+            response += f"├── {model['kind']}/{model['name']} [{model['worker']}]: {model['resident_bytes'] / (1024 * 1024):.0f} MB, "
+            response += f"loaded in {model['load_seconds']:.2f}s, used {model['uses']} times\n"
+    else:
+        response += "└── No models loaded\n"
+    
+    response += f"""
+Worker Pools:
+├── Inference ({pools['cpu_backend']}): {pools['cpu_active']}/{pools['cpu_concurrency']} active, {pools['cpu_completed']} completed
+└── Audio I/O (thread): {pools['io_active']}/{pools['io_concurrency']} active, {pools['io_completed']} completed
+"""
+    
+    if results is not None:
+        response += f"""
+Analysis Result Store:
+├── Entries: {results['entries']}
+├── Size: {results['size_bytes'] / (1024 * 1024):.1f} MB / {results['max_bytes'] / (1024 * 1024):.1f} MB
+├── Hits: {results['hits']}
+├── Misses: {results['misses']}
+├── Coalesced: {results['coalesced']}
+└── Hit Rate: {results['hit_rate'] * 100:.1f}%
+"""
+    else:
+        response += "\nAnalysis Result Store: disabled\n"
+    
+    conversions = audio_processor.get_conversion_cache_stats()
+    response += f"""
+Conversion Outputs:
+├── Remembered: {conversions['entries']}
+├── Reused: {conversions['hits']}
+├── Encoded: {conversions['misses']}
+└── Coalesced: {conversions['coalesced']}
+"""
+    
+    storage = audio_processor.get_temp_storage_stats()
+    response += f"""
+Output Storage ({storage['root']}):
+├── Files: {storage['files']} ({storage['pinned_files']} pinned)
+├── Size: {storage['used_bytes'] / (1024 * 1024):.1f} MB / {storage['max_bytes'] / (1024 * 1024):.1f} MB
+├── TTL: {storage['ttl_seconds'] / 3600:.1f} hours
+├── Expired: {storage['expirations']}
+└── Evicted: {storage['evictions']}
+"""
+    
+    memory = audio_processor.get_memory_budget_stats()
+    response += f"""
+Decode Memory Budget:
+├── In Use: {memory['in_use_bytes'] / (1024 * 1024):.1f} MB / {memory['max_bytes'] / (1024 * 1024):.1f} MB
+├── Reserved by Decodes: {memory['reserved_bytes'] / (1024 * 1024):.1f} MB
+├── Held by Caches: {sum(memory['resident'].values()) / (1024 * 1024):.1f} MB
+├── Peak: {memory['peak_bytes'] / (1024 * 1024):.1f} MB
+├── Admitted: {memory['admitted']} ({memory['waited']} queued, {memory['timeouts']} timed out)
+├── Routed to Streaming: {memory['routed']}
+├── Rejected: {memory['rejected']}
+└── Active Decodes: {len(memory['active'])}
+"""
+    for reservation in memory['active']:
+        response += f"    • {reservation['label']}: {reservation['bytes'] / (1024 * 1024):.1f} MB for {reservation['held_seconds']:.1f}s\n"
+    
+    response += "\nOptional Backends:\n"
+    backends = list(capabilities.stats().values())
+    for i, backend in enumerate(backends):
+        prefix = "└──" if i == len(backends) - 1 else "├──"
+        if not backend['available']:
+            state = "not installed"
+        elif backend['imported']:
+            state = f"loaded ({backend['import_seconds']:.2f}s import)"
+        else:
+            state = "installed, not loaded yet"
+        response += f"{prefix} {backend['label']}: {state}\n"
+    
+    jobs = job_queue.stats()
+    response += f"\nBackground Jobs ({jobs['workers']} workers):\n"
+    if jobs['by_state']:
+        states = list(jobs['by_state'].items())
+        for i, (state, count) in enumerate(states):
+            prefix = "└──" if i == len(states) - 1 else "├──"
+            response += f"{prefix} {state.title()}: {count}\n"
+    else:
+        response += "└── No jobs submitted\n"
+    
+    return response
+
+def main():
+    """Main function to run the audio processing MCP server"""
+    logger.info("Starting Audio Processing MCP Server...")
+    build_services()
+    
+    # Log available features; heavy backends are imported on first use or by pre-warming
+    capabilities.log_summary()
     
     logger.info("✓ Audio format conversion available")
     logger.info("✓ Audio trimming and merging available")
@@ -0,0 +1,82 @@
+import os
+import json
+import logging
+import threading
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+class TranscriptManifest:
+    """Append-only JSONL manifest of batch transcription results
+
+    Each line records one file with its size and modification time, so a
+    rerun can skip files that were already transcribed and have not changed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    @staticmethod
+    def file_identity(file_path: str) -> Dict[str, Any]:
+        """Return the fields that identify one version of a file"""
+        stat = os.stat(file_path)
+        return {
+            "file_path": os.path.abspath(file_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns
+        }
+
+    def completed(self, model: str) -> Dict[str, Dict[str, Any]]:
+        """Return successful entries for model keyed by absolute file path
+
+        Later lines win, and a truncated final line from an interrupted run is ignored.
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed manifest line {line_number} in {self.path}")
+                    continue
+                if entry.get("model") != model:
+                    continue
+                if entry.get("status") == "success":
+                    entries[entry["file_path"]] = entry
+                else:
+                    entries.pop(entry.get("file_path"), None)
+
+        return entries
+
+    def is_done(self, completed: Dict[str, Dict[str, Any]], file_path: str) -> bool:
+        """Check whether file_path was transcribed and is unchanged since
+
+        A file that can no longer be read is not done; the batch records the failure.
+        """
+        try:
+            identity = self.file_identity(file_path)
+        except OSError:
+            return False
+        entry = completed.get(identity["file_path"])
+        return (
+            entry is not None
+            and entry.get("size") == identity["size"]
+            and entry.get("mtime_ns") == identity["mtime_ns"]
+        )
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Write one entry and flush it so finished work survives a crash"""
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
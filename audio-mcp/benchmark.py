@@ -0,0 +1,529 @@
+import os
+import sys
+import json
+import time
+import wave
+import shutil
+import asyncio
+import logging
+import argparse
+import platform
+import resource
+import tempfile
+import threading
+import statistics
+import subprocess
+import importlib.util
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable
+
+import numpy as np
+
+from utils import AudioUtils
+from ffmpeg_utils import FFmpegUtils
+from audio_processor import AudioProcessor
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the results file changes
+SCHEMA_VERSION = 1
+
+# Frames generated and written per block, so long recordings never sit in memory
+SYNTH_BLOCK_SECONDS = 10
+
+# Median latency growth reported as a regression by --compare
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+# Smaller absolute changes are timer noise, not regressions
+MIN_REGRESSION_SECONDS = 0.001
+
+# Launching the server to its first list_tools response must stay under this
+STARTUP_TARGET_SECONDS = 3.0
+
+class RssSampler:
+    """Track the peak resident set size of this process while a block runs
+
+    ffmpeg child processes are not included; see max_child_rss_mb in the results.
+    """
+
+    def __init__(self, interval_seconds: float = 0.005):
+        self.interval_seconds = interval_seconds
+        self.baseline_bytes = 0
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def current_bytes() -> int:
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            # Without /proc only the lifetime peak is available
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+
+    def __enter__(self) -> "RssSampler":
+        self.baseline_bytes = self.peak_bytes = self.current_bytes()
+        self._thread = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+
+class SyntheticCorpus:
+    """Tones and noise written locally in every supported format"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def case_id(case: Dict[str, Any]) -> str:
+        return f"{case['kind']}_{case['duration_seconds']:g}s_{case['sample_rate']}hz_{case['channels']}ch"
+
+    @staticmethod
+    def _synthesize(kind: str, start_frame: int, frames: int, sample_rate: int, channels: int, rng) -> np.ndarray:
+        """Return int16 frames of a 440 Hz tone with one harmonic, or of white noise"""
+        if kind == "tone":
+            t = (start_frame + np.arange(frames)) / sample_rate
+            columns = [
+                0.4 * np.sin(2 * np.pi * 440.0 * t + channel) + 0.1 * np.sin(2 * np.pi * 880.0 * t)
+                for channel in range(channels)
+            ]
+            samples = np.stack(columns, axis=1)
+        else:
+            samples = np.clip(rng.normal(0.0, 0.2, size=(frames, channels)), -1.0, 1.0)
+        return (samples * 32767).astype("<i2")
+
+    def write_wav(self, case: Dict[str, Any]) -> str:
+        kind, sample_rate, channels = case["kind"], case["sample_rate"], case["channels"]
+        path = os.path.join(self.root, f"{self.case_id(case)}.wav")
+        rng = np.random.default_rng(0)
+        total_frames = int(case["duration_seconds"] * sample_rate)
+        block = SYNTH_BLOCK_SECONDS * sample_rate
+
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            for start in range(0, total_frames, block):
+                frames = min(block, total_frames - start)
+                wav.writeframes(self._synthesize(kind, start, frames, sample_rate, channels, rng).tobytes())
+        return path
+
+    def build(self, cases: List[Dict[str, Any]], formats: List[str]) -> List[Dict[str, Any]]:
+        """Write every case in every format; formats that cannot be encoded are marked skipped"""
+        entries = []
+        for case in cases:
+            wav_path = self.write_wav(case)
+            for fmt in formats:
+                entry = dict(case, id=f"{self.case_id(case)}{fmt}", format=fmt[1:])
+                if fmt == ".wav":
+                    path = wav_path
+                elif not FFmpegUtils.is_available():
+                    entries.append(dict(entry, status="skipped", reason="ffmpeg not installed"))
+                    continue
+                else:
+                    path = str(Path(wav_path).with_suffix(fmt))
+                    try:
+                        FFmpegUtils.run(["-i", wav_path, path])
+                    except RuntimeError as e:
+                        entries.append(dict(entry, status="skipped", reason=str(e)))
+                        continue
+                entries.append(dict(entry, status="ready", path=path, file_size_bytes=os.path.getsize(path)))
+        return entries
+
+def build_cases(durations: List[float], sample_rates: List[int], channel_counts: List[int]) -> List[Dict[str, Any]]:
+    """Cross durations, sample rates and channel counts, alternating tones and noise"""
+    cases = []
+    for duration in durations:
+        for sample_rate in sample_rates:
+            for channels in channel_counts:
+                cases.append({
+                    "kind": "tone" if len(cases) % 2 == 0 else "noise",
+                    "duration_seconds": duration,
+                    "sample_rate": sample_rate,
+                    "channels": channels
+                })
+    return cases
+
+class Benchmark:
+    """Runs AudioProcessor operations over a corpus and collects timings"""
+
+    def __init__(self, processor: AudioProcessor, repeat: int):
+        self.processor = processor
+        self.repeat = repeat
+        self.results: List[Dict[str, Any]] = []
+
+    def _reset_caches(self) -> None:
+        """Make every iteration pay for its own header probe, decode and encode"""
+        self.processor.probe.clear()
+        self.processor.decode_cache.clear()
+        self.processor.conversion_cache.clear()
+
+    def measure(self, operation: str, case: str, audio_seconds: float, func: Callable[[], Any]) -> Dict[str, Any]:
+        latencies = []
+        peak_bytes = 0
+        growth_bytes = 0
+
+        for _ in range(self.repeat):
+            self._reset_caches()
+            with RssSampler() as sampler:
+                start = time.perf_counter()
+                result = func()
+                latencies.append(time.perf_counter() - start)
+            peak_bytes = max(peak_bytes, sampler.peak_bytes)
+            growth_bytes = max(growth_bytes, sampler.peak_bytes - sampler.baseline_bytes)
+
+            if isinstance(result, dict) and "error" in result:
+                entry = {"operation": operation, "case": case, "status": "error", "error": result["error"]}
+                self.results.append(entry)
+                logger.warning(f"{operation} failed on {case}: {result['error']}")
+                return entry
+            if isinstance(result, dict) and result.get("output_path"):
+                self.processor.temp_storage.discard(result["output_path"])
+
+        ordered = sorted(latencies)
+        median = statistics.median(ordered)
+        entry = {
+            "operation": operation,
+            "case": case,
+            "status": "success",
+            "iterations": len(latencies),
+            "audio_seconds": audio_seconds,
+            "latency_seconds": {
+                "first": round(latencies[0], 6),
+                "min": round(ordered[0], 6),
+                "median": round(median, 6),
+                "p95": round(ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))], 6),
+                "mean": round(statistics.mean(ordered), 6)
+            },
+            "throughput_x_realtime": round(audio_seconds / median, 2) if median > 0 else None,
+            "peak_rss_mb": round(peak_bytes / (1024 * 1024), 1),
+            "rss_growth_mb": round(growth_bytes / (1024 * 1024), 1)
+        }
+        self.results.append(entry)
+        logger.info(f"{operation:<24} {case:<36} median {median * 1000:9.1f} ms  {entry['throughput_x_realtime'] or 0:9.1f}x realtime")
+        return entry
+
+    def run_file_operations(self, entry: Dict[str, Any]) -> None:
+        path = entry["path"]
+        duration = entry["duration_seconds"]
+        source_format = f".{entry['format']}"
+        # Encoding anything but WAV needs ffmpeg
+        target = ("wav" if source_format == ".mp3" else "mp3") if FFmpegUtils.is_available() else "wav"
+
+        self.measure("get_audio_info", entry["id"], duration, lambda: self.processor.get_audio_info(path))
+        self.measure("get_audio_info_decode", entry["id"], duration, lambda: self.processor.get_audio_info(path, decode=True))
+        self.measure(f"convert_format_to_{target}", entry["id"], duration, lambda: self.processor.convert_format(path, target))
+        self.measure(
+            "trim_audio", entry["id"], duration / 2,
+            lambda: self.processor.trim_audio(path, duration / 4, duration * 3 / 4)
+        )
+
+    def run_merge(self, fmt: str, entries: List[Dict[str, Any]]) -> None:
+        paths = [entry["path"] for entry in entries]
+        audio_seconds = sum(entry["duration_seconds"] for entry in entries)
+        self.measure("merge_audio_to_wav", f"all{fmt}", audio_seconds, lambda: self.processor.merge_audio(paths, "wav"))
+
+    def run_transcription(self, entry: Dict[str, Any]) -> None:
+        self.measure(
+            "transcribe_audio_tiny", entry["id"], entry["duration_seconds"],
+            lambda: asyncio.run(self.processor.transcribe_audio(entry["path"], "tiny"))
+        )
+
+async def _time_list_tools(env: Dict[str, str]) -> Dict[str, Any]:
+    from fastmcp import Client
+    from fastmcp.client.transports import PythonStdioTransport
+
+    server_dir = os.path.dirname(os.path.abspath(__file__))
+    transport = PythonStdioTransport(
+        os.path.join(server_dir, "audio_server.py"), env=env, cwd=server_dir,
+        python_cmd=sys.executable, keep_alive=False
+    )
+    start = time.perf_counter()
+    async with Client(transport) as client:
+        tools = await client.list_tools()
+        elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "tools": len(tools)}
+
+def measure_startup(runs: int, target_seconds: float, work_dir: str) -> Dict[str, Any]:
+    """Time a fresh server process from launch to its first list_tools response"""
+    # Keep the server's caches and scratch files inside the benchmark directory
+    env = dict(
+        os.environ,
+        AUDIO_CACHE_DIR=os.path.join(work_dir, "server-cache"),
+        AUDIO_OUTPUT_DIR=os.path.join(work_dir, "server-output")
+    )
+    timings = []
+    tools = 0
+    for _ in range(runs):
+        run = asyncio.run(_time_list_tools(env))
+        timings.append(run["seconds"])
+        tools = run["tools"]
+
+    median = statistics.median(timings)
+    return {
+        "runs": runs,
+        "tools": tools,
+        "seconds": {
+            "min": round(min(timings), 3),
+            "median": round(median, 3),
+            "max": round(max(timings), 3)
+        },
+        "target_seconds": target_seconds,
+        "within_target": median <= target_seconds
+    }
+
+def transcription_unavailable_reason() -> Optional[str]:
+    """Explain why tiny-model transcription cannot run offline here, or return None"""
+    if importlib.util.find_spec("whisper") is None:
+        return "openai-whisper not installed"
+    cache_root = os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    if not os.path.exists(os.path.join(cache_root, "whisper", "tiny.pt")):
+        return "Whisper tiny model not in the local cache; download it once while online"
+    return None
+
+def package_version() -> Optional[str]:
+    try:
+        import tomllib
+    except ImportError:
+        return None
+    pyproject = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pyproject.toml")
+    try:
+        with open(pyproject, "rb") as f:
+            return tomllib.load(f)["project"]["version"]
+    except (OSError, KeyError, ValueError):
+        return None
+
+def git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return completed.stdout.strip() or None
+
+def ffmpeg_version() -> Optional[str]:
+    if not FFmpegUtils.is_available():
+        return None
+    completed = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True)
+    return completed.stdout.splitlines()[0] if completed.stdout else None
+
+def host_info() -> Dict[str, Any]:
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "ffmpeg": ffmpeg_version()
+    }
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Aggregate throughput per operation over all cases"""
+    summary: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        if result["status"] != "success":
+            continue
+        totals = summary.setdefault(result["operation"], {"cases": 0, "audio_seconds": 0.0, "median_seconds": 0.0, "peak_rss_mb": 0.0})
+        totals["cases"] += 1
+        totals["audio_seconds"] += result["audio_seconds"]
+        totals["median_seconds"] += result["latency_seconds"]["median"]
+        totals["peak_rss_mb"] = max(totals["peak_rss_mb"], result["peak_rss_mb"])
+
+    for totals in summary.values():
+        totals["throughput_x_realtime"] = (
+            round(totals["audio_seconds"] / totals["median_seconds"], 2) if totals["median_seconds"] > 0 else None
+        )
+        totals["median_seconds"] = round(totals["median_seconds"], 6)
+    return summary
+
+def compare(report: Dict[str, Any], baseline_path: str, threshold: float) -> List[Dict[str, Any]]:
+    """Return operations whose median latency grew by more than threshold against a baseline run"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(
+            f"Baseline schema version {baseline.get('schema_version')} does not match {SCHEMA_VERSION}"
+        )
+
+    previous = {
+        (result["operation"], result["case"]): result
+        for result in baseline["results"] if result["status"] == "success"
+    }
+    regressions = []
+    for result in report["results"]:
+        before = previous.get((result["operation"], result["case"]))
+        if result["status"] != "success" or before is None:
+            continue
+        old = before["latency_seconds"]["median"]
+        new = result["latency_seconds"]["median"]
+        if old > 0 and new - old > MIN_REGRESSION_SECONDS and (new - old) / old > threshold:
+            regressions.append({
+                "operation": result["operation"],
+                "case": result["case"],
+                "baseline_median_seconds": old,
+                "median_seconds": new,
+                "change": round((new - old) / old, 3)
+            })
+    return regressions
+
+def parse_list(value: str, cast) -> list:
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark AudioProcessor on a locally generated corpus and write versioned JSON results"
+    )
+    parser.add_argument("--output", help="Results file (default: benchmark-results/audio-mcp-<version>-<time>.json)")
+    parser.add_argument("--durations", default="10,60", help="Comma-separated durations in seconds")
+    parser.add_argument("--sample-rates", default="16000,44100,48000", help="Comma-separated sample rates")
+    parser.add_argument("--channels", default="1,2", help="Comma-separated channel counts")
+    parser.add_argument("--formats", default=",".join(f[1:] for f in AudioUtils.SUPPORTED_FORMATS),
+                        help="Comma-separated formats to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="Iterations per measurement")
+    parser.add_argument("--quick", action="store_true", help="Small corpus and one iteration, for smoke runs")
+    parser.add_argument("--transcribe", action="store_true", help="Also time Whisper tiny transcription of the WAV cases")
+    parser.add_argument("--compare", metavar="BASELINE", help="Earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Median latency growth counted as a regression (default: 0.10)")
+    parser.add_argument("--startup-runs", type=int, default=3,
+                        help="Server launches timed to the first list_tools response (0 to skip)")
+    parser.add_argument("--startup-target", type=float, default=STARTUP_TARGET_SECONDS,
+                        help=f"Median cold start in seconds above which the run fails (default: {STARTUP_TARGET_SECONDS})")
+    parser.add_argument("--keep-corpus", action="store_true", help="Leave the generated corpus on disk")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Per-operation log lines from the processor would drown the table
+    logging.getLogger("audio_processor").setLevel(logging.WARNING)
+
+    if args.quick:
+        args.durations, args.sample_rates, args.repeat = "5", "16000,44100", 1
+        args.startup_runs = min(args.startup_runs, 1)
+
+    formats = [f".{f.lower().lstrip('.')}" for f in parse_list(args.formats, str)]
+    unsupported = [f for f in formats if f not in AudioUtils.SUPPORTED_FORMATS]
+    if unsupported:
+        parser.error(f"Unsupported formats: {', '.join(unsupported)}")
+
+    cases = build_cases(parse_list(args.durations, float), parse_list(args.sample_rates, int), parse_list(args.channels, int))
+    work_dir = tempfile.mkdtemp(prefix="audio-mcp-bench-")
+    started = time.time()
+
+    try:
+        logger.info(f"Generating {len(cases)} cases in {len(formats)} formats under {work_dir}")
+        corpus = SyntheticCorpus(os.path.join(work_dir, "corpus")).build(cases, formats)
+
+        # Persistent caches and the result store would turn repeat runs into lookups
+        processor = AudioProcessor(temp_dir=os.path.join(work_dir, "tmp"), cache_dir=os.path.join(work_dir, "cache"))
+        bench = Benchmark(processor, max(1, args.repeat))
+        ready = [entry for entry in corpus if entry["status"] == "ready"]
+
+        for entry in ready:
+            bench.run_file_operations(entry)
+        for fmt in formats:
+            group = [entry for entry in ready if entry["format"] == fmt[1:]]
+            if len(group) > 1:
+                bench.run_merge(fmt, group)
+
+        transcription = {"enabled": args.transcribe}
+        if args.transcribe:
+            reason = transcription_unavailable_reason()
+            if reason:
+                transcription["skipped"] = reason
+                logger.warning(f"Skipping transcription: {reason}")
+            else:
+                for entry in ready:
+                    if entry["format"] == "wav":
+                        bench.run_transcription(entry)
+
+        processor.cleanup()
+
+        startup = None
+        if args.startup_runs > 0:
+            logger.info(f"Timing {args.startup_runs} server cold starts")
+            startup = measure_startup(args.startup_runs, args.startup_target, work_dir)
+
+        version = package_version()
+        report = {
+            "schema_version": SCHEMA_VERSION,
+            "package": {"name": "audio-mcp", "version": version},
+            "git_commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "elapsed_seconds": round(time.time() - started, 2),
+            "host": host_info(),
+            "config": {
+                "durations": parse_list(args.durations, float),
+                "sample_rates": parse_list(args.sample_rates, int),
+                "channels": parse_list(args.channels, int),
+                "formats": [f[1:] for f in formats],
+                "repeat": bench.repeat,
+                "transcription": transcription
+            },
+            "corpus": [{key: value for key, value in entry.items() if key != "path"} for entry in corpus],
+            "summary": summarize(bench.results),
+            "startup": startup,
+            "results": bench.results,
+            "max_child_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1)
+        }
+
+        output = args.output or os.path.join(
+            "benchmark-results",
+            f"audio-mcp-{version or 'unknown'}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        logger.info("")
+        for operation, totals in report["summary"].items():
+            logger.info(f"{operation:<24} {totals['cases']:3d} cases  {totals['throughput_x_realtime'] or 0:9.1f}x realtime  peak RSS {totals['peak_rss_mb']:.0f} MB")
+        if startup:
+            logger.info(
+                f"{'server_startup':<24} {startup['runs']:3d} runs   median {startup['seconds']['median']:.2f}s "
+                f"to list_tools ({startup['tools']} tools, target {startup['target_seconds']:.1f}s)"
+            )
+        logger.info(f"Results written to {output}")
+
+        exit_code = 0
+        if startup and not startup["within_target"]:
+            logger.warning(
+                f"Cold start of {startup['seconds']['median']:.2f}s exceeds the {startup['target_seconds']:.1f}s target"
+            )
+            exit_code = 1
+
+        if args.compare:
+            regressions = compare(report, args.compare, args.threshold)
+            for regression in regressions:
+                logger.warning(
+                    f"Regression: {regression['operation']} on {regression['case']} "
+                    f"{regression['baseline_median_seconds'] * 1000:.1f} ms -> {regression['median_seconds'] * 1000:.1f} ms "
+                    f"(+{regression['change'] * 100:.0f}%)"
+                )
+            if regressions:
+                exit_code = 1
+            else:
+                logger.info(f"No regressions over {args.threshold * 100:.0f}% against {args.compare}")
+
+        return exit_code
+
+    finally:
+        if args.keep_corpus:
+            logger.info(f"Corpus kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
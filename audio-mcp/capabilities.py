@@ -0,0 +1,190 @@
+import os
+import time
+import asyncio
+import logging
+import importlib
+import importlib.util
+import threading
+from typing import Optional, Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+# Optional backends: the module that provides each, and whether it is used by
+# inference workers or by the server process itself
+CAPABILITIES = {
+    "transcription": {
+        "module": "whisper",
+        "label": "Whisper transcription",
+        "install": "pip install openai-whisper",
+        "runs_in": "inference"
+    },
+    "diarization": {
+        "module": "pyannote.audio",
+        "label": "Speaker diarization",
+        "install": "pip install pyannote.audio",
+        "runs_in": "inference"
+    },
+    "tts": {
+        "module": "gtts",
+        "label": "Text-to-speech",
+        "install": "pip install gTTS",
+        "runs_in": "server"
+    },
+    "emotions": {
+        "module": "httpx",
+        "label": "Emotion detection API client",
+        "install": "pip install httpx",
+        "runs_in": "server"
+    }
+}
+
+def prewarm_imports(names: List[str]) -> Dict[str, Any]:
+    """Import capabilities through this process's registry and report its import times
+
+    Module-level so it can run in an inference worker process.
+    """
+    registry = get_process_capabilities()
+    registry.require_all(names)
+    return {"worker_pid": os.getpid(), "worker_imports": registry.import_times()}
+
+class CapabilityRegistry:
+    """Detects optional backends without importing them
+
+    Availability comes from import spec lookups, which read package metadata
+    but run none of the package's code, so torch-backed modules cost nothing
+    until a tool actually needs them. prewarm() imports them in the
+    background instead, where the first request would otherwise pay.
+    """
+
+    def __init__(self, capabilities: Optional[Dict[str, Dict[str, str]]] = None):
+        self.capabilities = capabilities or CAPABILITIES
+        self._lock = threading.Lock()
+        self._available: Dict[str, bool] = {}
+        self._import_seconds: Dict[str, float] = {}
+
+    def available(self, name: str) -> bool:
+        """Check whether the backend for a capability is installed"""
+        if name not in self._available:
+            module = self.capabilities[name]["module"]
+            try:
+                found = importlib.util.find_spec(module) is not None
+            except (ImportError, ValueError):
+                # A missing parent package of a dotted name raises instead of returning None
+                found = False
+            self._available[name] = found
+        return self._available[name]
+
+    def require(self, name: str) -> Any:
+        """Import and return the backend module for a capability, raising ImportError with an install hint"""
+        capability = self.capabilities[name]
+        if not self.available(name):
+            raise ImportError(f"{capability['label']} not available (install with: {capability['install']})")
+
+        with self._lock:
+            start = time.perf_counter()
+            module = importlib.import_module(capability["module"])
+            if name not in self._import_seconds:
+                self._import_seconds[name] = round(time.perf_counter() - start, 3)
+        return module
+
+    def resolve(self, names: List[str]) -> List[str]:
+        """Expand "all" and drop unknown or missing capabilities from a pre-warm list"""
+        if "all" in names:
+            names = list(self.capabilities)
+        resolved = []
+        for name in names:
+            if name not in self.capabilities:
+                logger.warning(f"Unknown capability to pre-warm: {name}")
+            elif self.available(name):
+                resolved.append(name)
+        return resolved
+
+    async def prewarm(self, names: List[str], execution=None) -> None:
+        """Import backends ahead of the first request that needs them
+
+        Server-side backends are imported on a thread here. Inference backends
+        are imported in the process pool when the execution layer uses
+        processes, or on a thread here when it does not. One pre-warm call is
+        submitted per inference worker, but the pool hands each to whichever
+        worker is free, so with several workers some may still import on
+        first use.
+        """
+        names = self.resolve(names)
+        local = [name for name in names if self.capabilities[name]["runs_in"] == "server"]
+        inference = [name for name in names if self.capabilities[name]["runs_in"] == "inference"]
+        if execution is None or not execution.use_processes:
+            local += inference
+            inference = []
+
+        start = time.perf_counter()
+        tasks = [asyncio.to_thread(self.require_all, local)]
+        if inference:
+            tasks += [execution.run_cpu(prewarm_imports, inference) for _ in range(execution.cpu_workers)]
+
+        warmed_pids = set()
+        for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(outcome, Exception):
+                logger.warning(f"Pre-warm failed: {outcome}")
+            elif outcome:
+                warmed_pids.add(outcome["worker_pid"])
+                self.record_imports(outcome["worker_imports"])
+
+        message = f"Pre-warmed {', '.join(names) or 'nothing'} in {time.perf_counter() - start:.1f}s"
+        if inference:
+            message += f" ({len(warmed_pids)} of {execution.cpu_workers} inference workers)"
+        logger.info(message)
+
+    def require_all(self, names: List[str]) -> None:
+        """Import several capabilities, logging rather than raising failures"""
+        for name in names:
+            try:
+                self.require(name)
+            except Exception as e:
+                logger.warning(f"Pre-warm of {name} failed: {e}")
+
+    def import_times(self) -> Dict[str, float]:
+        """Return the seconds each capability imported in this process took"""
+        with self._lock:
+            return dict(self._import_seconds)
+
+    def record_imports(self, import_times: Dict[str, float]) -> None:
+        """Count capabilities imported in a worker process as loaded, at the slowest worker's time"""
+        with self._lock:
+            for name, seconds in import_times.items():
+                self._import_seconds[name] = max(seconds, self._import_seconds.get(name, 0.0))
+
+    def log_summary(self) -> None:
+        """Log which optional backends are installed, without importing them"""
+        for name, capability in self.capabilities.items():
+            if self.available(name):
+                logger.info(f"✓ {capability['label']} available")
+            else:
+                logger.warning(f"✗ {capability['label']} not available (install with: {capability['install']})")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return availability and import time of each capability, here or in inference workers"""
+        return {
+            name: {
+                "label": capability["label"],
+                "available": self.available(name),
+                "imported": name in self._import_seconds,
+                "import_seconds": self._import_seconds.get(name)
+            }
+            for name, capability in self.capabilities.items()
+        }
+
+# Registry used for lazy imports in this process. The server installs its own
+# registry here; worker processes create a default one on first use.
+_process_capabilities: Optional[CapabilityRegistry] = None
+
+def set_process_capabilities(registry: CapabilityRegistry) -> None:
+    """Install the capability registry used in this process"""
+    global _process_capabilities
+    _process_capabilities = registry
+
+def get_process_capabilities() -> CapabilityRegistry:
+    """Return the capability registry for this process, creating a default one if needed"""
+    global _process_capabilities
+    if _process_capabilities is None:
+        _process_capabilities = CapabilityRegistry()
+    return _process_capabilities
@@ -0,0 +1,122 @@
+import os
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Optional, Dict, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ConversionCache:
+    """Memoizes converted output files by input content, target format and quality
+
+    A remembered output is reused only while the file is still on disk with
+    the size and modification time it had when written. Identical conversions
+    that arrive while one is running wait for it instead of encoding again.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._outputs: Dict[Tuple, Dict[str, Any]] = {}
+        self._inflight: Dict[Tuple, Future] = {}
+
+    @staticmethod
+    def make_key(fingerprint: str, output_format: str, quality: Optional[str]) -> Tuple:
+        return (fingerprint, output_format.lower(), quality)
+
+    @staticmethod
+    def _output_state(output_path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(output_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _valid_output(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return the remembered result for key if its file is intact (lock held)"""
+        entry = self._outputs.get(key)
+        if entry is None:
+            return None
+        state = self._output_state(entry["output_path"])
+        if state is None or state != entry["state"] or state[0] == 0:
+            del self._outputs[key]
+            return None
+        return entry["result"]
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a remembered conversion whose output is intact, counting a hit, or None"""
+        with self._lock:
+            remembered = self._valid_output(key)
+            if remembered is None:
+                return None
+            self.hits += 1
+            return dict(remembered, from_cache=True)
+
+    def put(self, key: Tuple, result: Dict[str, Any]) -> None:
+        """Remember a conversion produced outside get_or_convert, counting a miss"""
+        with self._lock:
+            self.misses += 1
+            state = self._output_state(result["output_path"])
+            if "error" not in result and state is not None:
+                self._outputs[key] = {"output_path": result["output_path"], "state": state, "result": result}
+
+    def get_or_convert(self, key: Tuple, convert: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return a remembered conversion or run convert once for all concurrent callers
+
+        Results containing an "error" key are returned but not remembered.
+        """
+        with self._lock:
+            remembered = self._valid_output(key)
+            if remembered is not None:
+                self.hits += 1
+                return dict(remembered, from_cache=True)
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+                owner = True
+
+        if not owner:
+            return dict(future.result())
+
+        try:
+            result = convert()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if "error" not in result:
+                state = self._output_state(result["output_path"])
+                if state is not None:
+                    self._outputs[key] = {"output_path": result["output_path"], "state": state, "result": result}
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return dict(result)
+
+    def clear(self) -> None:
+        """Forget remembered outputs; the files themselves are left alone"""
+        with self._lock:
+            self._outputs.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss and coalescing counters"""
+        with self._lock:
+            entries = len(self._outputs)
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,156 @@
+import os
+import sys
+import asyncio
+import logging
+import functools
+import importlib
+import threading
+import multiprocessing
+from multiprocessing.context import SpawnContext, SpawnProcess
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Serializes the brief swap of sys.modules["__main__"] while a worker is spawned
+_main_swap_lock = threading.Lock()
+
+class _EntryModuleProcess(SpawnProcess):
+    """Spawned process whose child imports an entry module instead of the parent's __main__"""
+    entry_module: Optional[str] = None
+
+    @staticmethod
+    def _Popen(process_obj):
+        # A spawned child re-imports whatever sys.modules["__main__"] is when its
+        # preparation data is built, so the entry module stands in for that moment
+        entry = importlib.import_module(process_obj.entry_module)
+        with _main_swap_lock:
+            main = sys.modules["__main__"]
+            sys.modules["__main__"] = entry
+            try:
+                return SpawnProcess._Popen(process_obj)
+            finally:
+                sys.modules["__main__"] = main
+
+class EntryModuleContext(SpawnContext):
+    """Spawn context whose workers import entry_module as their main module
+
+    Without it every worker re-imports the server script as __mp_main__,
+    with all of its imports and module-level state.
+    """
+
+    def __init__(self, entry_module: str):
+        self.entry_module = entry_module
+
+    def Process(self, *args, **kwargs) -> SpawnProcess:
+        process = _EntryModuleProcess(*args, **kwargs)
+        process.entry_module = self.entry_module
+        return process
+
+class ExecutionLayer:
+    """Runs blocking audio work off the asyncio event loop
+
+    CPU-bound model inference goes to a process pool (or a thread pool when
+    use_processes is False) and ffmpeg/file work goes to a thread pool. Each
+    class has its own concurrency limit so one kind of work cannot starve the other.
+    """
+
+    def __init__(
+        self,
+        cpu_workers: Optional[int] = None,
+        io_workers: Optional[int] = None,
+        cpu_concurrency: Optional[int] = None,
+        io_concurrency: Optional[int] = None,
+        use_processes: bool = True,
+        process_initializer: Optional[Callable] = None,
+        process_initargs: Tuple = (),
+        worker_main: Optional[str] = None
+    ):
+        cpu_count = os.cpu_count() or 1
+        # Half the cores, leaving the rest to each worker's own torch threads
+        self.cpu_workers = cpu_workers or max(1, cpu_count // 2)
+        self.io_workers = io_workers or min(8, cpu_count + 4)
+        self.cpu_concurrency = cpu_concurrency or self.cpu_workers
+        self.io_concurrency = io_concurrency or self.io_workers
+        self.use_processes = use_processes
+        self.process_initializer = process_initializer
+        self.process_initargs = process_initargs
+        # Module spawned workers import in place of the parent's __main__
+        self.worker_main = worker_main
+
+        self._cpu_pool: Optional[Executor] = None
+        self._io_pool: Optional[Executor] = None
+        self._cpu_semaphore: Optional[asyncio.Semaphore] = None
+        self._io_semaphore: Optional[asyncio.Semaphore] = None
+        self._active = {"cpu": 0, "io": 0}
+        self._completed = {"cpu": 0, "io": 0}
+
+    def _get_cpu_pool(self) -> Executor:
+        """Create the CPU pool on first use"""
+        if self._cpu_pool is None:
+            if self.use_processes:
+                # Spawn avoids forking a process that holds threads and torch state
+                self._cpu_pool = ProcessPoolExecutor(
+                    max_workers=self.cpu_workers,
+                    mp_context=EntryModuleContext(self.worker_main) if self.worker_main else multiprocessing.get_context("spawn"),
+                    initializer=self.process_initializer,
+                    initargs=self.process_initargs
+                )
+            else:
+                self._cpu_pool = ThreadPoolExecutor(
+                    max_workers=self.cpu_workers, thread_name_prefix="audio-cpu"
+                )
+        return self._cpu_pool
+
+    def _get_io_pool(self) -> Executor:
+        """Create the I/O pool on first use"""
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=self.io_workers, thread_name_prefix="audio-io"
+            )
+        return self._io_pool
+
+    async def _run(self, kind: str, pool: Executor, semaphore: asyncio.Semaphore, func: Callable, *args, **kwargs) -> Any:
+        """Run func in pool once a slot in semaphore is free"""
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            self._active[kind] += 1
+            try:
+                return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+            finally:
+                self._active[kind] -= 1
+                self._completed[kind] += 1
+
+    async def run_cpu(self, func: Callable, *args, **kwargs) -> Any:
+        """Run CPU-bound work; func and its arguments must be picklable in process mode"""
+        if self._cpu_semaphore is None:
+            self._cpu_semaphore = asyncio.Semaphore(self.cpu_concurrency)
+        return await self._run("cpu", self._get_cpu_pool(), self._cpu_semaphore, func, *args, **kwargs)
+
+    async def run_io(self, func: Callable, *args, **kwargs) -> Any:
+        """Run blocking I/O or subprocess-driven work in the thread pool"""
+        if self._io_semaphore is None:
+            self._io_semaphore = asyncio.Semaphore(self.io_concurrency)
+        return await self._run("io", self._get_io_pool(), self._io_semaphore, func, *args, **kwargs)
+
+    def shutdown(self) -> None:
+        """Shut down both worker pools"""
+        for pool in (self._cpu_pool, self._io_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._cpu_pool = None
+        self._io_pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool sizes, limits and activity counters"""
+        return {
+            "cpu_backend": "process" if self.use_processes else "thread",
+            "cpu_workers": self.cpu_workers,
+            "cpu_concurrency": self.cpu_concurrency,
+            "cpu_active": self._active["cpu"],
+            "cpu_completed": self._completed["cpu"],
+            "io_workers": self.io_workers,
+            "io_concurrency": self.io_concurrency,
+            "io_active": self._active["io"],
+            "io_completed": self._completed["io"]
+        }
@@ -0,0 +1,93 @@
+import shutil
+import logging
+import tempfile
+import subprocess
+from typing import Optional, List, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+class FFmpegUtils:
+    """Helpers for driving the ffmpeg command line tool directly"""
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether the ffmpeg binary is on PATH"""
+        return shutil.which("ffmpeg") is not None
+
+    @staticmethod
+    def command(args: List[str], stdin: bool = False) -> List[str]:
+        """Build an ffmpeg command line; pass stdin=True when an input is read from pipe:0"""
+        cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y"]
+        if not stdin:
+            cmd.append("-nostdin")
+        return cmd + args
+
+    @staticmethod
+    def run(args: List[str], timeout: Optional[float] = None) -> None:
+        """Run ffmpeg with the given arguments, raising RuntimeError on failure"""
+        cmd = FFmpegUtils.command(args)
+        logger.debug(f"Running: {' '.join(cmd)}")
+
+        completed = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        if completed.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {completed.stderr.strip()}")
+
+    @staticmethod
+    def pcm_codec(sample_width: int) -> str:
+        """Return the ffmpeg PCM codec name for a sample width in bytes"""
+        if sample_width == 1:
+            return "pcm_u8"
+        return f"pcm_s{sample_width * 8}le"
+
+    @staticmethod
+    def convert_multi(input_path: str, outputs: List[Tuple[str, List[str]]]) -> None:
+        """Decode input_path once and encode it to several outputs in one ffmpeg run
+
+        outputs holds (output_path, codec_args) pairs; ffmpeg feeds the same
+        decoded frames to every encoder.
+        """
+        args = ["-i", input_path]
+        for output_path, codec_args in outputs:
+            args += ["-map", "0:a:0", "-map_metadata", "0"] + codec_args + [output_path]
+        FFmpegUtils.run(args)
+
+    @staticmethod
+    def encode_pcm_stream(
+        chunks: Iterable[bytes],
+        sample_rate: int,
+        channels: int,
+        output_path: str,
+        output_args: Optional[List[str]] = None,
+        timeout: Optional[float] = None
+    ) -> None:
+        """Encode raw 32-bit float PCM fed to ffmpeg through a pipe
+
+        Chunks are written as they are produced, so the input never has to be
+        held in memory or written to disk first.
+        """
+        cmd = FFmpegUtils.command(
+            ["-f", "f32le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0"]
+            + (output_args or []) + [output_path],
+            stdin=True
+        )
+        logger.debug(f"Running: {' '.join(cmd)}")
+
+        # stderr goes to a file so a chatty encoder can never block the writer
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=stderr)
+            try:
+                for chunk in chunks:
+                    process.stdin.write(chunk)
+            except BrokenPipeError:
+                # ffmpeg exited early; its error is reported below
+                pass
+            finally:
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+            returncode = process.wait(timeout=timeout)
+            if returncode != 0:
+                stderr.seek(0)
+                message = stderr.read().decode(errors="replace").strip()
+                raise RuntimeError(f"ffmpeg failed: {message}")
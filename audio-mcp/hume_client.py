@@ -0,0 +1,244 @@
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+from capabilities import get_process_capabilities
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HUME_BASE_URL = "https://api.hume.ai"
+
+# Status codes worth retrying after a pause
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class HumeAPIError(Exception):
+    """Non-success response from the Hume API"""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"Hume API error: {status_code} - {message}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code in RETRYABLE_STATUS_CODES
+
+class HumeClient:
+    """Shared HTTP client for the Hume batch API
+
+    Audio is uploaded as multipart form data streamed from disk, so memory use
+    stays constant regardless of file size. One pooled connection set is reused
+    by every call; point base_url at a local stand-in server for testing.
+    Job status is polled with exponential backoff and jitter until a deadline,
+    honouring Retry-After when the API asks the client to slow down.
+    """
+
+    MIME_TYPES = {
+        '.wav': 'audio/wav',
+        '.mp3': 'audio/mpeg',
+        '.m4a': 'audio/mp4',
+        '.flac': 'audio/flac',
+        '.ogg': 'audio/ogg'
+    }
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: float = 60.0,
+        max_connections: int = 10,
+        poll_deadline_seconds: float = 600.0,
+        initial_poll_seconds: float = 0.5,
+        max_poll_seconds: float = 15.0,
+        max_submit_attempts: int = 3
+    ):
+        self.base_url = (base_url or DEFAULT_HUME_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.poll_deadline_seconds = poll_deadline_seconds
+        self.initial_poll_seconds = initial_poll_seconds
+        self.max_poll_seconds = max_poll_seconds
+        self.max_submit_attempts = max_submit_attempts
+        self._client = None
+        self._counters = {"requests": 0, "jobs_submitted": 0, "files_uploaded": 0, "polls": 0, "retries": 0}
+
+    def _get_client(self):
+        """Create the pooled client on first use"""
+        if self._client is None:
+            httpx = get_process_capabilities().require("emotions")
+
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                # Uploads of large recordings can take far longer than a status poll
+                timeout=httpx.Timeout(self.timeout, write=None),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        return self._client
+
+    @classmethod
+    def mime_type(cls, file_path: str) -> str:
+        return cls.MIME_TYPES.get(Path(file_path).suffix.lower(), 'audio/wav')
+
+    @staticmethod
+    def upload_names(file_paths: List[str]) -> List[str]:
+        """Return the filename each path is uploaded as, unique within one job"""
+        if len(file_paths) == 1:
+            return [os.path.basename(file_paths[0])]
+        # Prefix with the position so recordings that share a basename stay distinguishable
+        return [f"{i:04d}_{os.path.basename(path)}" for i, path in enumerate(file_paths)]
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Convert a Retry-After header (seconds or HTTP date) to seconds from now"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    async def _request(self, method: str, path: str, api_key: str, **kwargs) -> Any:
+        """Send a request and return the decoded JSON body, raising HumeAPIError on failure"""
+        self._counters["requests"] += 1
+        response = await self._get_client().request(
+            method, path, headers={"X-Hume-Api-Key": api_key}, **kwargs
+        )
+        if response.status_code != 200:
+            raise HumeAPIError(
+                response.status_code,
+                response.text,
+                retry_after=self._parse_retry_after(response.headers.get("Retry-After"))
+            )
+        return response.json()
+
+    async def submit_job(self, api_key: str, file_paths: List[str], config: Dict[str, Any]) -> str:
+        """Start a batch job for local files and return its job ID
+
+        Rate-limited or unavailable responses are retried after Retry-After
+        (or a backoff delay), up to max_submit_attempts uploads.
+        """
+        names = self.upload_names(file_paths)
+        delay = self.initial_poll_seconds
+
+        for attempt in range(1, self.max_submit_attempts + 1):
+            handles = [open(path, "rb") for path in file_paths]
+            try:
+                # httpx reads open file handles in small chunks while sending
+                files = [
+                    ("file", (name, handle, self.mime_type(path)))
+                    for name, path, handle in zip(names, file_paths, handles)
+                ]
+                logger.info(f"Uploading {len(file_paths)} file(s) to Hume API at {self.base_url}")
+                job_data = await self._request(
+                    "POST", "/v0/batch/jobs", api_key,
+                    data={"json": json.dumps(config)},
+                    files=files
+                )
+                break
+            except HumeAPIError as e:
+                if not e.retryable or attempt == self.max_submit_attempts:
+                    raise
+                wait = e.retry_after if e.retry_after is not None else self._jittered(delay)
+                logger.warning(f"Hume API returned {e.status_code} on upload, retrying in {wait:.1f}s")
+                self._counters["retries"] += 1
+                await asyncio.sleep(wait)
+                delay = min(delay * 2, self.max_poll_seconds)
+            finally:
+                for handle in handles:
+                    handle.close()
+
+        job_id = job_data.get("job_id")
+        if not job_id:
+            raise HumeAPIError(200, "Failed to get job ID from Hume API")
+
+        self._counters["jobs_submitted"] += 1
+        self._counters["files_uploaded"] += len(file_paths)
+        return job_id
+
+    @staticmethod
+    def _jittered(delay: float) -> float:
+        """Spread retries of many concurrent jobs over [delay / 2, delay]"""
+        return delay * random.uniform(0.5, 1.0)
+
+    async def wait_for_job(self, api_key: str, job_id: str, deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Poll until the job completes and return its details
+
+        Polls start quickly so short jobs return early, then back off
+        exponentially with jitter. Raises HumeAPIError if the job fails and
+        TimeoutError once deadline_seconds (default poll_deadline_seconds) pass.
+        """
+        deadline = time.monotonic() + (deadline_seconds or self.poll_deadline_seconds)
+        delay = self.initial_poll_seconds
+        wait = self._jittered(delay)
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Timeout waiting for Hume API job {job_id}")
+            await asyncio.sleep(min(wait, remaining))
+
+            self._counters["polls"] += 1
+            try:
+                job = await self.get_job(api_key, job_id)
+            except HumeAPIError as e:
+                if not e.retryable:
+                    raise
+                self._counters["retries"] += 1
+                delay = min(delay * 2, self.max_poll_seconds)
+                wait = e.retry_after if e.retry_after is not None else self._jittered(delay)
+                continue
+
+            status = job.get("state", {}).get("status")
+            if status == "COMPLETED":
+                return job
+            if status == "FAILED":
+                message = job.get("state", {}).get("message", "Hume API job failed")
+                raise HumeAPIError(200, message)
+
+            delay = min(delay * 2, self.max_poll_seconds)
+            wait = self._jittered(delay)
+
+    async def get_job(self, api_key: str, job_id: str) -> Dict[str, Any]:
+        """Return job details, including state"""
+        return await self._request("GET", f"/v0/batch/jobs/{job_id}", api_key)
+
+    async def get_predictions(self, api_key: str, job_id: str) -> Any:
+        """Return the predictions of a completed job"""
+        return await self._request("GET", f"/v0/batch/jobs/{job_id}/predictions", api_key)
+
+    @staticmethod
+    def split_predictions(predictions: Any, upload_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Map each uploaded filename to its prediction entry in a job's results"""
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for source in predictions:
+            for prediction in source.get("results", {}).get("predictions", []):
+                name = prediction.get("file") or source.get("source", {}).get("filename")
+                if name:
+                    by_name[name] = prediction
+
+        # A single-file job needs no name matching
+        if len(upload_names) == 1 and not by_name.get(upload_names[0]) and len(by_name) == 1:
+            return {upload_names[0]: next(iter(by_name.values()))}
+        return by_name
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, upload and polling counters"""
+        return dict(self._counters)
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
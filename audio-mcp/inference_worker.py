@@ -0,0 +1,137 @@
+import os
+import logging
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+
+from model_registry import ModelRegistry, get_process_registry
+from waveform import Waveform
+from vad import SpeechTimeline
+from capabilities import get_process_capabilities
+
+logger = logging.getLogger(__name__)
+
+DIARIZATION_PIPELINE = "pyannote/speaker-diarization-3.1"
+
+# Below this fraction of silence, models run on the full recording
+VAD_MIN_SKIP_FRACTION = 0.05
+
+def run_whisper_transcription(audio: Any, model: str) -> Dict[str, Any]:
+    """Transcribe a Waveform or file path with a warm Whisper model from this process's registry
+    
+    Module-level so it can run in a worker process.
+    """
+    if isinstance(audio, Waveform):
+        audio = audio.as_whisper_input()
+    
+    registry = get_process_registry()
+    result = registry.get_whisper_model(model).transcribe(audio)
+    return _format_whisper_result(result, 0.0, registry)
+
+def run_whisper_file(file_path: str, model: str, vad_filter: bool = False) -> Dict[str, Any]:
+    """Decode and transcribe a file inside the worker, optionally on its speech regions only
+    
+    Module-level so it can run in a worker process; segments are returned on
+    the original timeline and the VAD summary under "vad".
+    """
+    waveform = Waveform.load(file_path)
+    speech_waveform, timeline = speech_only(waveform) if vad_filter else (waveform, None)
+    
+    registry = get_process_registry()
+    result = registry.get_whisper_model(model).transcribe(speech_waveform.as_whisper_input())
+    result = _format_whisper_result(result, 0.0, registry)
+    
+    if timeline is not None:
+        result["segments"] = remap_segments(result["segments"], timeline)
+        result["vad"] = timeline.summary()
+    return result
+
+def speech_only(waveform: Waveform, mmap_dir: Optional[str] = None) -> Tuple[Waveform, SpeechTimeline]:
+    """Return waveform cut down to its speech regions, and the timeline mapping back
+    
+    The original waveform is returned when removing silence would save too
+    little to be worth it.
+    """
+    timeline = SpeechTimeline.detect(waveform.samples, waveform.sample_rate)
+    if timeline.skipped_fraction < VAD_MIN_SKIP_FRACTION or not timeline.regions:
+        timeline.applied = False
+        return waveform, timeline
+    
+    timeline.applied = True
+    return waveform.select(timeline.regions, mmap_dir=mmap_dir), timeline
+
+def remap_segments(segments: List[Dict[str, Any]], timeline: Optional[SpeechTimeline]) -> List[Dict[str, Any]]:
+    """Move segment start and end times from the speech-only timeline to the original"""
+    if timeline is None or not timeline.applied:
+        return segments
+    return [
+        dict(
+            segment,
+            start=timeline.to_original(segment["start"]),
+            end=timeline.to_original(segment["end"], is_end=True)
+        )
+        for segment in segments
+    ]
+
+def run_whisper_chunk(
+    waveform: Waveform,
+    start_sample: int,
+    end_sample: int,
+    model: str,
+    offset_sample: int = 0
+) -> Dict[str, Any]:
+    """Transcribe one chunk of a waveform, returning segments on the original timeline
+    
+    Module-level so it can run in a worker process. Memory-mapped waveforms
+    are passed by path, so only the chunk itself is read; in-memory ones are
+    passed already sliced, with offset_sample giving the slice's position.
+    """
+    chunk = np.ascontiguousarray(waveform.samples[start_sample:end_sample], dtype=np.float32)
+    
+    registry = get_process_registry()
+    result = registry.get_whisper_model(model).transcribe(chunk)
+    return _format_whisper_result(result, (offset_sample + start_sample) / waveform.sample_rate, registry)
+
+def _format_whisper_result(result: Dict[str, Any], offset_seconds: float, registry: ModelRegistry) -> Dict[str, Any]:
+    """Reduce a Whisper result to picklable text and offset segments"""
+    return {
+        "text": result["text"],
+        "language": result.get("language", "unknown"),
+        "segments": [
+            {
+                "start": segment["start"] + offset_seconds,
+                "end": segment["end"] + offset_seconds,
+                "text": segment["text"]
+            }
+            for segment in result.get("segments", [])
+        ],
+        "worker_pid": os.getpid(),
+        "worker_models": registry.stats(),
+        "worker_imports": get_process_capabilities().import_times()
+    }
+
+def run_speaker_diarization(audio: Any, pipeline_name: str = DIARIZATION_PIPELINE) -> Dict[str, Any]:
+    """Diarize a Waveform or file path with the pyannote pipeline from this process's registry
+    
+    Module-level so it can run in a worker process.
+    """
+    Pipeline = get_process_capabilities().require("diarization").Pipeline
+    
+    if isinstance(audio, Waveform):
+        audio = audio.as_pyannote_input()
+    
+    registry = get_process_registry()
+    pipeline = registry.get(
+        "pyannote", pipeline_name, lambda: Pipeline.from_pretrained(pipeline_name)
+    )
+    diarization = pipeline(audio)
+    
+    return {
+        "turns": [
+            (turn.start, turn.end, speaker)
+            for turn, _, speaker in diarization.itertracks(yield_label=True)
+        ],
+        "worker_pid": os.getpid(),
+        "worker_models": registry.stats(),
+        "worker_imports": get_process_capabilities().import_times()
+    }
@@ -0,0 +1,227 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import logging
+import threading
+from typing import Optional, Dict, Any, Callable, Awaitable, List
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[..., Awaitable[Dict[str, Any]]]
+
+class JobQueue:
+    """Prioritized background queue for long-running audio tools
+
+    Job state lives in SQLite so queued and interrupted jobs are picked up
+    again after a restart. Parameters whose name contains "api_key" are kept
+    in memory only and are never written to disk.
+    """
+
+    PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+    def __init__(self, db_path: str, handlers: Dict[str, JobHandler], workers: int = 2):
+        self.db_path = db_path
+        self.handlers = handlers
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._secrets: Dict[str, Dict[str, Any]] = {}
+        self._sequence = 0
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                tool TEXT NOT NULL,
+                params TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                submitted_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                result TEXT,
+                error TEXT
+            )
+        """)
+        self._conn.commit()
+
+    async def start(self) -> None:
+        """Start the workers and requeue jobs left queued or running by a previous process"""
+        if self._queue is not None:
+            return
+
+        self._queue = asyncio.PriorityQueue()
+
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET state = 'queued', started_at = NULL WHERE state = 'running'")
+            self._conn.commit()
+            pending = self._conn.execute(
+                "SELECT id, priority, submitted_at FROM jobs WHERE state = 'queued' ORDER BY submitted_at"
+            ).fetchall()
+
+        for job_id, priority, _ in pending:
+            self._enqueue(job_id, priority)
+
+        if pending:
+            logger.info(f"Restored {len(pending)} queued audio jobs")
+
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stop the workers; running jobs stay marked running and are retried on restart"""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+
+    def _enqueue(self, job_id: str, priority: int) -> None:
+        # The sequence number keeps FIFO order within a priority level
+        self._sequence += 1
+        self._queue.put_nowait((priority, self._sequence, job_id))
+
+    async def submit(self, tool: str, params: Dict[str, Any], priority: str = "normal") -> str:
+        """Queue a tool call and return its job ID"""
+        if tool not in self.handlers:
+            raise ValueError(f"Unknown job tool: {tool}. Available: {', '.join(sorted(self.handlers))}")
+        if priority not in self.PRIORITIES:
+            raise ValueError(f"Invalid priority: {priority}. Use one of: {', '.join(self.PRIORITIES)}")
+
+        await self.start()
+
+        job_id = uuid.uuid4().hex[:12]
+        secrets = {k: v for k, v in params.items() if "api_key" in k}
+        stored_params = {k: v for k, v in params.items() if k not in secrets}
+        if secrets:
+            self._secrets[job_id] = secrets
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, tool, params, priority, state, submitted_at) VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, tool, json.dumps(stored_params), self.PRIORITIES[priority], time.time())
+            )
+            self._conn.commit()
+
+        self._enqueue(job_id, self.PRIORITIES[priority])
+        logger.info(f"Queued {tool} job {job_id} with {priority} priority")
+        return job_id
+
+    async def _worker(self) -> None:
+        """Run queued jobs one at a time"""
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                logger.error(f"Job worker failed on {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str) -> None:
+        """Execute one job and persist its outcome"""
+        with self._lock:
+            row = self._conn.execute("SELECT tool, params, state FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row[2] != "queued":
+                return
+            self._conn.execute(
+                "UPDATE jobs SET state = 'running', started_at = ? WHERE id = ?", (time.time(), job_id)
+            )
+            self._conn.commit()
+
+        tool, params_json, _ = row
+        params = json.loads(params_json)
+        params.update(self._secrets.pop(job_id, {}))
+
+        task = asyncio.ensure_future(self.handlers[tool](**params))
+        self._running[job_id] = task
+
+        try:
+            result = await task
+            if "error" in result:
+                self._finish(job_id, "failed", result=result, error=result["error"])
+            else:
+                self._finish(job_id, "completed", result=result)
+        except asyncio.CancelledError:
+            if job_id in self._running:
+                # The worker itself is shutting down; leave the job to be retried
+                task.cancel()
+                raise
+            self._finish(job_id, "cancelled")
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self._finish(job_id, "failed", error=str(e))
+        finally:
+            self._running.pop(job_id, None)
+
+    def _finish(self, job_id: str, state: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, finished_at = ?, result = ?, error = ? WHERE id = ?",
+                (state, time.time(), json.dumps(result, default=str) if result is not None else None, error, job_id)
+            )
+            self._conn.commit()
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return job state with queue wait and execution times"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tool, priority, state, submitted_at, started_at, finished_at, error FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        tool, priority, state, submitted_at, started_at, finished_at, error = row
+        now = time.time()
+        priority_name = next(name for name, value in self.PRIORITIES.items() if value == priority)
+
+        status = {
+            "job_id": job_id,
+            "tool": tool,
+            "priority": priority_name,
+            "state": state,
+            "queue_wait_seconds": round((started_at or finished_at or now) - submitted_at, 3),
+            "execution_seconds": round((finished_at or now) - started_at, 3) if started_at else None
+        }
+        if error:
+            status["error"] = error
+        return status
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored result of a finished job"""
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; returns False if it already finished"""
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or row[0] not in ("queued", "running"):
+            return False
+
+        task = self._running.pop(job_id, None)
+        if task is not None:
+            task.cancel()
+        self._secrets.pop(job_id, None)
+        self._finish(job_id, "cancelled")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Return job counts by state"""
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        return {"workers": self.workers, "by_state": counts}
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,202 @@
+import time
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Callable
+
+logger = logging.getLogger(__name__)
+
+class MemoryBudgetError(Exception):
+    """A decode could not be admitted within the memory budget"""
+
+class MemoryBudgetBusy(MemoryBudgetError):
+    """A decode would fit in the budget, but not until other memory is released"""
+
+    def __init__(self, nbytes: int, label: str):
+        super().__init__(f"{label} is waiting for {nbytes / (1024 * 1024):.0f} MB of decode memory")
+        self.nbytes = nbytes
+        self.label = label
+
+class MemoryBudget:
+    """Admission control for work that decodes whole files into memory
+
+    Callers reserve the estimated decoded size before decoding and release it
+    when done. A reservation waits while others hold the memory it needs, up
+    to wait_timeout_seconds; one larger than the whole budget is refused at
+    once, so the caller can take a streaming or memory-mapped path instead.
+
+    Caches that keep decoded audio after a reservation ends register their
+    size as resident memory, which counts against the budget. A reservation
+    that does not fit asks them to shrink before it waits.
+
+    Work started through call_without_waiting never blocks its thread:
+    a reservation that has to wait raises MemoryBudgetBusy, and the caller
+    waits with wait_for_room on the event loop before trying again.
+    """
+
+    def __init__(self, max_bytes: int = 1024 * 1024 * 1024, wait_timeout_seconds: float = 300.0):
+        self.max_bytes = max_bytes
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self._condition = threading.Condition()
+        self._reservations: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 0
+        self._reserved_bytes = 0
+        # owner -> {"bytes", "shrink"} for memory held by caches
+        self._resident: Dict[str, Dict[str, Any]] = {}
+        self._async_waiters: List[Any] = []
+        self._thread_state = threading.local()
+        self._counters = {"peak_bytes": 0, "admitted": 0, "waited": 0, "routed": 0, "rejected": 0, "timeouts": 0}
+
+    def fits(self, nbytes: int) -> bool:
+        """Check whether a reservation of nbytes could ever be admitted"""
+        return nbytes <= self.max_bytes
+
+    def _in_use(self) -> int:
+        """Bytes held by reservations and caches (lock held)"""
+        return self._reserved_bytes + sum(entry["bytes"] for entry in self._resident.values())
+
+    def _room_for(self, nbytes: int) -> bool:
+        """Check whether nbytes fits now, shrinking caches if that makes room (lock held)"""
+        shortfall = self._in_use() + nbytes - self.max_bytes
+        if shortfall <= 0:
+            return True
+        for entry in list(self._resident.values()):
+            if entry["shrink"] is not None and entry["bytes"] > 0:
+                entry["shrink"](shortfall)
+                shortfall = self._in_use() + nbytes - self.max_bytes
+                if shortfall <= 0:
+                    return True
+        return False
+
+    def _notify(self) -> None:
+        """Wake threads and coroutines waiting for memory (lock held)"""
+        self._condition.notify_all()
+        for loop, event in self._async_waiters:
+            loop.call_soon_threadsafe(event.set)
+        self._async_waiters.clear()
+
+    @contextmanager
+    def reserve(self, nbytes: int, label: str, timeout: Optional[float] = None):
+        """Hold nbytes of the budget for the duration of the with block
+
+        Raises MemoryBudgetError if nbytes exceeds the budget or does not
+        become available before the timeout, and MemoryBudgetBusy instead of
+        waiting inside call_without_waiting.
+        """
+        nbytes = max(0, int(nbytes))
+        if not self.fits(nbytes):
+            with self._condition:
+                self._counters["rejected"] += 1
+            raise MemoryBudgetError(
+                f"{label} needs about {nbytes / (1024 * 1024):.0f} MB decoded, "
+                f"more than the {self.max_bytes / (1024 * 1024):.0f} MB memory budget"
+            )
+
+        with self._condition:
+            if not self._room_for(nbytes):
+                if getattr(self._thread_state, "no_wait", False):
+                    raise MemoryBudgetBusy(nbytes, label)
+
+                self._counters["waited"] += 1
+                logger.info(f"Queueing {label} until {nbytes / (1024 * 1024):.0f} MB of decode memory is free")
+                admitted = self._condition.wait_for(
+                    lambda: self._room_for(nbytes),
+                    timeout=timeout if timeout is not None else self.wait_timeout_seconds
+                )
+                if not admitted:
+                    self._counters["timeouts"] += 1
+                    raise MemoryBudgetError(f"Timed out waiting for memory to decode {label}")
+
+            reservation_id = self._next_id
+            self._next_id += 1
+            self._reservations[reservation_id] = {"label": label, "bytes": nbytes, "since": time.time()}
+            self._reserved_bytes += nbytes
+            self._counters["admitted"] += 1
+            self._counters["peak_bytes"] = max(self._counters["peak_bytes"], self._in_use())
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._reservations.pop(reservation_id, None)
+                self._reserved_bytes -= nbytes
+                self._notify()
+
+    def call_without_waiting(self, func: Callable, *args, **kwargs) -> Any:
+        """Call func with reservations on this thread raising MemoryBudgetBusy instead of waiting"""
+        self._thread_state.no_wait = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._thread_state.no_wait = False
+
+    async def wait_for_room(self, nbytes: int, timeout: float) -> bool:
+        """Wait on the event loop until nbytes could be reserved, returning False on timeout
+
+        Another caller may take the memory first, so the reservation itself
+        can still find the budget busy.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        with self._condition:
+            self._counters["waited"] += 1
+
+        while True:
+            event = asyncio.Event()
+            with self._condition:
+                if self._room_for(nbytes):
+                    return True
+                self._async_waiters.append((loop, event))
+
+            try:
+                await asyncio.wait_for(event.wait(), max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                with self._condition:
+                    if (loop, event) in self._async_waiters:
+                        self._async_waiters.remove((loop, event))
+                    self._counters["timeouts"] += 1
+                return False
+
+    def set_resident(self, owner: str, nbytes: int, shrink: Optional[Callable[[int], None]] = None) -> None:
+        """Record the decoded audio a cache keeps between reservations
+
+        shrink(nbytes), if given, is called with the lock held to ask the
+        cache to free at least nbytes; it must report its new size through
+        set_resident from the same thread.
+        """
+        with self._condition:
+            previous = self._resident.get(owner)
+            self._resident[owner] = {
+                "bytes": max(0, int(nbytes)),
+                "shrink": shrink if shrink is not None else (previous or {}).get("shrink")
+            }
+            self._counters["peak_bytes"] = max(self._counters["peak_bytes"], self._in_use())
+            if previous is not None and nbytes < previous["bytes"]:
+                self._notify()
+
+    def record_routed(self) -> None:
+        """Count a job sent to a streaming path because it would not fit in memory"""
+        with self._condition:
+            self._counters["routed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the ledger of current reservations, resident caches and admission counters"""
+        now = time.time()
+        with self._condition:
+            active: List[Dict[str, Any]] = [
+                {
+                    "label": reservation["label"],
+                    "bytes": reservation["bytes"],
+                    "held_seconds": round(now - reservation["since"], 1)
+                }
+                for reservation in self._reservations.values()
+            ]
+            return dict(
+                self._counters,
+                max_bytes=self.max_bytes,
+                reserved_bytes=self._reserved_bytes,
+                resident={owner: entry["bytes"] for owner, entry in self._resident.items()},
+                in_use_bytes=self._in_use(),
+                active=active
+            )
@@ -0,0 +1,172 @@
+import time
+import types
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from capabilities import get_process_capabilities
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """Keeps loaded models warm and evicts least recently used ones under a RAM ceiling"""
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._models: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    @staticmethod
+    def _estimate_bytes(model: Any) -> int:
+        """Estimate resident size from the torch parameters and buffers a model holds
+
+        Whisper models are torch modules. A pyannote Pipeline is not, so its
+        attributes are searched for the segmentation and embedding modules it
+        wraps. Tensors shared between modules are counted once.
+        """
+        sizes: Dict[int, int] = {}
+        for module in ModelRegistry._find_modules(model):
+            for attr in ("parameters", "buffers"):
+                try:
+                    for tensor in getattr(module, attr)():
+                        sizes[id(tensor)] = tensor.numel() * tensor.element_size()
+                except Exception:
+                    pass
+        return sum(sizes.values())
+
+    @staticmethod
+    def _find_modules(obj: Any, depth: int = 3, seen: Optional[Set[int]] = None) -> List[Any]:
+        """Collect torch modules in obj or its attributes, up to depth levels down"""
+        seen = set() if seen is None else seen
+        if id(obj) in seen or isinstance(obj, (type, types.ModuleType)):
+            return []
+        seen.add(id(obj))
+
+        # torch.nn.Module without importing torch; a Pipeline has parameters() but no named_modules()
+        if callable(getattr(obj, "named_modules", None)):
+            return [obj]
+        if depth == 0:
+            return []
+
+        if isinstance(obj, dict):
+            children = list(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            children = list(obj)
+        elif hasattr(obj, "__dict__"):
+            children = list(vars(obj).values())
+        else:
+            return []
+
+        modules: List[Any] = []
+        for child in children:
+            modules += ModelRegistry._find_modules(child, depth - 1, seen)
+        return modules
+
+    def get(self, kind: str, name: str, loader: Callable[[], Any]) -> Any:
+        """Return a warm model, loading it with loader on first use"""
+        key = (kind, name)
+
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None:
+                return entry["model"]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Serialize loads of the same model so concurrent callers share one load
+        with load_lock:
+            with self._lock:
+                entry = self._touch(key)
+                if entry is not None:
+                    return entry["model"]
+
+            logger.info(f"Loading {kind} model: {name}")
+            started = time.perf_counter()
+            model = loader()
+            load_seconds = time.perf_counter() - started
+            resident_bytes = self._estimate_bytes(model)
+            logger.info(f"Loaded {kind} model {name} in {load_seconds:.2f}s ({resident_bytes / (1024 * 1024):.0f} MB)")
+
+            with self._lock:
+                self._models[key] = {
+                    "model": model,
+                    "load_seconds": load_seconds,
+                    "resident_bytes": resident_bytes,
+                    "uses": 1,
+                    "loaded_at": time.time(),
+                    "last_used": time.time()
+                }
+                self._evict_over_budget(keep=key)
+
+            return model
+
+    def _touch(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Mark a loaded model as recently used (lock held)"""
+        entry = self._models.get(key)
+        if entry is not None:
+            self._models.move_to_end(key)
+            entry["uses"] += 1
+            entry["last_used"] = time.time()
+        return entry
+
+    def get_whisper_model(self, name: str) -> Any:
+        """Return a warm Whisper model of the given size"""
+        whisper = get_process_capabilities().require("transcription")
+        return self.get("whisper", name, lambda: whisper.load_model(name))
+
+    def _evict_over_budget(self, keep: Tuple[str, str]) -> None:
+        """Evict least recently used models until under the RAM ceiling (lock held)"""
+        total = sum(entry["resident_bytes"] for entry in self._models.values())
+        for key in list(self._models):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            evicted = self._models.pop(key)
+            total -= evicted["resident_bytes"]
+            logger.info(f"Evicted {key[0]} model {key[1]} to stay under RAM ceiling")
+
+    def clear(self) -> None:
+        """Drop all loaded models"""
+        with self._lock:
+            self._models.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-model load time and resident size"""
+        with self._lock:
+            models = [
+                {
+                    "kind": kind,
+                    "name": name,
+                    "load_seconds": round(entry["load_seconds"], 3),
+                    "resident_bytes": entry["resident_bytes"],
+                    "uses": entry["uses"]
+                }
+                for (kind, name), entry in self._models.items()
+            ]
+            return {
+                "models": models,
+                "resident_bytes": sum(m["resident_bytes"] for m in models),
+                "max_bytes": self.max_bytes
+            }
+
+# Registry used by module-level inference functions in this process. The server
+# installs its own registry here; worker processes build one in their initializer.
+_process_registry: Optional[ModelRegistry] = None
+
+def set_process_registry(registry: ModelRegistry) -> None:
+    """Install the registry used by inference functions in this process"""
+    global _process_registry
+    _process_registry = registry
+
+def configure_process_registry(max_bytes: int) -> None:
+    """Worker process initializer that creates a registry with the given RAM ceiling"""
+    set_process_registry(ModelRegistry(max_bytes=max_bytes))
+
+def get_process_registry() -> ModelRegistry:
+    """Return the registry for this process, creating a default one if needed"""
+    global _process_registry
+    if _process_registry is None:
+        _process_registry = ModelRegistry()
+    return _process_registry
@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import zlib
+import asyncio
+import hashlib
+import sqlite3
+import logging
+import threading
+from typing import Optional, Dict, Any, Callable, Awaitable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bytes hashed per read when fingerprinting audio content
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Remembered file fingerprints; the oldest are pruned beyond this
+MAX_FINGERPRINTS = 100000
+
+class ResultStore:
+    """Persistent store of analysis results keyed by audio content and parameters
+
+    Results are compressed JSON rows in SQLite, expired after a TTL and evicted
+    least recently used first once the store exceeds its size budget. Identical
+    concurrent requests share a single computation.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_fingerprints: int = MAX_FINGERPRINTS
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_fingerprints = max_fingerprints
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                operation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                stat_key TEXT PRIMARY KEY,
+                digest TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def fingerprint(self, file_path: str) -> str:
+        """Return a content hash of file_path, reusing it while the file is unchanged"""
+        stat = os.stat(file_path)
+        stat_key = f"{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM fingerprints WHERE stat_key = ?", (stat_key,)
+            ).fetchone()
+        if row:
+            return row[0]
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (stat_key, digest) VALUES (?, ?)",
+                (stat_key, content_hash)
+            )
+            # Stat keys of edited or deleted files are never read again, so keep
+            # only the newest max_fingerprints rows; rowids grow with each insert
+            self._conn.execute(
+                "DELETE FROM fingerprints WHERE rowid <= (SELECT MAX(rowid) FROM fingerprints) - ?",
+                (self.max_fingerprints,)
+            )
+            self._conn.commit()
+
+        return content_hash
+
+    @staticmethod
+    def make_key(operation: str, fingerprint: str, params: Dict[str, Any]) -> str:
+        """Combine operation, content fingerprint and parameters into a store key"""
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(f"{operation}|{fingerprint}|{encoded}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a stored result, or None if missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, data FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if time.time() - row[0] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        return json.loads(zlib.decompress(row[1]))
+
+    def contains(self, key: str) -> bool:
+        """Check for an unexpired result without reading it or counting a lookup"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None and time.time() - row[0] <= self.ttl_seconds
+
+    def lookup(self, operation: str, fingerprint: str, params: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Return (key, stored result or None), counting the hit or miss
+
+        For callers that compute misses themselves and store them with put.
+        """
+        key = self.make_key(operation, fingerprint, params)
+        stored = self.get(key)
+        with self._lock:
+            if stored is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if stored is not None:
+            stored["from_cache"] = True
+        return key, stored
+
+    def put(self, key: str, operation: str, value: Dict[str, Any]) -> None:
+        """Store a result and enforce TTL and size limits"""
+        data = zlib.compress(json.dumps(value, default=str).encode())
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, operation, created_at, last_access, size, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, operation, now, now, len(data), data)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Delete expired rows, then least recently used rows over budget (lock held)"""
+        self._conn.execute("DELETE FROM results WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM results ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+
+    async def get_or_compute(
+        self,
+        operation: str,
+        fingerprint: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+        run_blocking: Optional[Callable[..., Awaitable[Any]]] = None
+    ) -> Dict[str, Any]:
+        """Return a stored result or compute it once, sharing it with identical concurrent calls
+
+        Results containing an "error" key are returned but not stored. If
+        the computing call is cancelled, one of its waiters computes instead.
+        SQLite reads and writes run through run_blocking (default: a thread),
+        never on the event loop.
+        """
+        run_blocking = run_blocking or asyncio.to_thread
+        key = self.make_key(operation, fingerprint, params)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+        while inflight is not None:
+            result = await asyncio.shield(inflight)
+            if result is not None:
+                return result
+            # None means the computing call was cancelled: take over, or wait for whoever did
+            inflight = self._inflight.get(key)
+
+        # Registered before the lookup so calls arriving while it runs wait for this one
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            stored = await run_blocking(self.get, key)
+            if stored is not None:
+                self.hits += 1
+                stored["from_cache"] = True
+                future.set_result(stored)
+                return stored
+
+            self.misses += 1
+            result = await compute()
+            if "error" not in result:
+                await run_blocking(self.put, key, operation, result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.set_result(None)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Avoid "exception never retrieved" warnings when nobody else waited
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit rate and store size"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,234 @@
+import os
+import re
+import time
+import uuid
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Set
+
+logger = logging.getLogger(__name__)
+
+# Names produced by TempStorage.allocate: <stem>_<12 hex digits><suffix>
+ALLOCATED_NAME = re.compile(r".+_[0-9a-f]{12}(\.[A-Za-z0-9]+)?$")
+
+class TempStorage:
+    """Bounded directory of output files handed back to clients
+
+    Every request gets a unique path, so concurrent calls never overwrite
+    each other. A background sweeper, run from start() until close(), deletes
+    files not used within the TTL, then least recently used files until the
+    total fits the byte quota; an allocation over the quota sweeps inline.
+    Pinned files, such as uploads still waiting to be sent, are never
+    removed by a sweep. Output files left by a previous run are adopted so
+    they count against the quota; other files in root are left alone.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        max_bytes: int = 2 * 1024 * 1024 * 1024,
+        ttl_seconds: float = 24 * 3600,
+        sweep_interval_seconds: float = 60.0
+    ):
+        self.root = root or os.path.join(tempfile.gettempdir(), "audio-mcp")
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.expirations = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # path -> last access time, least recently used first
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        # Last measured size of each entry, and their total
+        self._sizes: Dict[str, int] = {}
+        self._used_bytes = 0
+        # Allocated since the last sweep, so possibly still growing
+        self._unmeasured: Set[str] = set()
+        # Files allocated by this instance, the only ones close() deletes
+        self._owned: Set[str] = set()
+        self._pinned: Set[str] = set()
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+
+        os.makedirs(self.root, exist_ok=True)
+        self._adopt_existing()
+
+    def _adopt_existing(self) -> None:
+        """Track output files left in root by an earlier process, oldest first"""
+        existing = []
+        for entry in os.scandir(self.root):
+            if entry.is_file() and ALLOCATED_NAME.match(entry.name):
+                stat = entry.stat()
+                existing.append((stat.st_mtime, entry.path, stat.st_size))
+        for mtime, path, size in sorted(existing):
+            self._entries[path] = mtime
+            self._sizes[path] = size
+            self._used_bytes += size
+        if existing:
+            logger.info(f"Adopted {len(existing)} output files from a previous run in {self.root}")
+
+    def start(self) -> None:
+        """Start the background sweeper thread"""
+        if self._sweeper is not None:
+            return
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="temp-storage-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while not self._stop.wait(self.sweep_interval_seconds):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"Temp storage sweep failed: {e}")
+
+    def allocate(self, name_hint: str, suffix: str, pinned: bool = False) -> str:
+        """Reserve a unique output path such as <root>/<name_hint>_<id><suffix>
+
+        A pinned path is not removed by sweeps until it is discarded.
+        """
+        stem = Path(name_hint).stem or "output"
+        path = os.path.join(self.root, f"{stem}_{uuid.uuid4().hex[:12]}{suffix}")
+        with self._lock:
+            self._measure_unmeasured()
+            self._entries[path] = time.time()
+            self._sizes[path] = 0
+            self._unmeasured.add(path)
+            self._owned.add(path)
+            if pinned:
+                self._pinned.add(path)
+            over_quota = self._used_bytes > self.max_bytes
+        if over_quota:
+            self.sweep()
+        return path
+
+    def _measure_unmeasured(self) -> None:
+        """Bring the sizes of recently allocated files into the usage total (lock held)
+
+        Files written since the last sweep are measured on every allocation,
+        so the quota check sees outputs as soon as they exist.
+        """
+        for path in self._unmeasured:
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                size = 0
+            self._used_bytes += size - self._sizes.get(path, 0)
+            self._sizes[path] = size
+
+    def touch(self, path: str) -> None:
+        """Mark a managed file as recently used, e.g. when it is read back as an input"""
+        with self._lock:
+            if path in self._entries:
+                self._entries[path] = time.time()
+                self._entries.move_to_end(path)
+
+    def discard(self, path: str) -> None:
+        """Delete a managed file that is no longer needed, releasing any pin"""
+        with self._lock:
+            self._forget(path)
+        self._remove(path)
+
+    def _forget(self, path: str) -> None:
+        """Stop tracking path and take its size off the usage total (lock held)"""
+        self._entries.pop(path, None)
+        self._used_bytes -= self._sizes.pop(path, 0)
+        self._unmeasured.discard(path)
+        self._owned.discard(path)
+        self._pinned.discard(path)
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        """Delete path and return the bytes freed"""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            return size
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logger.warning(f"Failed to remove temp file {path}: {e}")
+            return 0
+
+    def sweep(self) -> Dict[str, int]:
+        """Delete expired files, then least recently used files over the quota, skipping pinned ones"""
+        now = time.time()
+        with self._lock:
+            entries = list(self._entries.items())
+            pinned = set(self._pinned)
+
+        sizes: Dict[str, int] = {}
+        expired = []
+        for path, last_access in entries:
+            try:
+                sizes[path] = os.path.getsize(path)
+            except FileNotFoundError:
+                # Not written yet, or removed by someone else
+                sizes[path] = 0
+            if now - last_access > self.ttl_seconds and path not in pinned:
+                expired.append(path)
+
+        expired_set = set(expired)
+        total = sum(size for path, size in sizes.items() if path not in expired_set)
+        evicted = []
+        for path, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if path not in expired_set and path not in pinned:
+                evicted.append(path)
+                total -= sizes[path]
+
+        with self._lock:
+            for path in expired + evicted:
+                self._forget(path)
+            # Entries allocated or discarded while the lock was released keep their own accounting
+            for path, size in sizes.items():
+                if path in self._sizes:
+                    self._used_bytes += size - self._sizes[path]
+                    self._sizes[path] = size
+                    self._unmeasured.discard(path)
+            used_bytes = self._used_bytes
+        for path in expired + evicted:
+            self._remove(path)
+
+        self.expirations += len(expired)
+        self.evictions += len(evicted)
+        if expired or evicted:
+            logger.info(f"Temp storage sweep removed {len(expired)} expired and {len(evicted)} over-quota files")
+
+        return {"expired": len(expired), "evicted": len(evicted), "used_bytes": used_bytes}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current usage against the quota"""
+        with self._lock:
+            self._measure_unmeasured()
+            return {
+                "root": self.root,
+                "files": len(self._entries),
+                "pinned_files": len(self._pinned),
+                "used_bytes": self._used_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "expirations": self.expirations,
+                "evictions": self.evictions
+            }
+
+    def close(self, remove_files: bool = True) -> None:
+        """Stop the sweeper and, by default, delete the files this instance allocated
+
+        Files adopted from an earlier run are left for the next one.
+        """
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=5)
+            self._sweeper = None
+        if remove_files:
+            with self._lock:
+                paths = list(self._owned)
+                for path in paths:
+                    self._forget(path)
+            for path in paths:
+                self._remove(path)
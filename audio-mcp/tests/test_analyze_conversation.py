@@ -0,0 +1,79 @@
+import asyncio
+import wave
+
+from audio_processor import AudioProcessor
+from result_store import ResultStore
+
+def write_silence(path, seconds=1, sample_rate=16000):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(b"\0\0" * sample_rate * seconds)
+    return str(path)
+
+def processor_with_stub_components(tmp_path, diarization_results):
+    """AudioProcessor whose components are stubs; diarization returns diarization_results in turn"""
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    processor = AudioProcessor(temp_dir=str(tmp_path), cache_dir=str(tmp_path), result_store=store)
+    calls = {"transcription": 0, "diarization": 0}
+
+    async def transcribe_audio(file_path, model, **kwargs):
+        calls["transcription"] += 1
+        return {"status": "success", "text": "hello", "segments": []}
+
+    async def diarize_speakers(file_path, **kwargs):
+        calls["diarization"] += 1
+        return diarization_results.pop(0)
+
+    def load_waveform(file_path):
+        raise RuntimeError("no decoder in tests")
+
+    processor.transcribe_audio = transcribe_audio
+    processor.diarize_speakers = diarize_speakers
+    processor.load_waveform = load_waveform
+    return processor, store, calls
+
+def test_failed_components_are_not_served_from_the_store(tmp_path):
+    audio = write_silence(tmp_path / "call.wav")
+    processor, store, calls = processor_with_stub_components(tmp_path, [
+        {"error": "pipeline unavailable"},
+        {"status": "success", "speakers": ["SPEAKER_00"], "segments": []}
+    ])
+
+    first = asyncio.run(processor.analyze_conversation(audio))
+    second = asyncio.run(processor.analyze_conversation(audio))
+
+    assert first["diarization_error"] == "pipeline unavailable"
+    assert "diarization_error" not in second and second["diarization"]["speakers"] == ["SPEAKER_00"]
+    assert calls["diarization"] == 2
+    assert store.stats()["entries"] == 0
+    processor.cleanup()
+
+class FakeWaveform:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def test_waveforms_are_closed_when_a_component_raises(tmp_path):
+    audio = write_silence(tmp_path / "call.wav")
+    processor, store, calls = processor_with_stub_components(tmp_path, [])
+    waveform, speech_waveform = FakeWaveform(), FakeWaveform()
+
+    async def speech(waveform):
+        return speech_waveform, None
+
+    async def diarize_speakers(file_path, **kwargs):
+        raise RuntimeError("diarization crashed")
+
+    processor.load_waveform = lambda file_path: waveform
+    processor._speech_waveform = speech
+    processor.diarize_speakers = diarize_speakers
+
+    result = asyncio.run(processor.analyze_conversation(audio))
+
+    assert result == {"error": "diarization crashed"}
+    assert waveform.closed and speech_waveform.closed
+    processor.cleanup()
@@ -0,0 +1,67 @@
+import wave
+
+import numpy as np
+import pytest
+
+from audio_buffer import AudioBuffer
+
+def write_pcm_wav(path, samples: np.ndarray, sample_rate: int = 8000) -> str:
+    """Write int16 samples shaped (frames, channels) with the standard library"""
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(samples.shape[1])
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.astype("<i2").tobytes())
+    return str(path)
+
+def ramp(frames: int, channels: int = 2) -> np.ndarray:
+    return (np.arange(frames * channels) % 30000).reshape(frames, channels).astype(np.int16)
+
+def test_open_wav_maps_samples_and_stream_parameters(tmp_path):
+    samples = ramp(8000)
+    buffer = AudioBuffer.open_wav(write_pcm_wav(tmp_path / "in.wav", samples))
+
+    assert isinstance(buffer.frames, np.memmap)
+    assert (buffer.sample_rate, buffer.channels, buffer.sample_width) == (8000, 2, 2)
+    assert buffer.duration_seconds == 1.0
+    assert buffer.max_possible_amplitude == 32768.0
+    np.testing.assert_array_equal(buffer.samples(), samples)
+
+def test_slice_seconds_is_a_view_of_the_requested_frames(tmp_path):
+    samples = ramp(8000)
+    buffer = AudioBuffer.open_wav(write_pcm_wav(tmp_path / "in.wav", samples))
+
+    middle = buffer.slice_seconds(0.25, 0.5)
+    tail = buffer.slice_seconds(0.75)
+
+    assert middle.frame_count == 2000 and tail.frame_count == 2000
+    assert np.shares_memory(middle.frames, buffer.frames)
+    np.testing.assert_array_equal(middle.samples(), samples[2000:4000])
+    np.testing.assert_array_equal(tail.samples(), samples[6000:])
+
+def test_write_wav_concatenates_buffers_into_a_readable_file(tmp_path):
+    first = ramp(1000)
+    second = ramp(501)[::-1].copy()
+    a = AudioBuffer.open_wav(write_pcm_wav(tmp_path / "a.wav", first))
+    b = AudioBuffer.open_wav(write_pcm_wav(tmp_path / "b.wav", second))
+
+    output = str(tmp_path / "out.wav")
+    assert AudioBuffer.write_wav([a.slice_seconds(0, 0.1), b], output) == 1301
+
+    with wave.open(output, "rb") as f:
+        assert (f.getnchannels(), f.getsampwidth(), f.getframerate(), f.getnframes()) == (2, 2, 8000, 1301)
+        written = np.frombuffer(f.readframes(1301), dtype="<i2").reshape(-1, 2)
+    np.testing.assert_array_equal(written, np.concatenate([first[:800], second]))
+    np.testing.assert_array_equal(AudioBuffer.open_wav(output).samples(), written)
+
+def test_write_wav_rejects_mixed_formats(tmp_path):
+    stereo = AudioBuffer.open_wav(write_pcm_wav(tmp_path / "a.wav", ramp(100)))
+    mono = AudioBuffer.open_wav(write_pcm_wav(tmp_path / "b.wav", ramp(100, channels=1)))
+    with pytest.raises(ValueError):
+        AudioBuffer.write_wav([stereo, mono], str(tmp_path / "out.wav"))
+
+def test_open_wav_rejects_other_files(tmp_path):
+    path = tmp_path / "not.wav"
+    path.write_bytes(b"ID3" + b"\0" * 100)
+    with pytest.raises(ValueError):
+        AudioBuffer.open_wav(str(path))
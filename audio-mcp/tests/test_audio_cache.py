@@ -0,0 +1,37 @@
+import wave
+
+import audio_processor
+from audio_processor import AudioProcessor
+
+def write_tone(path, seconds=2, sample_rate=8000):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(b"\x00\x10" * sample_rate * seconds)
+    return str(path)
+
+def test_pydub_fallbacks_share_one_decode(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_processor.FFmpegUtils, "is_available", staticmethod(lambda: False))
+    processor = AudioProcessor(temp_dir=str(tmp_path), cache_dir=str(tmp_path))
+    audio = write_tone(tmp_path / "tone.wav")
+
+    info = processor.get_audio_info(audio, decode=True)
+    trimmed = processor.trim_audio(audio, 0.5, 1.5, streaming=False)
+    converted = processor.convert_format(audio, "wav")
+
+    assert info["duration_seconds"] == 2.0
+    assert trimmed["trim_mode"] == "in_memory" and "error" not in converted
+    stats = processor.get_cache_stats()
+    assert (stats["misses"], stats["hits"]) == (1, 2)
+    processor.cleanup()
+
+def test_streaming_paths_do_not_decode(tmp_path):
+    processor = AudioProcessor(temp_dir=str(tmp_path), cache_dir=str(tmp_path))
+    audio = write_tone(tmp_path / "tone.wav")
+
+    processor.get_audio_info(audio)
+    processor.trim_audio(audio, 0.5, 1.5)
+
+    assert processor.get_cache_stats()["misses"] == 0
+    processor.cleanup()
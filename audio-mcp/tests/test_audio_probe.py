@@ -0,0 +1,36 @@
+import wave
+
+from audio_probe import AudioProbe
+
+def write_tone(path, seconds=1, sample_rate=8000):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(b"\x00\x10" * sample_rate * seconds)
+    return str(path)
+
+def cached_probes(probe):
+    return probe._get_conn().execute("SELECT COUNT(*) FROM probes").fetchone()[0]
+
+def test_probes_are_cached_across_instances(tmp_path):
+    audio = write_tone(tmp_path / "tone.wav", seconds=2)
+    first = AudioProbe(cache_path=str(tmp_path / "probes.sqlite3"))
+    assert first.probe(audio)["duration_seconds"] == 2.0
+    first.close()
+
+    second = AudioProbe(cache_path=str(tmp_path / "probes.sqlite3"))
+    assert cached_probes(second) == 1
+    assert second.probe(audio)["sample_rate"] == 8000
+    second.close()
+
+def test_cache_keeps_only_the_newest_probes(tmp_path):
+    probe = AudioProbe(cache_path=str(tmp_path / "probes.sqlite3"), max_entries=2)
+    paths = [write_tone(tmp_path / f"tone{i}.wav") for i in range(4)]
+    for path in paths:
+        probe.probe(path)
+
+    assert cached_probes(probe) == 2
+    newest = {AudioProbe._cache_key(path) for path in paths[2:]}
+    assert {row[0] for row in probe._get_conn().execute("SELECT key FROM probes")} == newest
+    probe.close()
@@ -0,0 +1,54 @@
+import os
+
+from batch_manifest import TranscriptManifest
+
+def record(manifest: TranscriptManifest, file_path: str, model: str = "base", status: str = "success") -> None:
+    manifest.append(dict(TranscriptManifest.file_identity(file_path), model=model, status=status))
+
+def test_unchanged_files_are_skipped(tmp_path):
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"RIFF")
+    manifest = TranscriptManifest(str(tmp_path / "manifest.jsonl"))
+    record(manifest, str(audio))
+
+    completed = manifest.completed("base")
+    assert manifest.is_done(completed, str(audio))
+    assert not manifest.is_done(manifest.completed("small"), str(audio))
+
+def test_changed_and_vanished_files_are_not_done(tmp_path):
+    changed = tmp_path / "changed.wav"
+    vanished = tmp_path / "vanished.wav"
+    changed.write_bytes(b"RIFF")
+    vanished.write_bytes(b"RIFF")
+    manifest = TranscriptManifest(str(tmp_path / "manifest.jsonl"))
+    record(manifest, str(changed))
+    record(manifest, str(vanished))
+
+    changed.write_bytes(b"RIFF and more")
+    os.remove(vanished)
+
+    completed = manifest.completed("base")
+    assert not manifest.is_done(completed, str(changed))
+    assert not manifest.is_done(completed, str(vanished))
+
+def test_later_lines_win(tmp_path):
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"RIFF")
+    manifest = TranscriptManifest(str(tmp_path / "manifest.jsonl"))
+    record(manifest, str(audio))
+    record(manifest, str(audio), status="error")
+    assert not manifest.is_done(manifest.completed("base"), str(audio))
+
+    record(manifest, str(audio))
+    assert manifest.is_done(manifest.completed("base"), str(audio))
+
+def test_truncated_final_line_is_ignored(tmp_path):
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"RIFF")
+    manifest = TranscriptManifest(str(tmp_path / "manifest.jsonl"))
+    record(manifest, str(audio))
+    with open(manifest.path, "a", encoding="utf-8") as f:
+        f.write('{"file_path": "/other.wav", "mod')
+
+    completed = manifest.completed("base")
+    assert list(completed) == [os.path.abspath(audio)]
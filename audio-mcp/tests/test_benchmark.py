@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+import benchmark
+
+RESULT_FIELDS = {
+    "operation", "case", "status", "iterations", "audio_seconds",
+    "latency_seconds", "throughput_x_realtime", "peak_rss_mb", "rss_growth_mb"
+}
+
+def run_quick(tmp_path, name, *extra):
+    output = tmp_path / name
+    exit_code = benchmark.main(["--quick", "--formats", "wav", "--output", str(output), "--startup-runs", "0", *extra])
+    return exit_code, json.loads(output.read_text())
+
+def result(operation, case, median, status="success"):
+    return {"operation": operation, "case": case, "status": status, "latency_seconds": {"median": median}}
+
+def write_report(path, results, schema_version=benchmark.SCHEMA_VERSION):
+    path.write_text(json.dumps({"schema_version": schema_version, "results": results}))
+    return str(path)
+
+def test_results_file_follows_the_schema(tmp_path):
+    exit_code, report = run_quick(tmp_path, "run.json")
+
+    assert exit_code == 0
+    assert report["schema_version"] == benchmark.SCHEMA_VERSION
+    assert {"package", "git_commit", "created_at", "host", "config", "corpus", "summary", "results"} <= set(report)
+    assert report["config"]["formats"] == ["wav"] and report["config"]["repeat"] == 1
+
+    assert all(entry["status"] == "ready" and "path" not in entry for entry in report["corpus"])
+    assert {"get_audio_info", "convert_format_to_wav", "trim_audio", "merge_audio_to_wav"} <= set(report["summary"])
+    for entry in report["results"]:
+        assert RESULT_FIELDS <= set(entry)
+        assert entry["status"] == "success"
+        assert {"first", "min", "median", "p95", "mean"} <= set(entry["latency_seconds"])
+
+def test_compare_reports_only_real_slowdowns(tmp_path):
+    baseline = write_report(tmp_path / "baseline.json", [
+        result("trim_audio", "a.wav", 0.100),
+        result("trim_audio", "b.wav", 0.100),
+        result("trim_audio", "c.wav", 0.0001),
+        result("convert_format_to_wav", "a.wav", 0.100, status="error")
+    ])
+    report = {"results": [
+        result("trim_audio", "a.wav", 0.150),
+        result("trim_audio", "b.wav", 0.105),
+        # Doubled, but by less than the timer noise floor
+        result("trim_audio", "c.wav", 0.0002),
+        # No successful baseline to compare with
+        result("convert_format_to_wav", "a.wav", 1.0),
+        result("merge_audio_to_wav", "all", 1.0)
+    ]}
+
+    regressions = benchmark.compare(report, baseline, threshold=0.10)
+
+    assert regressions == [{
+        "operation": "trim_audio",
+        "case": "a.wav",
+        "baseline_median_seconds": 0.100,
+        "median_seconds": 0.150,
+        "change": 0.5
+    }]
+
+def test_compare_rejects_other_schema_versions(tmp_path):
+    baseline = write_report(tmp_path / "baseline.json", [], schema_version=benchmark.SCHEMA_VERSION + 1)
+    with pytest.raises(ValueError, match="schema version"):
+        benchmark.compare({"results": []}, baseline, threshold=0.10)
+
+def test_compare_flag_sets_the_exit_code(tmp_path, monkeypatch):
+    _, report = run_quick(tmp_path, "baseline.json")
+
+    slower = [dict(entry, latency_seconds={"median": entry["latency_seconds"]["median"] + 1.0}) for entry in report["results"]]
+    exit_code, _ = run_quick(tmp_path, "against-slower.json", "--compare", write_report(tmp_path / "slower.json", slower))
+    assert exit_code == 0
+
+    monkeypatch.setattr(benchmark, "MIN_REGRESSION_SECONDS", 0.0)
+    faster = [dict(entry, latency_seconds={"median": 1e-9}) for entry in report["results"]]
+    exit_code, _ = run_quick(tmp_path, "against-faster.json", "--compare", write_report(tmp_path / "faster.json", faster))
+    assert exit_code == 1
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from capabilities import CapabilityRegistry
+
+CAPABILITIES = {
+    "present": {"module": "json", "label": "JSON backend", "install": "pip install json", "runs_in": "server"},
+    "missing": {"module": "no_such_backend_xyz", "label": "Missing backend", "install": "pip install xyz", "runs_in": "server"},
+    "missing_parent": {"module": "no_such_pkg_xyz.audio", "label": "Nested backend", "install": "pip install nested", "runs_in": "inference"}
+}
+
+def test_require_imports_available_backends_and_times_them():
+    registry = CapabilityRegistry(CAPABILITIES)
+
+    assert registry.require("present") is json
+    assert "present" in registry.import_times()
+
+def test_require_raises_import_error_with_install_hint():
+    registry = CapabilityRegistry(CAPABILITIES)
+
+    with pytest.raises(ImportError, match=r"Missing backend not available \(install with: pip install xyz\)"):
+        registry.require("missing")
+    with pytest.raises(ImportError, match="pip install nested"):
+        registry.require("missing_parent")
+    assert registry.import_times() == {}
+
+def test_availability_is_detected_without_importing(monkeypatch):
+    registry = CapabilityRegistry(CAPABILITIES)
+    imported = []
+    monkeypatch.setattr("capabilities.importlib.import_module", lambda name: imported.append(name))
+
+    assert registry.available("present") and not registry.available("missing")
+    assert registry.resolve(["all"]) == ["present"]
+    assert imported == []
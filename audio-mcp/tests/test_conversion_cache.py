@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conversion_cache import ConversionCache
+
+def converter(tmp_path, calls, delay=0.0):
+    """Return a convert callable that writes a new output file each call"""
+    def convert():
+        calls.append(threading.get_ident())
+        time.sleep(delay)
+        output_path = str(tmp_path / f"out-{len(calls)}.mp3")
+        with open(output_path, "wb") as f:
+            f.write(b"\xff" * 100)
+        return {"status": "success", "output_path": output_path}
+    return convert
+
+def test_concurrent_identical_conversions_run_once(tmp_path):
+    cache = ConversionCache()
+    key = ConversionCache.make_key("abc", ".MP3", "high")
+    calls = []
+    convert = converter(tmp_path, calls, delay=0.1)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: cache.get_or_convert(key, convert), range(4)))
+
+    assert len(calls) == 1
+    assert {result["output_path"] for result in results} == {str(tmp_path / "out-1.mp3")}
+    assert cache.stats()["misses"] == 1 and cache.stats()["coalesced"] == 3
+
+    again = cache.get_or_convert(key, convert)
+    assert again["from_cache"] is True and len(calls) == 1
+
+def test_outputs_changed_on_disk_are_converted_again(tmp_path):
+    cache = ConversionCache()
+    key = ConversionCache.make_key("abc", ".mp3", None)
+    calls = []
+    convert = converter(tmp_path, calls)
+
+    first = cache.get_or_convert(key, convert)
+    with open(first["output_path"], "ab") as f:
+        f.write(b"tampered")
+    second = cache.get_or_convert(key, convert)
+    os.remove(second["output_path"])
+    third = cache.get_or_convert(key, convert)
+
+    assert len(calls) == 3
+    assert "from_cache" not in third
+
+def test_failures_reach_every_waiter_and_are_not_remembered(tmp_path):
+    cache = ConversionCache()
+    key = ConversionCache.make_key("abc", ".wav", None)
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("encoder crashed")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(cache.get_or_convert, key, failing)
+        started.wait()
+        waiter = pool.submit(cache.get_or_convert, key, failing)
+        for future in (leader, waiter):
+            with pytest.raises(RuntimeError, match="encoder crashed"):
+                future.result()
+
+    calls = []
+    assert cache.get_or_convert(key, converter(tmp_path, calls))["status"] == "success"
+    assert len(calls) == 1
+
+def test_error_results_are_not_remembered(tmp_path):
+    cache = ConversionCache()
+    key = ConversionCache.make_key("abc", ".wav", None)
+    calls = []
+
+    def convert():
+        calls.append(1)
+        return {"error": "unsupported", "output_path": str(tmp_path / "missing.wav")}
+
+    cache.get_or_convert(key, convert)
+    cache.get_or_convert(key, convert)
+    assert len(calls) == 2
@@ -0,0 +1,20 @@
+import asyncio
+import sys
+
+from execution import ExecutionLayer
+
+# Evaluated in the worker: the name its main module was imported from
+MAIN_MODULE = "getattr(__import__('sys').modules['__main__'].__spec__, 'name', None)"
+
+def run_in_worker(layer, expression):
+    async def run():
+        try:
+            return await layer.run_cpu(eval, expression)
+        finally:
+            layer.shutdown()
+    return asyncio.run(run())
+
+def test_workers_import_the_entry_module_as_main():
+    layer = ExecutionLayer(cpu_workers=1, worker_main="inference_worker")
+    assert run_in_worker(layer, MAIN_MODULE) == "inference_worker"
+    assert sys.modules["__main__"].__name__ == "__main__"
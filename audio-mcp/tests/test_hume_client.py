@@ -0,0 +1,115 @@
+import asyncio
+from email.utils import formatdate
+
+import pytest
+
+import hume_client
+from hume_client import HumeClient, HumeAPIError
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record asyncio.sleep delays in hume_client and advance its clock instead of waiting"""
+    delays = []
+    clock = [0.0]
+
+    async def fake_sleep(seconds):
+        delays.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(hume_client.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(hume_client.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(hume_client.random, "uniform", lambda low, high: high)
+    return delays
+
+def scripted_jobs(client: HumeClient, responses: list) -> None:
+    """Make get_job return or raise each response in turn"""
+    async def get_job(api_key, job_id):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    client.get_job = get_job
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert HumeClient._parse_retry_after("7") == 7.0
+    assert HumeClient._parse_retry_after("-3") == 0.0
+    assert HumeClient._parse_retry_after(None) is None
+    assert HumeClient._parse_retry_after("soon") is None
+
+    in_a_minute = HumeClient._parse_retry_after(formatdate(hume_client.time.time() + 60, usegmt=True))
+    assert 55 <= in_a_minute <= 60
+
+def test_polls_back_off_exponentially_up_to_the_cap(sleeps):
+    client = HumeClient(initial_poll_seconds=1.0, max_poll_seconds=4.0)
+    running = {"state": {"status": "IN_PROGRESS"}}
+    scripted_jobs(client, [running, running, running, running, {"state": {"status": "COMPLETED"}}])
+
+    job = asyncio.run(client.wait_for_job("key", "job"))
+
+    assert job["state"]["status"] == "COMPLETED"
+    assert sleeps == [1.0, 2.0, 4.0, 4.0, 4.0]
+    assert client.stats()["polls"] == 5
+
+def test_polls_honour_retry_after_on_rate_limits(sleeps):
+    client = HumeClient(initial_poll_seconds=1.0)
+    scripted_jobs(client, [HumeAPIError(429, "slow down", retry_after=9.0), {"state": {"status": "COMPLETED"}}])
+
+    asyncio.run(client.wait_for_job("key", "job"))
+
+    assert sleeps == [1.0, 9.0]
+    assert client.stats()["retries"] == 1
+
+def test_non_retryable_errors_and_failed_jobs_raise(sleeps):
+    client = HumeClient()
+    scripted_jobs(client, [HumeAPIError(401, "bad key")])
+    with pytest.raises(HumeAPIError) as error:
+        asyncio.run(client.wait_for_job("key", "job"))
+    assert error.value.status_code == 401
+
+    scripted_jobs(client, [{"state": {"status": "FAILED", "message": "unreadable audio"}}])
+    with pytest.raises(HumeAPIError, match="unreadable audio"):
+        asyncio.run(client.wait_for_job("key", "job"))
+
+def test_polling_stops_at_the_deadline(sleeps):
+    client = HumeClient(initial_poll_seconds=1.0, max_poll_seconds=4.0)
+    scripted_jobs(client, [{"state": {"status": "IN_PROGRESS"}}] * 100)
+    with pytest.raises(TimeoutError):
+        asyncio.run(client.wait_for_job("key", "job", deadline_seconds=10.0))
+    # The last wait is cut short so the deadline is not overshot
+    assert sleeps == [1.0, 2.0, 4.0, 3.0]
+
+def test_uploads_are_retried_after_retry_after(sleeps, tmp_path):
+    recording = tmp_path / "call.wav"
+    recording.write_bytes(b"RIFF")
+    client = HumeClient(max_submit_attempts=3)
+    attempts = []
+
+    async def request(method, path, api_key, **kwargs):
+        attempts.append(kwargs["files"][0][1][0])
+        if len(attempts) == 1:
+            raise HumeAPIError(503, "busy", retry_after=2.0)
+        return {"job_id": "job-1"}
+
+    client._request = request
+
+    assert asyncio.run(client.submit_job("key", [str(recording)], {})) == "job-1"
+    assert attempts == ["call.wav", "call.wav"]
+    assert sleeps == [2.0]
+
+def test_split_predictions_maps_results_to_upload_names():
+    names = HumeClient.upload_names(["/a/call.wav", "/b/call.wav"])
+    assert names == ["0000_call.wav", "0001_call.wav"]
+
+    predictions = [
+        {"source": {"filename": "0001_call.wav"}, "results": {"predictions": [{"file": "0001_call.wav", "models": {"b": 1}}]}},
+        {"source": {"filename": "0000_call.wav"}, "results": {"predictions": [{"models": {"a": 1}}]}}
+    ]
+
+    by_name = HumeClient.split_predictions(predictions, names)
+
+    assert by_name["0000_call.wav"]["models"] == {"a": 1}
+    assert by_name["0001_call.wav"]["models"] == {"b": 1}
+
+def test_split_predictions_accepts_any_name_for_a_single_file():
+    predictions = [{"source": {"filename": "renamed.wav"}, "results": {"predictions": [{"models": {"a": 1}}]}}]
+    assert HumeClient.split_predictions(predictions, ["call.wav"]) == {"call.wav": {"models": {"a": 1}}}
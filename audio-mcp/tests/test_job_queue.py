@@ -0,0 +1,115 @@
+import asyncio
+
+from job_queue import JobQueue
+
+async def wait_for_state(queue: JobQueue, job_id: str, state: str, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while queue.status(job_id)["state"] != state:
+        assert asyncio.get_running_loop().time() < deadline, f"job {job_id} never reached {state}"
+        await asyncio.sleep(0.01)
+
+def test_restart_requeues_interrupted_jobs(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+
+    async def first_run() -> str:
+        async def hang(**params):
+            await asyncio.Event().wait()
+
+        queue = JobQueue(db_path, {"work": hang}, workers=1)
+        running = await queue.submit("work", {"value": 1})
+        queued = await queue.submit("work", {"value": 2})
+        await wait_for_state(queue, running, "running")
+        await queue.stop()
+        queue.close()
+        return running, queued
+
+    async def second_run(job_ids) -> None:
+        async def work(value):
+            return {"value": value}
+
+        queue = JobQueue(db_path, {"work": work}, workers=1)
+        await queue.start()
+        for job_id in job_ids:
+            await wait_for_state(queue, job_id, "completed")
+        assert [queue.result(job_id) for job_id in job_ids] == [{"value": 1}, {"value": 2}]
+        await queue.stop()
+        queue.close()
+
+    asyncio.run(second_run(asyncio.run(first_run())))
+
+def test_api_keys_are_not_persisted(tmp_path):
+    async def run() -> None:
+        received = {}
+
+        async def work(**params):
+            received.update(params)
+            return {"status": "success"}
+
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"), {"work": work})
+        job_id = await queue.submit("work", {"file_path": "a.wav", "hume_api_key": "secret"})
+        await wait_for_state(queue, job_id, "completed")
+        stored = queue._conn.execute("SELECT params FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+        await queue.stop()
+        queue.close()
+
+        assert received == {"file_path": "a.wav", "hume_api_key": "secret"}
+        assert "secret" not in stored
+
+    asyncio.run(run())
+
+def test_cancel_running_and_queued_jobs(tmp_path):
+    async def run() -> None:
+        started = []
+        release = asyncio.Event()
+
+        async def work(value):
+            started.append(value)
+            await release.wait()
+            return {"value": value}
+
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"), {"work": work}, workers=1)
+        running = await queue.submit("work", {"value": 1})
+        queued = await queue.submit("work", {"value": 2})
+        await wait_for_state(queue, running, "running")
+
+        assert queue.cancel(queued)
+        assert queue.cancel(running)
+        await wait_for_state(queue, running, "cancelled")
+        assert queue.status(queued)["state"] == "cancelled"
+        assert not queue.cancel(running)
+
+        release.set()
+        last = await queue.submit("work", {"value": 3})
+        await wait_for_state(queue, last, "completed")
+        await queue.stop()
+        queue.close()
+
+        assert started == [1, 3]
+
+    asyncio.run(run())
+
+def test_high_priority_jobs_start_first(tmp_path):
+    async def run() -> None:
+        order = []
+        release = asyncio.Event()
+
+        async def work(value):
+            order.append(value)
+            await release.wait()
+            return {"value": value}
+
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"), {"work": work}, workers=1)
+        blocker = await queue.submit("work", {"value": "blocker"})
+        await wait_for_state(queue, blocker, "running")
+        low = await queue.submit("work", {"value": "low"}, priority="low")
+        high = await queue.submit("work", {"value": "high"}, priority="high")
+
+        release.set()
+        await wait_for_state(queue, low, "completed")
+        await wait_for_state(queue, high, "completed")
+        await queue.stop()
+        queue.close()
+
+        assert order == ["blocker", "high", "low"]
+
+    asyncio.run(run())
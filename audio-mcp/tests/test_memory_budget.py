@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from memory_budget import MemoryBudget, MemoryBudgetBusy, MemoryBudgetError
+
+def test_reservation_larger_than_budget_is_refused():
+    budget = MemoryBudget(max_bytes=100)
+    with pytest.raises(MemoryBudgetError):
+        with budget.reserve(101, "huge.wav"):
+            pass
+    assert budget.stats()["rejected"] == 1
+
+def test_reservation_waits_for_memory_to_be_released():
+    budget = MemoryBudget(max_bytes=100)
+    admitted = threading.Event()
+
+    def second():
+        with budget.reserve(60, "second.wav"):
+            admitted.set()
+
+    with budget.reserve(60, "first.wav"):
+        thread = threading.Thread(target=second)
+        thread.start()
+        assert not admitted.wait(0.1)
+        assert budget.stats()["reserved_bytes"] == 60
+
+    thread.join(timeout=5)
+    assert admitted.is_set()
+    stats = budget.stats()
+    assert (stats["reserved_bytes"], stats["waited"], stats["peak_bytes"]) == (0, 1, 60)
+
+def test_reservation_times_out():
+    budget = MemoryBudget(max_bytes=100, wait_timeout_seconds=0.05)
+    with budget.reserve(60, "first.wav"):
+        with pytest.raises(MemoryBudgetError, match="Timed out"):
+            with budget.reserve(60, "second.wav"):
+                pass
+    assert budget.stats()["timeouts"] == 1
+
+def test_call_without_waiting_raises_busy():
+    budget = MemoryBudget(max_bytes=100)
+
+    def decode():
+        with budget.reserve(60, "second.wav"):
+            return "decoded"
+
+    with budget.reserve(60, "first.wav"):
+        with pytest.raises(MemoryBudgetBusy) as busy:
+            budget.call_without_waiting(decode)
+    assert (busy.value.nbytes, busy.value.label) == (60, "second.wav")
+    assert budget.call_without_waiting(decode) == "decoded"
+
+def test_resident_caches_shrink_to_make_room():
+    budget = MemoryBudget(max_bytes=100)
+    requests = []
+
+    def shrink(nbytes):
+        requests.append(nbytes)
+        budget.set_resident("decode_cache", 20)
+
+    budget.set_resident("decode_cache", 80, shrink)
+    with budget.reserve(50, "file.wav"):
+        assert budget.stats()["in_use_bytes"] == 70
+
+    assert requests == [30]
+    assert budget.stats()["resident"] == {"decode_cache": 20}
+
+def test_wait_for_room_on_the_event_loop():
+    budget = MemoryBudget(max_bytes=100)
+
+    async def run():
+        with budget.reserve(60, "first.wav"):
+            assert not await budget.wait_for_room(60, timeout=0.05)
+            waiter = asyncio.create_task(budget.wait_for_room(60, timeout=5))
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+        return await waiter
+
+    started = time.monotonic()
+    assert asyncio.run(run())
+    assert time.monotonic() - started < 1
+    assert budget.stats()["timeouts"] == 1
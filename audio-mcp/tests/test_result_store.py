@@ -0,0 +1,125 @@
+import asyncio
+
+from result_store import ResultStore
+
+def test_identical_concurrent_calls_compute_once(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"text": "hello"}
+
+    async def run():
+        return await asyncio.gather(*(
+            store.get_or_compute("transcribe_audio", "abc", {"model": "base"}, compute) for _ in range(5)
+        ))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result["text"] == "hello" for result in results)
+    assert (store.misses, store.coalesced) == (1, 4)
+
+    stored = asyncio.run(store.get_or_compute("transcribe_audio", "abc", {"model": "base"}, compute))
+    assert stored["from_cache"] is True
+    assert len(calls) == 1 and store.hits == 1
+    store.close()
+
+def test_errors_are_returned_but_not_stored(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"error": "model missing"}
+
+    for _ in range(2):
+        result = asyncio.run(store.get_or_compute("diarize_speakers", "abc", {}, compute))
+        assert result == {"error": "model missing"}
+    assert len(calls) == 2
+    store.close()
+
+def test_failed_compute_is_shared_and_not_stored(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("boom")
+
+    async def run():
+        return await asyncio.gather(*(
+            store.get_or_compute("transcribe_audio", "abc", {}, compute) for _ in range(3)
+        ), return_exceptions=True)
+
+    outcomes = asyncio.run(run())
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert not store.contains(ResultStore.make_key("transcribe_audio", "abc", {}))
+    store.close()
+
+def test_waiters_take_over_when_the_computing_call_is_cancelled(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    calls = []
+
+    async def run():
+        started = asyncio.Event()
+
+        async def compute():
+            calls.append(1)
+            started.set()
+            await asyncio.sleep(0.05)
+            return {"text": "hello"}
+
+        def request():
+            return asyncio.create_task(store.get_or_compute("transcribe_audio", "abc", {}, compute))
+
+        first = request()
+        await started.wait()
+        waiters = [request() for _ in range(3)]
+        await asyncio.sleep(0)
+        first.cancel()
+        return first, await asyncio.gather(*waiters)
+
+    first, results = asyncio.run(run())
+    assert first.cancelled()
+    assert all(result["text"] == "hello" for result in results)
+    assert len(calls) == 2
+    assert store.contains(ResultStore.make_key("transcribe_audio", "abc", {}))
+    store.close()
+
+def test_lookup_counts_hits_and_misses(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+
+    key, stored = store.lookup("detect_emotions", "abc", {"vad": True})
+    assert stored is None and store.misses == 1
+
+    store.put(key, "detect_emotions", {"status": "success"})
+    assert store.contains(key)
+    assert store.lookup("detect_emotions", "abc", {"vad": True}) == (key, {"status": "success", "from_cache": True})
+    assert store.lookup("detect_emotions", "abc", {"vad": False})[1] is None
+    assert (store.hits, store.misses) == (1, 2)
+    store.close()
+
+def test_expired_results_are_misses(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"), ttl_seconds=-1)
+    key = ResultStore.make_key("transcribe_audio", "abc", {})
+    store.put(key, "transcribe_audio", {"text": "old"})
+
+    assert not store.contains(key)
+    assert store.get(key) is None
+    store.close()
+
+def test_only_the_newest_fingerprints_are_kept(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"), max_fingerprints=2)
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"audio{i}.wav"
+        path.write_bytes(bytes([i]) * 100)
+        paths.append(str(path))
+    digests = [store.fingerprint(path) for path in paths]
+
+    assert store._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0] == 2
+    assert len(set(digests)) == 4
+    # A pruned file is hashed again and gets the same digest
+    assert store.fingerprint(paths[0]) == digests[0]
+    store.close()
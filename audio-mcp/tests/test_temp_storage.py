@@ -0,0 +1,87 @@
+import os
+import time
+
+from temp_storage import TempStorage
+
+def write(path: str, size: int) -> str:
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    return path
+
+def test_allocations_get_unique_paths(tmp_path):
+    storage = TempStorage(str(tmp_path))
+    paths = {storage.allocate("speech.wav", ".mp3") for _ in range(100)}
+    assert len(paths) == 100
+    assert all(path.endswith(".mp3") and os.path.basename(path).startswith("speech_") for path in paths)
+    storage.close()
+
+def test_usage_counts_files_written_since_the_last_sweep(tmp_path):
+    storage = TempStorage(str(tmp_path))
+    write(storage.allocate("a", ".wav"), 1000)
+    write(storage.allocate("b", ".wav"), 500)
+    assert storage.stats()["used_bytes"] == 1500
+
+    first = storage.allocate("c", ".wav")
+    write(first, 200)
+    storage.discard(first)
+    assert storage.stats()["used_bytes"] == 1500
+    storage.close()
+
+def test_sweep_evicts_least_recently_used_over_quota(tmp_path):
+    storage = TempStorage(str(tmp_path), max_bytes=2500)
+    oldest = write(storage.allocate("oldest", ".wav"), 1000)
+    touched = write(storage.allocate("touched", ".wav"), 1000)
+    newest = write(storage.allocate("newest", ".wav"), 1000)
+    storage.touch(oldest)
+
+    result = storage.sweep()
+
+    assert result["evicted"] == 1
+    assert not os.path.exists(touched)
+    assert os.path.exists(oldest) and os.path.exists(newest)
+    assert storage.stats()["used_bytes"] == 2000
+    storage.close()
+
+def test_allocation_over_quota_triggers_a_sweep(tmp_path):
+    storage = TempStorage(str(tmp_path), max_bytes=1500)
+    first = write(storage.allocate("first", ".wav"), 1000)
+    write(storage.allocate("second", ".wav"), 1000)
+
+    storage.allocate("third", ".wav")
+
+    assert not os.path.exists(first)
+    assert storage.evictions == 1
+    storage.close()
+
+def test_pinned_files_survive_expiry_and_eviction(tmp_path):
+    storage = TempStorage(str(tmp_path), max_bytes=1500, ttl_seconds=0.05)
+    pinned = write(storage.allocate("upload", ".opus", pinned=True), 1000)
+    expiring = write(storage.allocate("output", ".wav"), 100)
+    time.sleep(0.1)
+
+    assert storage.sweep()["expired"] == 1
+    assert os.path.exists(pinned) and not os.path.exists(expiring)
+
+    over_quota = write(storage.allocate("output", ".wav"), 1000)
+    assert storage.sweep()["evicted"] == 1
+    assert os.path.exists(pinned) and not os.path.exists(over_quota)
+
+    storage.discard(pinned)
+    assert not os.path.exists(pinned)
+    assert storage.stats()["pinned_files"] == 0
+    storage.close()
+
+def test_close_leaves_adopted_and_foreign_files(tmp_path):
+    earlier = TempStorage(str(tmp_path))
+    adopted = write(earlier.allocate("earlier", ".wav"), 100)
+    earlier.close(remove_files=False)
+    foreign = write(str(tmp_path / "notes.txt"), 100)
+
+    storage = TempStorage(str(tmp_path))
+    owned = write(storage.allocate("current", ".wav"), 100)
+    assert storage.stats()["files"] == 2
+
+    storage.close()
+
+    assert not os.path.exists(owned)
+    assert os.path.exists(adopted) and os.path.exists(foreign)
@@ -0,0 +1,108 @@
+import numpy as np
+
+from vad import EnergyVAD, SpeechTimeline, plan_chunks
+from audio_processor import AudioProcessor
+
+SAMPLE_RATE = 1000
+
+def tone_with_silences(seconds: int, silences_at: list) -> np.ndarray:
+    """A loud tone with one-second silences starting at the given seconds"""
+    samples = 0.5 * np.sin(np.arange(seconds * SAMPLE_RATE) * 0.3).astype(np.float32)
+    for start in silences_at:
+        samples[start * SAMPLE_RATE:(start + 1) * SAMPLE_RATE] = 0.0
+    return samples
+
+def test_short_audio_is_one_chunk():
+    samples = tone_with_silences(20, [])
+    assert plan_chunks(samples, SAMPLE_RATE, target_chunk_seconds=10, search_seconds=10) == [(0, len(samples), 0, len(samples))]
+
+def test_chunks_cut_at_silences_near_the_target():
+    samples = tone_with_silences(60, [18, 41])
+    chunks = plan_chunks(samples, SAMPLE_RATE, target_chunk_seconds=20, search_seconds=5, overlap_seconds=1)
+
+    cuts = [own_start for _, _, own_start, _ in chunks[1:]]
+    assert [round(cut / SAMPLE_RATE) for cut in cuts] == [18, 41]
+
+    # Owned regions tile the recording and each chunk reaches one second past them
+    assert chunks[0][2] == 0 and chunks[-1][3] == len(samples)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert previous[3] == current[2]
+    for start, end, own_start, own_end in chunks:
+        assert start == max(0, own_start - SAMPLE_RATE)
+        assert end == min(len(samples), own_end + SAMPLE_RATE)
+
+def test_chunks_fall_back_to_the_target_without_silence():
+    samples = tone_with_silences(60, [])
+    chunks = plan_chunks(samples, SAMPLE_RATE, target_chunk_seconds=20, search_seconds=5)
+    assert [own_start for _, _, own_start, _ in chunks] == [0, 20 * SAMPLE_RATE, 40 * SAMPLE_RATE]
+
+def test_stitch_keeps_owned_segments_and_drops_overlap_repeats():
+    chunk = (9 * SAMPLE_RATE, 21 * SAMPLE_RATE, 10 * SAMPLE_RATE, 20 * SAMPLE_RATE)
+    stitched = [{"start": 8.0, "end": 10.4, "text": " Hello there."}]
+    chunk_result = {"segments": [
+        # Midpoint before own_start: belongs to the previous chunk
+        {"start": 9.0, "end": 9.8, "text": "there"},
+        # Same words as the last stitched segment, overlapping it in time
+        {"start": 10.1, "end": 10.3, "text": "hello  THERE."},
+        {"start": 10.5, "end": 15.0, "text": "How are you?"},
+        # Midpoint past own_end: belongs to the next chunk
+        {"start": 19.5, "end": 21.0, "text": "Fine"}
+    ]}
+
+    new_segments = AudioProcessor._stitch_chunk(stitched, chunk, chunk_result, SAMPLE_RATE)
+
+    assert [segment["text"] for segment in new_segments] == ["How are you?"]
+
+def test_stitch_keeps_repeated_words_that_do_not_overlap():
+    chunk = (0, 30 * SAMPLE_RATE, 0, 30 * SAMPLE_RATE)
+    chunk_result = {"segments": [
+        {"start": 1.0, "end": 2.0, "text": "Yes."},
+        {"start": 3.0, "end": 4.0, "text": "Yes."}
+    ]}
+
+    new_segments = AudioProcessor._stitch_chunk([], chunk, chunk_result, SAMPLE_RATE)
+
+    assert len(new_segments) == 2
+
+def test_speech_regions_skip_long_silence_and_keep_short_pauses():
+    samples = tone_with_silences(10, [])
+    samples[3 * SAMPLE_RATE:7 * SAMPLE_RATE] = 0.0
+    # A 100 ms pause inside speech is too short to skip
+    samples[1000:1100] = 0.0
+
+    regions = EnergyVAD(padding_ms=0).speech_regions(samples, SAMPLE_RATE)
+
+    assert len(regions) == 2
+    (first_start, first_end), (second_start, second_end) = regions
+    assert first_start == 0 and abs(first_end - 3 * SAMPLE_RATE) <= 30
+    assert abs(second_start - 7 * SAMPLE_RATE) <= 30 and second_end == len(samples)
+
+def test_quiet_noisy_frames_count_as_unvoiced_speech():
+    samples = tone_with_silences(9, [])
+    # A low hum between 3 and 6 s, interrupted by a fricative: no louder, but noisy
+    samples[3 * SAMPLE_RATE:6 * SAMPLE_RATE] = 0.008 * np.sin(np.arange(3 * SAMPLE_RATE) * 2 * np.pi * 5 / SAMPLE_RATE)
+    samples[4 * SAMPLE_RATE:5 * SAMPLE_RATE] = 0.008 * np.random.default_rng(0).standard_normal(SAMPLE_RATE)
+
+    with_zcr = EnergyVAD(padding_ms=0, unvoiced_margin_db=10).speech_regions(samples, SAMPLE_RATE)
+    energy_only = EnergyVAD(padding_ms=0, unvoiced_margin_db=10, zcr_threshold=1.1).speech_regions(samples, SAMPLE_RATE)
+
+    assert len(with_zcr) == 3 and abs(with_zcr[1][0] - 4 * SAMPLE_RATE) <= 30
+    assert len(energy_only) == 2
+
+def test_timeline_maps_compact_times_back_to_the_original():
+    # Speech at 1-2 s and 5-7 s of a 10 s recording
+    timeline = SpeechTimeline([(1000, 2000), (5000, 7000)], 10 * SAMPLE_RATE, SAMPLE_RATE)
+
+    assert timeline.speech_seconds == 3.0
+    assert timeline.skipped_fraction == 0.7
+    assert timeline.to_original(0.5) == 1.5
+    assert timeline.to_original(1.5) == 5.5
+    # A start on the boundary begins the second region, an end on it closes the first
+    assert timeline.to_original(1.0) == 5.0
+    assert timeline.to_original(1.0, is_end=True) == 2.0
+    assert timeline.split_span(0.5, 1.5) == [(1.5, 2.0), (5.0, 5.5)]
+
+def test_timeline_is_identity_when_not_applied():
+    timeline = SpeechTimeline([(1000, 2000)], 10 * SAMPLE_RATE, SAMPLE_RATE)
+    timeline.applied = False
+    assert timeline.to_original(0.5) == 0.5
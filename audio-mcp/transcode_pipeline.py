@@ -0,0 +1,213 @@
+import queue
+import logging
+import tempfile
+import threading
+import subprocess
+from typing import Optional, Dict, Any, List, Union
+
+from ffmpeg_utils import FFmpegUtils
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from a decoder pipe at a time
+PIPE_CHUNK_BYTES = 256 * 1024
+
+# Chunks a decoder may read ahead of the encoder, bounding memory per decoder
+MAX_BUFFERED_CHUNKS = 16
+
+class _Decoder:
+    """One ffmpeg process decoding an input to raw PCM on stdout
+
+    A reader thread drains the pipe into a bounded queue, so decoders started
+    ahead of their turn run concurrently without buffering whole files.
+    """
+
+    def __init__(self, cmd: List[str]):
+        self.stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=self.stderr)
+        self.queue: "queue.Queue[bytes]" = queue.Queue(maxsize=MAX_BUFFERED_CHUNKS)
+        self.thread = threading.Thread(target=self._read, name="ffmpeg-decoder", daemon=True)
+        self.thread.start()
+
+    def _read(self) -> None:
+        while True:
+            chunk = self.process.stdout.read(PIPE_CHUNK_BYTES)
+            self.queue.put(chunk)
+            if not chunk:
+                break
+
+    def chunks(self):
+        while True:
+            chunk = self.queue.get()
+            if not chunk:
+                return
+            yield chunk
+
+    def finish(self) -> None:
+        """Wait for the decoder to exit, raising RuntimeError if it failed"""
+        returncode = self.process.wait()
+        self.thread.join()
+        self.process.stdout.close()
+        try:
+            if returncode != 0:
+                self.stderr.seek(0)
+                raise RuntimeError(f"ffmpeg decoder failed: {self.stderr.read().decode(errors='replace').strip()}")
+        finally:
+            self.stderr.close()
+
+    def kill(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        # Unblock the reader if it is waiting for queue space
+        while self.thread.is_alive():
+            try:
+                self.queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self.process.wait()
+        self.process.stdout.close()
+        self.stderr.close()
+
+class TranscodePipeline:
+    """Chain of decode, trim, resample and encode stages run as one streaming pass
+
+    A single input is handled by one ffmpeg process: trimming becomes an input
+    seek and resampling becomes output options, so nothing is written besides
+    the final file. Several inputs are each decoded to raw PCM by their own
+    ffmpeg process and piped in order into a single encoder, with up to
+    prefetch decoders running ahead. Memory use is bounded by the pipe
+    buffers, whatever the number or length of the inputs.
+
+        TranscodePipeline(path).trim(5.0, 65.0).resample(16000, 1).encode(out).run()
+    """
+
+    def __init__(self, inputs: Union[str, List[str]], prefetch: int = 2):
+        self.inputs = [inputs] if isinstance(inputs, str) else list(inputs)
+        if not self.inputs:
+            raise ValueError("TranscodePipeline needs at least one input")
+        self.prefetch = max(1, prefetch)
+        self.start_seconds: Optional[float] = None
+        self.end_seconds: Optional[float] = None
+        self.sample_rate: Optional[int] = None
+        self.channels: Optional[int] = None
+        self.sample_width = 2
+        self.output_path: Optional[str] = None
+        self.codec_args: List[str] = []
+
+    def trim(self, start_seconds: float, end_seconds: Optional[float] = None) -> "TranscodePipeline":
+        """Keep only [start_seconds, end_seconds) of a single input"""
+        if len(self.inputs) != 1:
+            raise ValueError("Trimming applies to a single input")
+        self.start_seconds = start_seconds
+        self.end_seconds = end_seconds
+        return self
+
+    def resample(
+        self,
+        sample_rate: Optional[int] = None,
+        channels: Optional[int] = None,
+        sample_width: Optional[int] = None
+    ) -> "TranscodePipeline":
+        """Convert to the given rate, channel count and PCM sample width"""
+        self.sample_rate = sample_rate or self.sample_rate
+        self.channels = channels or self.channels
+        self.sample_width = sample_width or self.sample_width
+        return self
+
+    def encode(self, output_path: str, codec_args: Optional[List[str]] = None) -> "TranscodePipeline":
+        """Write the result to output_path; the encoder follows its extension unless codec_args say otherwise"""
+        self.output_path = output_path
+        self.codec_args = list(codec_args or [])
+        return self
+
+    def _resample_args(self) -> List[str]:
+        args = []
+        if self.sample_rate:
+            args += ["-ar", str(self.sample_rate)]
+        if self.channels:
+            args += ["-ac", str(self.channels)]
+        return args
+
+    def run(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Run every stage and return how many processes and PCM bytes were involved"""
+        if self.output_path is None:
+            raise ValueError("TranscodePipeline has no encode stage")
+        if len(self.inputs) == 1:
+            return self._run_single(timeout)
+        return self._run_piped(timeout)
+
+    def _run_single(self, timeout: Optional[float]) -> Dict[str, Any]:
+        args = []
+        if self.start_seconds:
+            args += ["-ss", f"{self.start_seconds:.6f}"]
+        args += ["-i", self.inputs[0]]
+        if self.end_seconds is not None:
+            args += ["-t", f"{self.end_seconds - (self.start_seconds or 0.0):.6f}"]
+        args += ["-map", "0:a:0", "-map_metadata", "0"] + self._resample_args() + self.codec_args
+
+        FFmpegUtils.run(args + [self.output_path], timeout=timeout)
+        return {"processes": 1, "piped_bytes": 0}
+
+    def _run_piped(self, timeout: Optional[float]) -> Dict[str, Any]:
+        if not (self.sample_rate and self.channels):
+            raise ValueError("Piping several inputs needs a common sample rate and channel count")
+
+        pcm_codec = FFmpegUtils.pcm_codec(self.sample_width)
+        pcm_format = pcm_codec[len("pcm_"):]
+        decode_args = self._resample_args() + ["-c:a", pcm_codec, "-f", pcm_format, "pipe:1"]
+        decoders: List[Optional[_Decoder]] = [None] * len(self.inputs)
+
+        def start_decoder(index: int) -> None:
+            if index < len(self.inputs) and decoders[index] is None:
+                decoders[index] = _Decoder(FFmpegUtils.command(["-i", self.inputs[index], "-map", "0:a:0"] + decode_args))
+
+        encoder_stderr = tempfile.TemporaryFile()
+        encoder = subprocess.Popen(
+            FFmpegUtils.command(
+                ["-f", pcm_format, "-ar", str(self.sample_rate), "-ac", str(self.channels), "-i", "pipe:0"]
+                + self.codec_args + [self.output_path],
+                stdin=True
+            ),
+            stdin=subprocess.PIPE,
+            stderr=encoder_stderr
+        )
+        piped_bytes = 0
+
+        try:
+            for index in range(len(self.inputs)):
+                for ahead in range(index, index + self.prefetch):
+                    start_decoder(ahead)
+                for chunk in decoders[index].chunks():
+                    try:
+                        encoder.stdin.write(chunk)
+                    except BrokenPipeError:
+                        # The encoder exited early; report its error instead
+                        break
+                    piped_bytes += len(chunk)
+                else:
+                    decoders[index].finish()
+                    decoders[index] = None
+                    continue
+                break
+
+            try:
+                encoder.stdin.close()
+            except BrokenPipeError:
+                pass
+            if encoder.wait(timeout=timeout) != 0 or any(decoders):
+                encoder_stderr.seek(0)
+                raise RuntimeError(f"ffmpeg encoder failed: {encoder_stderr.read().decode(errors='replace').strip()}")
+
+        except BaseException:
+            for decoder in decoders:
+                if decoder is not None:
+                    decoder.kill()
+            if encoder.poll() is None:
+                encoder.kill()
+            encoder.wait()
+            raise
+        finally:
+            encoder_stderr.close()
+
+        logger.debug(f"Piped {piped_bytes} PCM bytes from {len(self.inputs)} decoders into {self.output_path}")
+        return {"processes": len(self.inputs) + 1, "piped_bytes": piped_bytes}
@@ -1,8 +1,9 @@
 import os
+import glob
 import tempfile
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import base64
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,19 @@ class AudioUtils:
         file_ext = Path(file_path).suffix.lower()
         return file_ext in AudioUtils.SUPPORTED_FORMATS
     
+    @staticmethod
+    def find_audio_files(source: str) -> List[str]:
+        """Return supported audio files in a directory (recursively) or matching a glob pattern, sorted"""
+        if os.path.isdir(source):
+            matches = glob.glob(os.path.join(source, "**", "*"), recursive=True)
+        else:
+            matches = glob.glob(source, recursive=True)
+        
+        return sorted(
+            os.path.abspath(path) for path in matches
+            if os.path.isfile(path) and Path(path).suffix.lower() in AudioUtils.SUPPORTED_FORMATS
+        )
+    
     @staticmethod
     def get_temp_filepath(suffix: str = '.wav') -> str:
         """Generate a temporary file path with given suffix"""
@@ -90,7 +104,7 @@ class AudioUtils:
             metadata = {
                 "duration": info.length if hasattr(info, 'length') else 0,
                 "bitrate": info.bitrate if hasattr(info, 'bitrate') else 0,
-                "sample_rate": info.bitrate if hasattr(info, 'bitrate') else 0,
+                "sample_rate": info.sample_rate if hasattr(info, 'sample_rate') else 0,
                 "channels": info.channels if hasattr(info, 'channels') else 0,
                 "format": Path(file_path).suffix.lower()[1:],
                 "file_size": os.path.getsize(file_path)
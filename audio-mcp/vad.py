@@ -0,0 +1,250 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class EnergyVAD:
+    """Vectorized frame-energy voice activity detection on mono float32 samples
+
+    Frames below the adaptive energy threshold count as silence unless their
+    zero-crossing rate marks them as unvoiced speech (fricatives such as "s"
+    and "f" are quiet but noisy).
+    """
+
+    def __init__(
+        self,
+        frame_ms: float = 30.0,
+        margin_db: float = 12.0,
+        floor_db: float = -60.0,
+        min_silence_ms: float = 300.0,
+        unvoiced_margin_db: float = 6.0,
+        zcr_threshold: float = 0.25,
+        padding_ms: float = 200.0
+    ):
+        self.frame_ms = frame_ms
+        self.margin_db = margin_db
+        self.floor_db = floor_db
+        self.min_silence_ms = min_silence_ms
+        self.unvoiced_margin_db = unvoiced_margin_db
+        self.zcr_threshold = zcr_threshold
+        self.padding_ms = padding_ms
+
+    def frame_length(self, sample_rate: int) -> int:
+        return max(1, int(sample_rate * self.frame_ms / 1000))
+
+    def frame_energy_db(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Return the RMS level of each frame in dBFS"""
+        frame_len = self.frame_length(sample_rate)
+        num_frames = len(samples) // frame_len
+        if num_frames == 0:
+            return np.empty(0, dtype=np.float32)
+
+        frames = np.asarray(samples[:num_frames * frame_len], dtype=np.float32).reshape(num_frames, frame_len)
+        rms = np.sqrt(np.mean(np.square(frames), axis=1))
+        return 20.0 * np.log10(rms + 1e-10)
+
+    def frame_zero_crossing_rate(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Return the fraction of adjacent sample pairs in each frame that change sign"""
+        frame_len = self.frame_length(sample_rate)
+        num_frames = len(samples) // frame_len
+        if num_frames == 0 or frame_len < 2:
+            return np.zeros(num_frames, dtype=np.float32)
+
+        frames = np.asarray(samples[:num_frames * frame_len], dtype=np.float32).reshape(num_frames, frame_len)
+        signs = np.signbit(frames)
+        return np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_len - 1)
+
+    def _energy_threshold(self, energy: np.ndarray) -> float:
+        # Threshold sits a margin above the noise floor, but never within a
+        # margin of the loud level, so recordings with little silence still work
+        noise_floor, loud_level = np.percentile(energy, [5, 95])
+        threshold = min(noise_floor + self.margin_db, loud_level - self.margin_db)
+        return max(threshold, self.floor_db)
+
+    def silent_frames(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Return a boolean mask of frames quieter than an adaptive threshold"""
+        energy = self.frame_energy_db(samples, sample_rate)
+        if energy.size == 0:
+            return np.zeros(0, dtype=bool)
+        return energy < self._energy_threshold(energy)
+
+    def speech_frames(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Return a boolean mask of frames holding voiced or unvoiced speech
+
+        Pauses shorter than min_silence_ms are kept, and each speech run is
+        extended by padding_ms on both sides so word edges are not clipped.
+        """
+        energy = self.frame_energy_db(samples, sample_rate)
+        if energy.size == 0:
+            return np.zeros(0, dtype=bool)
+
+        threshold = self._energy_threshold(energy)
+        zcr = self.frame_zero_crossing_rate(samples, sample_rate)
+        unvoiced = (energy >= threshold - self.unvoiced_margin_db) & (zcr >= self.zcr_threshold)
+        speech = (energy >= threshold) | unvoiced
+
+        # Fill pauses too short to be worth skipping
+        min_frames = max(1, int(self.min_silence_ms / self.frame_ms))
+        starts, ends = self._runs(~speech)
+        for start, end in zip(starts, ends):
+            if end - start < min_frames and start > 0 and end < speech.size:
+                speech[start:end] = True
+
+        # Dilate speech runs by the padding
+        pad = int(self.padding_ms / self.frame_ms)
+        if pad > 0 and speech.any():
+            kernel = np.ones(2 * pad + 1, dtype=np.int32)
+            speech = np.convolve(speech.astype(np.int32), kernel, mode="same") > 0
+
+        return speech
+
+    def speech_regions(self, samples: np.ndarray, sample_rate: int) -> List[Tuple[int, int]]:
+        """Return (start, end) sample ranges of speech"""
+        mask = self.speech_frames(samples, sample_rate)
+        frame_len = self.frame_length(sample_rate)
+        starts, ends = self._runs(mask)
+
+        regions = [(int(start) * frame_len, int(end) * frame_len) for start, end in zip(starts, ends)]
+        # The trailing partial frame belongs to the last region if speech runs to the end
+        if regions and mask.size and mask[-1]:
+            regions[-1] = (regions[-1][0], len(samples))
+        return regions
+
+    @staticmethod
+    def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return start and end indices (exclusive) of runs of True in mask"""
+        padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+        edges = np.diff(padded)
+        return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    def silence_boundaries(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Return the midpoints, in samples, of silences at least min_silence_ms long"""
+        mask = self.silent_frames(samples, sample_rate)
+        starts, ends = self._runs(mask)
+
+        frame_len = self.frame_length(sample_rate)
+        min_frames = max(1, int(self.min_silence_ms / self.frame_ms))
+        long_enough = (ends - starts) >= min_frames
+
+        return ((starts[long_enough] + ends[long_enough]) // 2) * frame_len
+
+class SpeechTimeline:
+    """Maps times on a speech-only recording back to the original recording
+
+    The speech-only recording is the speech regions of the original placed
+    back to back; region i starts at compact_starts[i] on the compact timeline.
+    """
+
+    def __init__(self, regions: List[Tuple[int, int]], total_samples: int, sample_rate: int):
+        self.regions = regions
+        self.total_samples = total_samples
+        self.sample_rate = sample_rate
+        # Cleared by callers that decide to process the full recording anyway
+        self.applied = True
+
+        lengths = np.array([end - start for start, end in regions], dtype=np.int64)
+        self._original_starts = np.array([start for start, _ in regions], dtype=np.int64)
+        self._compact_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if regions else np.zeros(0, dtype=np.int64)
+        self.speech_samples = int(lengths.sum()) if regions else 0
+
+    @classmethod
+    def detect(cls, samples: np.ndarray, sample_rate: int, vad: Optional[EnergyVAD] = None) -> "SpeechTimeline":
+        """Find the speech regions of samples"""
+        vad = vad or EnergyVAD()
+        return cls(vad.speech_regions(samples, sample_rate), len(samples), sample_rate)
+
+    @property
+    def original_seconds(self) -> float:
+        return self.total_samples / self.sample_rate
+
+    @property
+    def speech_seconds(self) -> float:
+        return self.speech_samples / self.sample_rate
+
+    @property
+    def skipped_fraction(self) -> float:
+        if self.total_samples == 0:
+            return 0.0
+        return 1.0 - self.speech_samples / self.total_samples
+
+    def to_original(self, seconds: float, is_end: bool = False) -> float:
+        """Convert a compact-timeline time to the original timeline
+
+        An end time that falls exactly on a region boundary stays at the end of
+        the earlier region instead of jumping past the skipped silence.
+        """
+        if not self.applied or not self.regions:
+            return seconds
+        position = seconds * self.sample_rate
+        side = "left" if is_end else "right"
+        index = max(0, int(np.searchsorted(self._compact_starts, position, side=side)) - 1)
+        original = self._original_starts[index] + (position - self._compact_starts[index])
+        return float(original) / self.sample_rate
+
+    def split_span(self, start: float, end: float) -> List[Tuple[float, float]]:
+        """Convert a compact-timeline span to original spans, split where silence was removed"""
+        start_index = max(0, int(np.searchsorted(self._compact_starts, start * self.sample_rate, side="right")) - 1)
+        end_index = max(0, int(np.searchsorted(self._compact_starts, end * self.sample_rate, side="left")) - 1)
+        if not self.applied or not self.regions or start_index == end_index:
+            return [(self.to_original(start), self.to_original(end, is_end=True))]
+
+        spans = [(self.to_original(start), self.regions[start_index][1] / self.sample_rate)]
+        for index in range(start_index + 1, end_index):
+            spans.append((self.regions[index][0] / self.sample_rate, self.regions[index][1] / self.sample_rate))
+        spans.append((self.regions[end_index][0] / self.sample_rate, self.to_original(end, is_end=True)))
+        return spans
+
+    def summary(self) -> Dict[str, Any]:
+        """Return skipped-audio figures for responses"""
+        return {
+            "applied": self.applied,
+            "original_seconds": round(self.original_seconds, 3),
+            "speech_seconds": round(self.speech_seconds, 3),
+            "skipped_fraction": round(self.skipped_fraction, 4) if self.applied else 0.0,
+            "speech_regions": len(self.regions)
+        }
+
+def plan_chunks(
+    samples: np.ndarray,
+    sample_rate: int,
+    target_chunk_seconds: float = 300.0,
+    search_seconds: float = 30.0,
+    overlap_seconds: float = 1.0,
+    vad: Optional[EnergyVAD] = None
+) -> List[Tuple[int, int, int, int]]:
+    """Split samples into chunks that end at silences near target_chunk_seconds
+
+    Each chunk is (start, end, own_start, own_end) in samples: [start, end)
+    includes overlap_seconds of context on both sides, and [own_start, own_end)
+    is the region whose segments the chunk is responsible for when stitching.
+    """
+    vad = vad or EnergyVAD()
+    total = len(samples)
+    target = int(target_chunk_seconds * sample_rate)
+    search = int(search_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+
+    if total <= target + search:
+        return [(0, total, 0, total)]
+
+    boundaries = vad.silence_boundaries(samples, sample_rate)
+
+    cuts = [0]
+    while total - cuts[-1] > target + search:
+        ideal = cuts[-1] + target
+        candidates = boundaries[(boundaries >= ideal - search) & (boundaries <= ideal + search)]
+        if candidates.size:
+            cut = int(candidates[np.argmin(np.abs(candidates - ideal))])
+        else:
+            cut = ideal
+        cuts.append(cut)
+    cuts.append(total)
+
+    logger.debug(f"Planned {len(cuts) - 1} chunks from {len(boundaries)} silence boundaries")
+
+    return [
+        (max(0, own_start - overlap), min(total, own_end + overlap), own_start, own_end)
+        for own_start, own_end in zip(cuts[:-1], cuts[1:])
+    ]
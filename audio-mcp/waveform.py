@@ -0,0 +1,167 @@
+import os
+import logging
+import tempfile
+import subprocess
+from typing import Optional, Any, List, Tuple
+
+import numpy as np
+
+from ffmpeg_utils import FFmpegUtils
+
+logger = logging.getLogger(__name__)
+
+# Whisper and pyannote both work on 16 kHz mono audio
+ANALYSIS_SAMPLE_RATE = 16000
+
+# Bytes read from ffmpeg per pipe read
+PIPE_CHUNK_BYTES = 1024 * 1024
+
+class Waveform:
+    """16 kHz mono float32 samples decoded once and shared by analysis stages
+
+    Long recordings are kept in a memory-mapped file so worker processes can
+    open them by path instead of receiving a pickled copy of the samples.
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int = ANALYSIS_SAMPLE_RATE, mmap_path: Optional[str] = None):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.mmap_path = mmap_path
+
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    @classmethod
+    def from_mmap(cls, mmap_path: str, sample_rate: int = ANALYSIS_SAMPLE_RATE) -> "Waveform":
+        """Open samples previously written to a raw float32 file"""
+        # Copy-on-write keeps the file intact while giving torch a writable array
+        samples = np.memmap(mmap_path, dtype=np.float32, mode="c")
+        return cls(samples, sample_rate, mmap_path)
+
+    def __reduce__(self):
+        if self.mmap_path is not None:
+            return (Waveform.from_mmap, (self.mmap_path, self.sample_rate))
+        return (Waveform, (np.asarray(self.samples), self.sample_rate))
+
+    @classmethod
+    def load(
+        cls,
+        file_path: str,
+        duration_seconds: Optional[float] = None,
+        mmap_dir: Optional[str] = None,
+        mmap_threshold_seconds: float = 600.0
+    ) -> "Waveform":
+        """Decode file_path once to 16 kHz mono float32
+
+        Recordings longer than mmap_threshold_seconds (or of unknown length)
+        are streamed to a file in mmap_dir and memory-mapped.
+        """
+        use_mmap = mmap_dir is not None and (
+            duration_seconds is None or duration_seconds > mmap_threshold_seconds
+        )
+
+        if not FFmpegUtils.is_available():
+            return cls(cls._decode_with_pydub(file_path))
+
+        cmd = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin",
+            "-i", file_path,
+            "-map", "0:a:0",
+            "-ac", "1",
+            "-ar", str(ANALYSIS_SAMPLE_RATE),
+            "-f", "f32le",
+            "-"
+        ]
+
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        if use_mmap:
+            fd, mmap_path = tempfile.mkstemp(prefix="waveform_", suffix=".f32", dir=mmap_dir)
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    while True:
+                        chunk = process.stdout.read(PIPE_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+                cls._check_process(process)
+            except Exception:
+                os.remove(mmap_path)
+                raise
+            return cls.from_mmap(mmap_path)
+
+        data = bytearray()
+        while True:
+            chunk = process.stdout.read(PIPE_CHUNK_BYTES)
+            if not chunk:
+                break
+            data.extend(chunk)
+        cls._check_process(process)
+
+        return cls(np.frombuffer(bytes(data), dtype=np.float32))
+
+    @staticmethod
+    def _check_process(process: subprocess.Popen) -> None:
+        """Wait for ffmpeg and raise if it failed"""
+        stderr = process.stderr.read()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+
+    @staticmethod
+    def _decode_with_pydub(file_path: str) -> np.ndarray:
+        """Decode with pydub when the ffmpeg binary cannot be driven directly"""
+        from pydub import AudioSegment
+
+        audio = AudioSegment.from_file(file_path)
+        audio = audio.set_frame_rate(ANALYSIS_SAMPLE_RATE).set_channels(1)
+        samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
+        return samples / audio.max_possible_amplitude
+
+    def select(self, regions: List[Tuple[int, int]], mmap_dir: Optional[str] = None) -> "Waveform":
+        """Return a new waveform of the given (start, end) sample regions placed back to back
+
+        A memory-mapped waveform produces a memory-mapped result in mmap_dir.
+        """
+        total = sum(end - start for start, end in regions)
+
+        if self.mmap_path is not None and mmap_dir is not None:
+            fd, mmap_path = tempfile.mkstemp(prefix="speech_", suffix=".f32", dir=mmap_dir)
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    for start, end in regions:
+                        out.write(np.ascontiguousarray(self.samples[start:end], dtype=np.float32).tobytes())
+            except Exception:
+                os.remove(mmap_path)
+                raise
+            return Waveform.from_mmap(mmap_path, self.sample_rate)
+
+        selected = np.empty(total, dtype=np.float32)
+        position = 0
+        for start, end in regions:
+            selected[position:position + end - start] = self.samples[start:end]
+            position += end - start
+        return Waveform(selected, self.sample_rate)
+
+    def as_whisper_input(self) -> np.ndarray:
+        """Return samples in the form Whisper's transcribe accepts"""
+        return self.samples
+
+    def as_pyannote_input(self) -> Any:
+        """Return samples in the in-memory form pyannote pipelines accept"""
+        import torch
+
+        return {
+            "waveform": torch.from_numpy(self.samples).unsqueeze(0),
+            "sample_rate": self.sample_rate
+        }
+
+    def close(self) -> None:
+        """Release the samples and delete the backing file, if any"""
+        self.samples = np.empty(0, dtype=np.float32)
+        if self.mmap_path is not None:
+            try:
+                os.remove(self.mmap_path)
+            except FileNotFoundError:
+                pass
+            self.mmap_path = None